@@ -1,14 +1,80 @@
-from fastapi import FastAPI, UploadFile, Form
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, UploadFile, Form, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import PlainTextResponse
-from pydantic import BaseModel
-from typing import Optional
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Optional
+
+from engines import get_engine, DEFAULT_ENGINE
+from cache import (LRUCache, ResultCache, KnownProgram, KnownDocument, source_hash,
+                   UNCACHEABLE_ERRORS, ast_cache)
+from budget import Limits
+from worker_pool import WorkerPool, JobTimeout, WorkerCrashed, execute, stream_in_thread
+from incremental import apply_changes
+from sessions import SessionStore, SessionMemoryExceeded
+import metrics
+
+# Lexing, parsing et exécution se font dans des processus workers démarrés
+# au lancement : l'event loop n'exécute jamais de code .pisc.
+# PISC_WORKERS=0 exécute dans un thread du processus API (sans timeout).
+WORKERS = int(os.environ.get("PISC_WORKERS", os.cpu_count() or 1))
+JOB_TIMEOUT = float(os.environ.get("PISC_TIMEOUT", "5"))
+
+# Limites maximales d'une exécution ; un client peut demander moins (budget.py)
+def _env_limit(name, default):
+    value = int(os.environ.get(name, default))
+    return value if value > 0 else None  # 0 = illimité
+
+SERVER_LIMITS = Limits(
+    max_steps=_env_limit("PISC_MAX_STEPS", 10_000_000),
+    max_output=_env_limit("PISC_MAX_OUTPUT", 1_000_000),
+    max_value_size=_env_limit("PISC_MAX_VALUE_SIZE", 10_000_000),
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool(WORKERS, JOB_TIMEOUT)
+        return _pool
 
-from lexer import lexer, lexer_errors
-from parser import parser
-from interpreter import Interpreter
+@asynccontextmanager
+async def lifespan(app):
+    global _pool
+    if WORKERS:
+        get_pool()  # workers prêts avant la première requête
+    yield
+    with _pool_lock:
+        pool, _pool = _pool, None  # un redémarrage de l'application recrée le pool
+    if pool is not None:
+        pool.close()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+# Sorties déjà calculées, par (hash d'AST, optimize, cse, limites) : un programme
+# resoumis n'est pas réexécuté. Les passes changent le nombre de pas et les
+# valeurs calculées d'avance : elles font partie de la clé.
+result_cache = ResultCache()
+# (hash du source, optimize, cse) -> hash d'AST, pour consulter result_cache
+# sans envoyer le source à un worker
+source_index = LRUCache(max_entries=4096, max_bytes=16 * 1024 * 1024)
+# identifiant de document -> dernier texte reçu (requêtes qui n'envoient que `changes`)
+document_texts = LRUCache(max_entries=1024, max_bytes=64 * 1024 * 1024)
+# Sessions REPL (/repl) : fermées après PISC_SESSION_IDLE secondes d'inactivité,
+# variables limitées à PISC_SESSION_MAX_BYTES octets par session
+sessions = SessionStore(
+    idle_timeout=float(os.environ.get("PISC_SESSION_IDLE", "600")),
+    session_max_bytes=int(os.environ.get("PISC_SESSION_MAX_BYTES", 16 * 1024 * 1024)),
+)
 
 # 🔓 Autoriser le frontend React (Vite tourne sur http://localhost:5173)
 app.add_middleware(
@@ -28,54 +94,379 @@ app.add_middleware(
 async def health():
     return {"status": "ok"}
 
+# 📊 Statistiques des caches (hits / misses / évictions) et du pool de workers
+@app.get("/cache/stats")
+async def cache_stats():
+    return {
+        "sources": source_index.stats(),
+        "results": result_cache.stats(),
+        "sessions": sessions.stats(),
+        "workers": _pool.stats() if _pool is not None else None,
+    }
+
+# 📈 Métriques Prometheus : durée par phase de /parse et /parse-json, erreurs,
+# octets reçus / envoyés, caches (metrics.py)
+@app.get("/metrics")
+async def metrics_text():
+    metrics.observe_caches({
+        "sources": source_index.stats(),
+        "results": result_cache.stats(),
+        # sans pool, les programmes sont parsés dans ce processus (cache.ast_cache)
+        "ast": get_pool().cache_stats() if WORKERS else ast_cache.stats(),
+    })
+    return Response(metrics.exposition(metrics.API_METRICS), media_type=metrics.CONTENT_TYPE)
+
+
+def serialize(endpoint, response_class, content, start):
+    """Réponse de `endpoint` ; la mise en forme du corps est mesurée (phase
+    "serialize"), comme la durée totale de la requête depuis `start`."""
+    serialized = time.perf_counter()
+    response = response_class(content)
+    now = time.perf_counter()
+    metrics.PHASE_SECONDS.observe(now - serialized, endpoint, "serialize")
+    metrics.REQUEST_SECONDS.observe(now - start, endpoint)
+    metrics.SENT_BYTES.inc(endpoint, amount=len(response.body))
+    return response
+
+
+async def run_program(code, engine, optimize, cse, limits, document=None, profile=False):
+    """Résultat de `worker_pool.execute` : depuis les caches, sinon dans un worker
+    (toujours exécuté s'il est profilé : le profil n'est pas mis en cache)."""
+    key = (source_hash(code), optimize, cse)
+    known = source_index.lookup(key)
+    if known is not None and not profile:
+        cached = result_cache.lookup((known.ast_hash, optimize, cse, limits.key()))
+        if cached is not None:
+            result = {"ast": known.ast_text, "ast_hash": known.ast_hash}
+            try:
+                result["output"] = cached.unpack()
+            except Exception as e:
+                result["exception"] = e
+                if known.location is not None:
+                    result["location"] = known.location
+            return result
+
+    if WORKERS:
+        result = await asyncio.to_thread(get_pool().run, code, engine, optimize, cse, limits,
+                                         document, None, profile)
+    else:
+        result = await asyncio.to_thread(execute, code, engine, optimize, cse, limits, document,
+                                         None, profile)
+
+    if "ast_hash" in result:
+        # seule l'erreur mise en cache a besoin de sa position lors d'un hit
+        location = result.get("location")
+        if isinstance(result.get("exception"), UNCACHEABLE_ERRORS) or "exception" not in result:
+            location = known.location if known is not None else None
+        source_index.put(key, KnownProgram(result["ast_hash"], result["ast"], location))
+        result_cache.store((result["ast_hash"], optimize, cse, limits.key()),
+                           result.get("output", ()), result.get("exception"))
+    return result
+
 # 📂 Route pour importer un fichier .pisc
 @app.post("/parse", response_class=PlainTextResponse)
-async def parse_file(file: Optional[UploadFile] = None, code: str = Form(None)):
+async def parse_file(file: Optional[UploadFile] = None, code: str = Form(None),
+                     engine: str = Form(DEFAULT_ENGINE), optimize: bool = Form(True),
+                     cse: bool = Form(False), max_steps: Optional[int] = Form(None),
+                     max_output: Optional[int] = Form(None),
+                     max_value_size: Optional[int] = Form(None)):
+    start = time.perf_counter()
     if file:
         content = await file.read()
         code = content.decode("utf-8")
     elif not code:
+        metrics.ERRORS.inc("/parse", "invalid")
         return PlainTextResponse("No code provided", status_code=400)
+    else:
+        content = code.encode("utf-8")
+    metrics.RECEIVED_BYTES.inc("/parse", amount=len(content))
 
-    lexer_errors.clear()
-    lexer.lineno = 1
+    try:
+        get_engine(engine)
+    except ValueError as e:
+        metrics.ERRORS.inc("/parse", "invalid")
+        return PlainTextResponse(str(e), status_code=400)
 
+    limits = SERVER_LIMITS.capped(max_steps, max_output, max_value_size)
     try:
-        ast = parser.parse(code, lexer=lexer)
-        if lexer_errors:
-            return "\n".join(lexer_errors)
+        result = await run_program(code, engine, optimize, cse, limits)
+    except (JobTimeout, WorkerCrashed) as e:
+        metrics.ERRORS.inc("/parse", job_error_kind(e))
+        return serialize("/parse", PlainTextResponse, str(e), start)
+    metrics.observe_result("/parse", result)
+    return serialize("/parse", PlainTextResponse, text_result(result), start)
+
 
-        interpreter = Interpreter()
-        output = interpreter.run(ast)
-        return "\n".join(map(str, output)) if output else ""
+def text_result(result):
+    """Réponse texte de /parse pour un résultat de `worker_pool.execute`."""
+    if "syntax_error" in result:
+        return f"Syntax error: {result['syntax_error']}"
+    if "errors" in result:
+        return "\n".join(result["errors"])
+    if "exception" in result:
+        return runtime_error(result)
 
-    except SyntaxError as e:
-        return f"Syntax error: {str(e)}"
+    output = result["output"]
+    return "\n".join(map(str, output)) if output else ""
+
+
+def job_error_kind(error):
+    return "timeout" if isinstance(error, JobTimeout) else "crash"
 
 # 🧠 Route pour exécuter du code JSON depuis CodeMirror
+class TextChange(BaseModel):
+    # comme un ChangeSpec CodeMirror : [from, to) remplacé par `insert`
+    from_: int = Field(alias="from")
+    to: int
+    insert: str = ""
+
 class CodeInput(BaseModel):
-    code: str
+    code: Optional[str] = None    # texte complet (ou `document` + `changes`)
+    document: Optional[str] = None  # identifiant du document édité : reparse incrémental
+    changes: Optional[List[TextChange]] = None  # modifications depuis le dernier envoi
+    engine: str = DEFAULT_ENGINE  # "tree", "vm" ou "python"
+    optimize: bool = True         # constant folding + branches mortes
+    cse: bool = False             # sous-expressions communes calculées une fois
+    max_steps: Optional[int] = None       # limites (plafonnées par SERVER_LIMITS)
+    max_output: Optional[int] = None
+    max_value_size: Optional[int] = None
+    profile: bool = False         # table de chaleur par ligne (moteur "tree", /parse-json et /batch)
 
 @app.post("/parse-json")
 async def parse_json_code(input: CodeInput):
-    code = input.code
+    start = time.perf_counter()
+    body = await run_json(input, "/parse-json")
+    return serialize("/parse-json", JSONResponse, body, start)
+
 
-    lexer_errors.clear()
-    lexer.lineno = 1
+async def run_json(input: CodeInput, endpoint=None):
+    """Réponse JSON d'un programme : toutes les erreurs restent dans la réponse.
+    Avec `endpoint`, la requête est comptée dans les métriques de cette route."""
+    if endpoint is not None:
+        metrics.RECEIVED_BYTES.inc(endpoint, amount=received_bytes(input))
+    try:
+        get_engine(input.engine)
+        if input.profile and input.engine != "tree":
+            raise ValueError(f"Profiling runs on the 'tree' engine, not '{input.engine}'")
+        code = input_code(input)
+    except ValueError as e:
+        if endpoint is not None:
+            metrics.ERRORS.inc(endpoint, "invalid")
+        return {"errors": [str(e)]}
 
+    limits = SERVER_LIMITS.capped(input.max_steps, input.max_output, input.max_value_size)
     try:
-        ast = parser.parse(code, lexer=lexer)
-        if lexer_errors:
-            return {"errors": lexer_errors}
+        result = await run_program(code, input.engine, input.optimize, input.cse, limits,
+                                   input.document, input.profile)
+    except (JobTimeout, WorkerCrashed) as e:
+        if endpoint is not None:
+            metrics.ERRORS.inc(endpoint, job_error_kind(e))
+        return {"errors": [str(e)]}
+    if endpoint is not None:
+        metrics.observe_result(endpoint, result)
+    return json_result(result)
+
+
+def input_code(input: CodeInput):
+    """Texte du programme : `code`, sinon le dernier texte du document modifié
+    par `changes` (appliquées dans l'ordre). ValueError si c'est impossible."""
+    code = input.code
+    if code is None:
+        if input.document is None or input.changes is None:
+            raise ValueError("No code provided")
+        known = document_texts.lookup(input.document)
+        if known is None:
+            raise ValueError(f"Unknown document '{input.document}': send the full code")
+        code = apply_changes(known.text, [(c.from_, c.to, c.insert) for c in input.changes])
+    if input.document is not None:
+        document_texts.put(input.document, KnownDocument(code))
+    return code
+
 
-        interpreter = Interpreter()
-        output = interpreter.run(ast)
+def received_bytes(input: CodeInput):
+    """Octets de programme reçus : `code`, ou le texte inséré par `changes`."""
+    if input.code is not None:
+        return len(input.code.encode("utf-8"))
+    return sum(len(change.insert.encode("utf-8")) for change in input.changes or ())
 
-        return {
-            "ast": str(ast),
-            "output": output,
+
+def runtime_error(result):
+    """Message d'une erreur d'exécution, avec sa position dans le source."""
+    message = f"Runtime error: {result['exception']}"
+    if "location" in result:
+        message += " (line {}, col {})".format(*result["location"])
+    return message
+
+
+def json_result(result):
+    """Réponse JSON de /parse-json pour un résultat de `worker_pool.execute`."""
+    if "syntax_error" in result:
+        return {"errors": [f"Syntax error: {result['syntax_error']}"]}
+    if "errors" in result:
+        return {"errors": result["errors"]}
+    if "exception" in result:
+        body = {"errors": [runtime_error(result)]}
+    else:
+        body = {
+            "ast": result["ast"],
+            "output": result["output"],
             "message": "Analyse réussie"
         }
+    if "profile" in result:
+        body["profile"] = result["profile"]  # aussi après une erreur (limite de pas, ...)
+    return body
+
+
+# 📡 Sortie au fil de l'eau (Server-Sent Events)
+# event: output -> liste JSON des valeurs affichées depuis le dernier envoi
+# event: done   -> {"ast", "message"} ; event: error -> {"errors": [...]}
+@app.post("/stream")
+async def stream_code(input: CodeInput):
+    try:
+        get_engine(input.engine)
+        if input.profile:
+            raise ValueError("Profiling is not available on /stream: use /parse-json")
+        code = input_code(input)
+    except ValueError as e:
+        return {"errors": [str(e)]}
+
+    limits = SERVER_LIMITS.capped(input.max_steps, input.max_output, input.max_value_size)
+    args = (code, input.engine, input.optimize, input.cse, limits, input.document)
+    messages = get_pool().stream(*args) if WORKERS else stream_in_thread(*args)
+    # générateur synchrone : Starlette le parcourt dans un thread, hors event loop
+    return StreamingResponse(sse_events(messages), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def sse_events(messages):
+    try:
+        for kind, value in messages:
+            if kind == "output":
+                yield sse("output", value)
+            else:
+                body = json_result(value)
+                body.pop("output", None)  # déjà envoyée au fil de l'eau
+                yield sse("error" if "errors" in body else "done", body)
+    except (JobTimeout, WorkerCrashed) as e:
+        yield sse("error", {"errors": [str(e)]})
+    finally:
+        messages.close()  # client parti : le worker est arrêté
+
+
+# 📦 Lot de programmes (correction automatique) : une seule requête, exécutés
+# en parallèle sur les workers. Chaque résultat a la forme de /parse-json :
+# l'erreur d'un programme (lexer, syntaxe, exécution, timeout) n'affecte pas
+# les autres.
+class BatchInput(BaseModel):
+    programs: List[CodeInput]
+    stream: bool = False  # True : résultats en SSE, dans l'ordre de fin d'exécution
+
+# programmes d'un lot envoyés en même temps aux workers : les suivants attendent
+# ici plutôt que dans la file du pool
+BATCH_CONCURRENCY = max(WORKERS, 1)
+
+@app.post("/batch")
+async def batch_code(input: BatchInput):
+    start = time.perf_counter()
+    in_flight = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_one(program):
+        async with in_flight:
+            return await run_json(program)
+
+    tasks = [asyncio.ensure_future(run_one(program)) for program in input.programs]
+    if input.stream:
+        return StreamingResponse(batch_events(tasks, start), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    results = await asyncio.gather(*tasks)
+    return {"results": results, "stats": batch_stats(len(results), start)}
+
+
+def batch_stats(count, start):
+    elapsed = time.perf_counter() - start
+    return {"programs": count, "elapsed": round(elapsed, 6),
+            "programs_per_second": round(count / elapsed, 1) if elapsed > 0 else None}
+
+
+# event: result -> {"index": position dans le lot, ...réponse de /parse-json}
+# event: done   -> statistiques du lot
+async def batch_events(tasks, start):
+    index = {task: i for i, task in enumerate(tasks)}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=index.get):
+                yield sse("result", {"index": index[task], **task.result()})
+        yield sse("done", batch_stats(len(tasks), start))
+    finally:
+        for task in tasks:
+            task.cancel()  # client parti : les programmes pas encore lancés sont abandonnés
+
+
+# 💬 REPL : une session garde ses variables entre deux envois (WebSocket)
+# connexion : /repl, ou /repl?session=<id> pour reprendre une session
+# <- {"type": "session", "session": id, "created": bool, "variables": [noms]}
+# -> {"code": "...", "optimize"?, "max_steps"?, "max_output"?, "max_value_size"?}
+# <- {"type": "result", "output": [...] ou "errors": [...], "variables": [noms]}
+class ReplInput(BaseModel):
+    code: str
+    optimize: bool = True
+    max_steps: Optional[int] = None
+    max_output: Optional[int] = None
+    max_value_size: Optional[int] = None
+
+@app.websocket("/repl")
+async def repl(websocket: WebSocket, session: Optional[str] = None):
+    await websocket.accept()
+    state, created = sessions.open(session)
+    await websocket.send_json(session_event(state, created))
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                input = ReplInput.model_validate_json(message)
+            except ValidationError as e:
+                await websocket.send_json({"type": "error", "errors": [str(e)]})
+                continue
+            if not sessions.alive(state):
+                # expirée (inactivité) ou évincée : les variables sont perdues
+                state, created = sessions.open(state.id)
+                await websocket.send_json(session_event(state, created))
+            await websocket.send_json({"type": "result", **await run_session(state, input)})
+    except WebSocketDisconnect:
+        pass
+
+
+def session_event(state, created):
+    return {"type": "session", "session": state.id, "created": created,
+            "variables": sorted(state.variables)}
+
 
-    except SyntaxError as e:
-        return {"errors": [f"Syntax error: {str(e)}"]}
+async def run_session(state, input: ReplInput):
+    """Exécute `input.code` sur les variables de la session, puis garde le nouvel état."""
+    limits = SERVER_LIMITS.capped(input.max_steps, input.max_output, input.max_value_size)
+    args = (input.code, "tree", input.optimize, False, limits, None, state.variables)
+    async with state.lock:
+        try:
+            if WORKERS:
+                result = await asyncio.to_thread(get_pool().run, *args)
+            else:
+                result = await asyncio.to_thread(execute, *args)
+        except (JobTimeout, WorkerCrashed) as e:
+            body = {"errors": [str(e)]}  # job interrompu : état inchangé
+        else:
+            body = json_result(result)
+            body.pop("ast", None)
+            if "variables" in result:
+                try:
+                    state.update(result["variables"])
+                except SessionMemoryExceeded as e:
+                    body = {"errors": body.get("errors", []) + [str(e)]}
+        sessions.save(state)
+        body["variables"] = sorted(state.variables)
+    return body
@@ -1,5 +1,6 @@
 # ast_visualizer.py
 from graphviz import Digraph
+from parser import node_fields
 
 def generate_ast_graph(ast, filename="ast", view=True):
     """
@@ -8,51 +9,59 @@ def generate_ast_graph(ast, filename="ast", view=True):
     :param filename: output filename (without extension)
     :param view: open the file automatically if True
     """
+    build_ast_graph(ast).render(filename, view=view)
+
+def build_ast_graph(ast):
+    """
+    Build the Graphviz graph of the AST (without rendering it).
+    """
     dot = Digraph(comment="Abstract Syntax Tree", format="png")
     _add_node(dot, ast)
-    dot.render(filename, view=view)
+    return dot
 
 def _add_node(dot, node, parent_id=None, counter=[0]):
     """
-    Recursive helper to add nodes and edges to the Graphviz graph.
+    Add nodes and edges to the Graphviz graph, in depth-first order.
+    Explicit stack instead of recursion: deep trees (long elseif or
+    operator chains) do not hit the recursion limit.
     """
-    node_id = str(counter[0])
-    counter[0] += 1
+    stack = [(node, parent_id)]
+    while stack:
+        node, parent_id = stack.pop()
+        node_id = str(counter[0])
+        counter[0] += 1
+
+        if isinstance(node, list):
+            label = "Block"
+            dot.node(node_id, label)
+            if parent_id is not None:
+                dot.edge(parent_id, node_id)
+            stack.extend((child, node_id) for child in reversed(node) if child is not None)
+            continue
+
+        if node is None:
+            continue
+
+        # Label according to node type
+        label = node.__class__.__name__
+        if hasattr(node, "name"):
+            label += f"\\n{node.name}"
+        if hasattr(node, "op"):
+            label += f"\\n{node.op}"
+        if hasattr(node, "value") and node.value is not None:
+            label += f"\\n{node.value}"
 
-    if isinstance(node, list):
-        label = "Block"
         dot.node(node_id, label)
+
         if parent_id is not None:
             dot.edge(parent_id, node_id)
-        for child in node:
-            if child is not None:
-                _add_node(dot, child, node_id, counter)
-        return
-
-    if node is None:
-        return
-
-    # Label according to node type
-    label = node.__class__.__name__
-    if hasattr(node, "name"):
-        label += f"\\n{node.name}"
-    if hasattr(node, "op"):
-        label += f"\\n{node.op}"
-    if hasattr(node, "value") and node.value is not None:
-        label += f"\\n{node.value}"
-
-    dot.node(node_id, label)
-
-    if parent_id is not None:
-        dot.edge(parent_id, node_id)
-
-    # Recurse on children
-    if hasattr(node, "__dict__"):
-        for attr, child in vars(node).items():
-            if isinstance(child, (list, tuple)):
-                for c in child:
-                    if c is not None:
-                        _add_node(dot, c, node_id, counter)
-            elif child is not None and not isinstance(child, (str, int, float, bool)):
-                 _add_node(dot, child, node_id, counter)
 
+        # Children, pushed in reverse to be numbered in order
+        children = []
+        if hasattr(node, "__slots__"):
+            for attr, child in node_fields(node):
+                if isinstance(child, (list, tuple)):
+                    children.extend(c for c in child if c is not None)
+                elif child is not None and not isinstance(child, (str, int, float, bool)):
+                    children.append(child)
+        stack.extend((child, node_id) for child in reversed(children))
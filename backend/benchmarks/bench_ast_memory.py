@@ -0,0 +1,69 @@
+# benchmarks/bench_ast_memory.py
+# Mesure la mémoire occupée par l'AST d'un gros programme (octets par nœud).
+#   python benchmarks/bench_ast_memory.py [--statements N]
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import lexer, lexer_errors
+from parser import parser, Program
+
+
+def make_program(statements):
+    """Programme varié : affectations, print, if/while imbriqués."""
+    lines = []
+    for i in range(statements // 4):
+        lines.append(f"v{i % 500} = v{(i + 1) % 500} * {i} + {i % 7} - \"s{i}\"")
+        lines.append(f"print(v{i % 500} / {i + 1})")
+        lines.append(f"if v{i % 500} > {i} {{ w = w + 1 }} else {{ w = -w }}")
+        lines.append(f"while w < {i} {{ w = w + {i % 3 + 1} }}")
+    return "\n".join(lines)
+
+
+def count_nodes(program):
+    """Nombre de nœuds distincts (les sous-arbres partagés ne comptent qu'une fois)."""
+    seen = set()
+    stack = [program]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+            continue
+        if node is None or id(node) in seen or isinstance(node, (str, int, float, bool)):
+            continue
+        seen.add(id(node))
+        fields = getattr(node, "__slots__", None)
+        values = [getattr(node, f, None) for f in fields] if fields is not None else vars(node).values()
+        stack.extend(v for v in values if not isinstance(v, (str, int, float, bool)))
+    return len(seen)
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__)
+    argp.add_argument("--statements", type=int, default=100_000)
+    args = argp.parse_args()
+
+    code = make_program(args.statements)
+    lexer_errors.clear()
+    lexer.lineno = 1
+
+    gc.collect()
+    tracemalloc.start()
+    program = parser.parse(code, lexer=lexer)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    nodes = count_nodes(program)
+    print(f"statements: {len(program.statements)}")
+    print(f"nodes:      {nodes}")
+    print(f"AST bytes:  {size / 1024 / 1024:.1f} MiB")
+    print(f"bytes/node: {size / nodes:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# benchmarks/bench_batch.py
+# Débit de /batch comparé à une requête /parse-json par programme (clients
+# de correction automatique). Programmes tous différents : pas de cache.
+#   python benchmarks/bench_batch.py [--programs N] [--workers N]
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_programs(count, first=0):
+    # chaque programme diffère par une constante : ni le cache d'AST ni celui
+    # des résultats ne sert d'une mesure à l'autre
+    return [{"code": f"total = {seed}\nfor i in range(20000) {{ total = total + i }}\nprint(total)",
+             "engine": "vm"} for seed in range(first, first + count)]
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__)
+    argp.add_argument("--programs", type=int, default=200)
+    argp.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = argp.parse_args()
+
+    os.environ["PISC_WORKERS"] = str(args.workers)
+    from fastapi.testclient import TestClient
+    import app as api
+
+    with TestClient(api.app) as client:
+        client.post("/batch", json={"programs": make_programs(args.workers, -args.workers)})  # échauffement
+
+        start = time.perf_counter()
+        for program in make_programs(args.programs):
+            client.post("/parse-json", json=program)
+        one_by_one = time.perf_counter() - start
+
+        start = time.perf_counter()
+        client.post("/batch", json={"programs": make_programs(args.programs, args.programs)})
+        batch = time.perf_counter() - start
+
+    print(f"{args.programs} programs, {args.workers} workers")
+    print(f"{'one-by-one':<12}{one_by_one * 1000:>10.1f}ms{args.programs / one_by_one:>10.1f} prog/s")
+    print(f"{'batch':<12}{batch * 1000:>10.1f}ms{args.programs / batch:>10.1f} prog/s")
+    print(f"throughput x{one_by_one / batch:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# benchmarks/bench_budget.py
+# Coût des limites d'exécution (budget.py) : chaque moteur sans limite, avec
+# le seul compteur de pas, puis avec toutes les limites (jamais atteintes).
+#   python benchmarks/bench_budget.py [--repeat N]
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines import ENGINES, get_engine
+from sinks import CaptureSink
+from bench_engines import PROGRAMS, parse
+
+CONFIGS = {
+    "unlimited": {},
+    "steps": {"max_steps": 10 ** 9},
+    "all": {"max_steps": 10 ** 9, "max_output": 10 ** 9, "max_value_size": 10 ** 9},
+}
+
+
+def best_time(engine, ast, repeat, limits):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        get_engine(engine, **limits, sink=CaptureSink()).run(ast)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__)
+    argp.add_argument("--repeat", type=int, default=5)
+    args = argp.parse_args()
+
+    print(f"{'program':<14}{'engine':<8}" + "".join(f"{c:>12}" for c in CONFIGS) + "   overhead")
+    for name, code in PROGRAMS.items():
+        ast = parse(code)
+        for engine in sorted(ENGINES, key=lambda e: e != "tree"):
+            times = {c: best_time(engine, ast, args.repeat, limits) for c, limits in CONFIGS.items()}
+            overhead = ", ".join(f"{c} {(times[c] / times['unlimited'] - 1) * 100:+.1f}%"
+                                 for c in CONFIGS if c != "unlimited")
+            print(f"{name:<14}{engine:<8}" + "".join(f"{t * 1000:>10.1f}ms" for t in times.values())
+                  + f"   {overhead}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_engines.py
+# Compare les moteurs d'exécution (tree, vm, ...) sur des programmes à boucles.
+#   python benchmarks/bench_engines.py [--repeat N]
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import lexer, lexer_errors
+from parser import parser
+from engines import ENGINES, get_engine
+from sinks import CaptureSink
+
+PROGRAMS = {
+    "while_sum": """
+i = 0
+total = 0
+while i < 200000 {
+    total = total + i * 2 - 1
+    i = i + 1
+}
+print(total)
+""",
+    "nested_for": """
+count = 0
+for i in range(300) {
+    for j in range(300) {
+        if j < i {
+            count = count + 1
+        } else {
+            count = count - 1
+        }
+    }
+}
+print(count)
+""",
+    "string_build": """
+s = ""
+n = 0
+while n < 20000 {
+    s = s + "x"
+    n = n + 1
+}
+print(n)
+""",
+}
+
+
+def parse(code):
+    lexer_errors.clear()
+    lexer.lineno = 1
+    return parser.parse(code, lexer=lexer)
+
+
+def best_time(engine, ast, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        get_engine(engine, sink=CaptureSink()).run(ast)  # comme l'API
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__)
+    argp.add_argument("--repeat", type=int, default=3)
+    args = argp.parse_args()
+
+    engines = sorted(ENGINES, key=lambda e: e != "tree")
+    print(f"{'program':<14}" + "".join(f"{e:>12}" for e in engines) + "   speedup vs tree")
+    for name, code in PROGRAMS.items():
+        ast = parse(code)
+        times = {e: best_time(e, ast, args.repeat) for e in engines}
+        speedups = ", ".join(f"{e} x{times['tree'] / times[e]:.2f}" for e in engines if e != "tree")
+        print(f"{name:<14}" + "".join(f"{times[e] * 1000:>10.1f}ms" for e in engines) + f"   {speedups}")
+
+
+if __name__ == "__main__":
+    main()
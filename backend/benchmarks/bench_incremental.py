@@ -0,0 +1,71 @@
+# benchmarks/bench_incremental.py
+# Reparse après une petite modification (une ligne ajoutée ou changée) :
+# parse complet du document vs reparse incrémental (incremental.py).
+#   python benchmarks/bench_incremental.py [--statements N] [--edits N]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import parse_source
+from incremental import Document
+
+
+def make_source(statements):
+    return "".join(f"x{i} = {i} * 2 + y\nif x{i} > 3 {{\n  print(x{i})\n}}\n"
+                   for i in range(statements))
+
+
+def edits(source, count, rng):
+    """Versions successives : une ligne insérée, modifiée ou ajoutée en fin."""
+    versions = []
+    for i in range(count):
+        lines = source.split("\n")
+        line = rng.randrange(len(lines))
+        kind = i % 3
+        if kind == 0:
+            lines.insert(line, f"print({i})")
+        elif kind == 1 and lines[line].startswith("x"):
+            lines[line] = lines[line].replace("* 2", f"* {i}")
+        else:
+            lines.append(f"z = {i}")
+        source = "\n".join(lines)
+        versions.append(source)
+    return versions
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__)
+    argp.add_argument("--statements", type=int, default=2000)
+    argp.add_argument("--edits", type=int, default=30)
+    args = argp.parse_args()
+
+    source = make_source(args.statements)
+    versions = edits(source, args.edits, random.Random(0))
+
+    start = time.perf_counter()
+    for version in versions:
+        parse_source(version)
+    full = (time.perf_counter() - start) / len(versions)
+
+    document = Document()
+    document.parse(source)
+    reparsed = 0
+    start = time.perf_counter()
+    for version in versions:
+        document.parse(version)
+        reparsed += document.reparsed
+    incremental = (time.perf_counter() - start) / len(versions)
+
+    print(f"{len(source)} characters, {len(document.segments)} top-level statements")
+    print(f"full parse   {full * 1000:9.2f}ms per edit")
+    print(f"incremental  {incremental * 1000:9.2f}ms per edit "
+          f"({reparsed / len(versions):.1f} statements reparsed)")
+    print(f"speedup x{full / incremental:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_lexer.py
+# Débit du lexer PLY (un LexToken par token) et du scanner colonnaire
+# (scanner.py), en tokens par seconde, sur un gros source généré.
+#   python benchmarks/bench_lexer.py [--lines N] [--repeat N]
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import new_lexer
+from scanner import scan
+
+
+def make_source(lines):
+    block = [
+        'total = total + i * 2 - (count / 3)',
+        'if total >= 100 { print("big") } elseif total == 0 { print(null) } else { flag = true }',
+        'while count < 10 { count = count + 1 }  # commentaire',
+        'for k in range(5) { name = "value" }',
+    ]
+    return "\n".join(block[i % len(block)] for i in range(lines)) + "\n"
+
+
+def ply_count(source):
+    lexer = new_lexer()
+    lexer.input(source)
+    return sum(1 for _ in lexer)
+
+
+def scanner_count(source):
+    return len(scan(source))
+
+
+def best_time(function, source, repeat):
+    best, count = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = function(source)
+        best = min(best, time.perf_counter() - start)
+    return best, count
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__)
+    argp.add_argument("--lines", type=int, default=20000)
+    argp.add_argument("--repeat", type=int, default=5)
+    args = argp.parse_args()
+
+    source = make_source(args.lines)
+    results = {name: best_time(function, source, args.repeat)
+               for name, function in (("ply", ply_count), ("scanner", scanner_count))}
+    assert results["ply"][1] == results["scanner"][1]
+    print(f"{len(source)} characters, {results['ply'][1]} tokens")
+    for name, (seconds, count) in results.items():
+        print(f"{name:<10}{seconds * 1000:10.1f}ms {count / seconds / 1e6:8.2f}M tokens/s")
+    print(f"speedup x{results['ply'][0] / results['scanner'][0]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
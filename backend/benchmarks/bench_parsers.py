@@ -0,0 +1,51 @@
+# benchmarks/bench_parsers.py
+# Compare le parser yacc (PLY) et le parser Pratt écrit à la main.
+#   python benchmarks/bench_parsers.py [--statements N] [--repeat N]
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer import lexer, lexer_errors
+from parser import yacc_parser, ast_to_dict
+from pratt_parser import PrattParser
+from bench_ast_memory import make_program
+
+PARSERS = {"yacc": yacc_parser, "pratt": PrattParser()}
+
+
+def parse(parser, code):
+    lexer_errors.clear()
+    lexer.lineno = 1
+    return parser.parse(code, lexer=lexer)
+
+
+def best_time(parser, code, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(parser, code)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__)
+    argp.add_argument("--statements", type=int, default=20_000)
+    argp.add_argument("--repeat", type=int, default=3)
+    args = argp.parse_args()
+
+    code = make_program(args.statements)
+    # même arbre avant de comparer les temps
+    assert ast_to_dict(parse(PARSERS["yacc"], code)) == ast_to_dict(parse(PARSERS["pratt"], code))
+
+    times = {name: best_time(p, code, args.repeat) for name, p in PARSERS.items()}
+    for name, t in times.items():
+        print(f"{name:<6}{t * 1000:>10.1f}ms  {args.statements / t:>12,.0f} statements/s")
+    print(f"speedup pratt vs yacc: x{times['yacc'] / times['pratt']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# benchmarks/bench_repl.py
+# Session REPL : un utilisateur ajoute un print à la fin d'un programme qui
+# contient une boucle coûteuse. Ré-exécution du programme entier à chaque
+# envoi (/parse-json) vs exécution des seules nouvelles lignes sur l'état de
+# la session (/repl), dans le processus courant (worker_pool.execute).
+#   python benchmarks/bench_repl.py [--loop N] [--sends N]
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from worker_pool import execute
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__)
+    argp.add_argument("--loop", type=int, default=200000)
+    argp.add_argument("--sends", type=int, default=10)
+    args = argp.parse_args()
+
+    setup = f"total = 0\nfor i in range({args.loop}) {{ total = total + i * 2 }}\n"
+    additions = [f"print(total + {n})\n" for n in range(args.sends)]
+
+    start = time.perf_counter()
+    code = setup
+    for line in additions:
+        code += line
+        execute(code, "tree")
+    full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    variables = execute(setup, "tree", variables={})["variables"]
+    for line in additions:
+        variables = execute(line, "tree", variables=variables)["variables"]
+    session = time.perf_counter() - start
+
+    print(f"{args.sends} sends after a {args.loop}-iteration loop")
+    print(f"re-run whole program  {full * 1000:9.1f}ms")
+    print(f"session (new lines)   {session * 1000:9.1f}ms")
+    print(f"speedup x{full / session:.1f}")
+
+
+if __name__ == "__main__":
+    main()
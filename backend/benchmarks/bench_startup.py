@@ -0,0 +1,64 @@
+# benchmarks/bench_startup.py
+# Démarrage à froid : import du lexer et du parser seuls, puis temps jusqu'à la
+# réponse à la première requête /parse-json (import de l'app compris), avec
+# les tables PLY livrées ("prebuilt") ou régénérées au démarrage comme avant
+# build_tables.py ("rebuild", mesuré dans une copie temporaire du backend).
+#   python benchmarks/bench_startup.py [--repeat N]
+import argparse
+import glob
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PARSER = """
+import time
+start = time.perf_counter()
+import parser
+print(time.perf_counter() - start)
+"""
+
+FIRST_REQUEST = """
+import time
+start = time.perf_counter()
+import app
+from fastapi.testclient import TestClient
+response = TestClient(app.app).post("/parse-json", json={"code": "print(1)"})
+assert response.json()["output"] == [1]
+print(time.perf_counter() - start)
+"""
+
+
+def startup_time(script, cwd, rebuild):
+    env = dict(os.environ, PISC_WORKERS="0")  # exécution dans le processus : pas de pool
+    if rebuild:
+        env["PISC_BUILD_TABLES"] = "1"
+        for name in ("lextab.py", "parsetab.py"):
+            if os.path.exists(os.path.join(cwd, name)):
+                os.remove(os.path.join(cwd, name))
+    result = subprocess.run([sys.executable, "-c", script], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__)
+    argp.add_argument("--repeat", type=int, default=5)
+    args = argp.parse_args()
+
+    with tempfile.TemporaryDirectory() as copy:
+        for path in glob.glob(os.path.join(BACKEND_DIR, "*.py")):
+            shutil.copy(path, copy)
+        for name, script in (("lexer+parser", IMPORT_PARSER), ("first request", FIRST_REQUEST)):
+            for mode, cwd, rebuild in (("prebuilt", BACKEND_DIR, False), ("rebuild", copy, True)):
+                times = [startup_time(script, cwd, rebuild) for _ in range(args.repeat)]
+                print(f"{name:<15}{mode:<10}median {statistics.median(times) * 1000:8.1f}ms"
+                      f"   min {min(times) * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
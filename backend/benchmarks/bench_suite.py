@@ -0,0 +1,233 @@
+# benchmarks/bench_suite.py
+# Suite de micro-benchmarks (make bench) : lexing, parsing et exécution mesurés
+# séparément sur tests/samples/*.pisc et sur des programmes générés (dont les
+# formes de program_generator.py), plus la latence de bout en bout de l'API
+# (FastAPI en processus, TestClient).
+# Résultats enregistrés en JSON ; --compare signale les régressions par
+# rapport à une référence (code de sortie 1 s'il y en a).
+#   python benchmarks/bench_suite.py [--output F] [--compare BASELINE] [--threshold 0.15]
+#                                    [--quick] [--no-api] [--engines tree,vm]
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCH_DIR))
+
+from lexer import new_lexer
+from parser import parse_source, PARSER_BACKEND
+from scanner import scan
+from engines import get_engine
+from sinks import CaptureSink
+from program_generator import SHAPES
+
+SAMPLES_DIR = os.path.join(os.path.dirname(BENCH_DIR), "tests", "samples")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+# -------------------------
+# Programmes
+# -------------------------
+def samples():
+    programs = {}
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pisc"))):
+        with open(path, "r", encoding="utf-8") as f:
+            programs[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    return programs
+
+
+def synthetic(lines):
+    """Programme valide d'environ `lines` lignes : affectations, conditions,
+    boucles et chaînes (toutes les variables sont définies avant usage)."""
+    out = ["total = 0", "count = 0", 'name = ""']
+    block = [
+        "total = total + count * 2 - (count / 3)",
+        'if total >= 100 { name = "big" } elseif total == 0 { name = "zero" } else { count = count + 1 }',
+        "while count < 5 { count = count + 1 }  # commentaire",
+        'for k in range(3) { name = name + "x" }',
+        "count = 0",
+    ]
+    while len(out) < lines:
+        out.append(block[len(out) % len(block)])
+    out.append("print(total)")
+    return "\n".join(out) + "\n"
+
+
+def programs(quick):
+    found = {f"sample/{name}": code for name, code in samples().items()}
+    for lines in ([200] if quick else [200, 2000]):
+        found[f"synthetic/{lines}"] = synthetic(lines)
+    if not quick:
+        # formes extrêmes (program_generator.py) : chaînes longues, blocs profonds
+        for shape, make in SHAPES.items():
+            found[f"shape/{shape}"] = make(200 if shape == "nested_blocks" else 2000)
+    return found
+
+
+# -------------------------
+# Mesure
+# -------------------------
+def measure(fn, rounds, min_time):
+    """Durée d'un appel de `fn` (ms) : `rounds` séries de `number` appels,
+    `number` calibré pour qu'une série dure au moins `min_time` secondes.
+    Le GC est coupé pendant la mesure (comme timeit)."""
+    gc.collect()
+    gc.disable()
+    try:
+        return _measure(fn, rounds, min_time)
+    finally:
+        gc.enable()
+
+
+def _measure(fn, rounds, min_time):
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    times = [elapsed / number]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return {"median_ms": statistics.median(times) * 1000, "min_ms": min(times) * 1000,
+            "number": number, "rounds": rounds}
+
+
+def lex(code):
+    if PARSER_BACKEND == "pratt":
+        return scan(code)  # le parser Pratt lit le scanner colonnaire
+    lexer = new_lexer()
+    lexer.input(code)
+    for _ in lexer:
+        pass
+
+
+def run(engine, program):
+    try:
+        get_engine(engine, sink=CaptureSink()).run(program)
+    except RecursionError:
+        raise
+    except Exception:
+        pass  # erreur d'exécution attendue (divide_by_zero, ...) : mesurée quand même
+
+
+def bench_phases(found, engines, rounds, min_time):
+    """lex, parse (lexing + parsing, comme l'API) et run par moteur."""
+    results = {}
+    for name, code in found.items():
+        results[f"lex/{name}"] = measure(lambda: lex(code), rounds, min_time)
+        try:
+            program, _ = parse_source(code)
+        except SyntaxError:
+            continue
+        results[f"parse/{name}"] = measure(lambda: parse_source(code), rounds, min_time)
+        for engine in engines:
+            try:
+                results[f"run[{engine}]/{name}"] = measure(lambda: run(engine, program), rounds, min_time)
+            except RecursionError:
+                print(f"run[{engine}]/{name}: RecursionError, skipped", file=sys.stderr)
+    return results
+
+
+def bench_api(found, rounds, min_time):
+    """Latence de POST /parse-json : programme inédit (aucun cache ne sert)
+    et programme déjà vu (cache de résultats)."""
+    os.environ.setdefault("PISC_WORKERS", "1")
+    from fastapi.testclient import TestClient
+    import app as api
+
+    results = {}
+    with TestClient(api.app) as client:
+        for name in ["sample/while", "sample/nested", "synthetic/200"]:
+            code = found[name]
+            nonce = iter(range(10 ** 9))
+
+            def fresh():
+                # une affectation en tête change l'AST : ni le cache des workers
+                # ni celui des résultats ne répondent
+                client.post("/parse-json", json={"code": f"bench_nonce = {next(nonce)}\n{code}"})
+
+            results[f"api/{name}"] = measure(fresh, rounds, min_time)
+            results[f"api_cached/{name}"] = measure(
+                lambda: client.post("/parse-json", json={"code": code}), rounds, min_time)
+    return results
+
+
+# -------------------------
+# Comparaison
+# -------------------------
+def compare(current, baseline, threshold):
+    """[(clé, référence ms, actuel ms, ratio)] triées par ratio décroissant,
+    et la liste des régressions (ratio > 1 + threshold).
+
+    Compare les meilleures séries (min_ms) : moins sensibles que la médiane
+    à la charge de la machine."""
+    rows = []
+    for key, result in current["results"].items():
+        if key in baseline["results"]:
+            before, after = baseline["results"][key]["min_ms"], result["min_ms"]
+            rows.append((key, before, after, after / before if before else float("inf")))
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return rows, [row for row in rows if row[3] > 1 + threshold]
+
+
+def main():
+    argp = argparse.ArgumentParser(description=__doc__)
+    argp.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    argp.add_argument("--compare", metavar="BASELINE", help="JSON d'une exécution précédente")
+    argp.add_argument("--threshold", type=float, default=0.15, help="ralentissement toléré (0.15 = +15%%)")
+    argp.add_argument("--engines", default="tree,vm")
+    argp.add_argument("--rounds", type=int, default=5)
+    argp.add_argument("--min-time", type=float, default=0.05, help="durée minimale d'une série (s)")
+    argp.add_argument("--quick", action="store_true", help="moins de programmes et de séries")
+    argp.add_argument("--no-api", action="store_true", help="sans la latence de l'API")
+    args = argp.parse_args()
+
+    rounds = 3 if args.quick else args.rounds
+    found = programs(args.quick)
+    results = bench_phases(found, args.engines.split(","), rounds, args.min_time)
+    if not args.no_api:
+        results.update(bench_api(found, rounds, args.min_time))
+
+    current = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "parser": PARSER_BACKEND, "date": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2, sort_keys=True)
+
+    width = max(len(key) for key in results)
+    print(f"{'':<{width}}{'median':>14}{'min':>14}")
+    for key, result in results.items():
+        print(f"{key:<{width}}{result['median_ms']:>12.4f}ms{result['min_ms']:>12.4f}ms")
+    print(f"-> {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows, regressions = compare(current, baseline, args.threshold)
+        print(f"\ncompared with {args.compare} (threshold +{args.threshold:.0%})")
+        for key, before, after, ratio in rows:
+            flag = "  REGRESSION" if ratio > 1 + args.threshold else ""
+            print(f"{key:<{width}}{before:>12.4f}ms{after:>12.4f}ms  x{ratio:.2f}{flag}")
+        if regressions:
+            print(f"{len(regressions)} regression(s)")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
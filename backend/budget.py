@@ -0,0 +1,116 @@
+# budget.py
+
+import operator
+
+# -------------------------
+# Limites d'exécution
+# -------------------------
+# Un pas (step) = une instruction exécutée ou un tour de boucle : tous les
+# moteurs comptent exactement de la même façon.
+# La sortie se mesure en caractères affichés (retour à la ligne compris).
+# La taille d'une valeur : longueur d'une chaîne, octets d'un entier ; seuls
+# + et * peuvent la faire grossir.
+
+
+class BudgetExceeded(RuntimeError):
+    """Le programme a dépassé une de ses limites d'exécution."""
+
+
+def step_limit_error(max_steps):
+    return BudgetExceeded(f"Step limit exceeded ({max_steps} steps)")
+
+
+def output_limit_error(max_output):
+    return BudgetExceeded(f"Output limit exceeded ({max_output} characters)")
+
+
+def value_size_error(max_value_size):
+    return BudgetExceeded(f"Value size limit exceeded ({max_value_size})")
+
+
+def output_size(value):
+    """Caractères écrits sur la console par print(value)."""
+    return len(str(value)) + 1
+
+
+def repeat_size(left, right):
+    """Longueur de `left * right` quand l'un des deux est une chaîne."""
+    if isinstance(left, str) and isinstance(right, int):
+        return len(left) * max(right, 0)
+    if isinstance(left, int) and isinstance(right, str):
+        return len(right) * max(left, 0)
+    return 0
+
+
+def checked_operator(op, max_value_size):
+    """Version de l'opérateur `op` (+ ou *) qui refuse les résultats trop gros.
+
+    Seuls + et * peuvent faire grossir une valeur sans limite (concaténation,
+    répétition de chaîne, produit d'entiers). Le résultat est contrôlé après
+    coup (au pire deux fois la limite, les opérandes la respectant déjà), sauf
+    la répétition de chaîne ("x" * n), contrôlée avant allocation.
+    Utilisé par les trois moteurs : les erreurs tombent au même endroit.
+    """
+    max_bits = 8 * max_value_size
+    small = 1 << 62  # en dessous, pas besoin de bit_length()
+
+    def too_big(result):
+        cls = result.__class__
+        if cls is str:
+            return len(result) > max_value_size
+        if cls is int and not -small < result < small:
+            return result.bit_length() > max_bits
+        return False
+
+    if op == '+':
+        def checked(left, right):
+            result = left + right
+            if too_big(result):
+                raise value_size_error(max_value_size)
+            return result
+    elif op == '*':
+        def checked(left, right):
+            if (left.__class__ is str or right.__class__ is str) \
+                    and repeat_size(left, right) > max_value_size:
+                raise value_size_error(max_value_size)
+            result = left * right
+            if too_big(result):
+                raise value_size_error(max_value_size)
+            return result
+    else:
+        raise ValueError(f"No size check for operator {op}")
+
+    checked.symbol = op
+    return checked
+
+
+def checked_operators(max_value_size):
+    """{'+': ..., '*': ...} contrôlés, ou None sans limite de taille."""
+    if max_value_size is None:
+        return None
+    return {op: checked_operator(op, max_value_size) for op in ('+', '*')}
+
+
+class Limits:
+    """Limites d'une exécution ; None = illimité."""
+
+    def __init__(self, max_steps=None, max_output=None, max_value_size=None):
+        self.max_steps = max_steps
+        self.max_output = max_output
+        self.max_value_size = max_value_size
+
+    def as_kwargs(self):
+        return {"max_steps": self.max_steps, "max_output": self.max_output,
+                "max_value_size": self.max_value_size}
+
+    def key(self):
+        return (self.max_steps, self.max_output, self.max_value_size)
+
+    def capped(self, max_steps=None, max_output=None, max_value_size=None):
+        """Limites demandées par un client, sans dépasser celles-ci."""
+        def cap(requested, limit):
+            if requested is None:
+                return limit
+            return requested if limit is None else min(requested, limit)
+        return Limits(cap(max_steps, self.max_steps), cap(max_output, self.max_output),
+                      cap(max_value_size, self.max_value_size))
@@ -0,0 +1,53 @@
+# build_tables.py
+# Génère les tables PLY livrées avec le backend : lextab.py (lexer) et
+# parsetab.py (parser LALR). À relancer après toute modification des tokens,
+# des regex de lexer.py ou de la grammaire de parser.py : à l'import, des
+# tables périmées lèvent lexer.StaleTables.
+#   python build_tables.py          régénère les tables
+#   python build_tables.py --check  vérifie qu'elles sont à jour (code retour 1 sinon)
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+TABLE_FILES = ("lextab.py", "parsetab.py")
+
+
+def import_parser(**env):
+    """Importe parser.py dans un processus neuf ; retourne le CompletedProcess."""
+    return subprocess.run([sys.executable, "-c", "import parser"], cwd=BACKEND_DIR,
+                          env=dict(os.environ, **env), capture_output=True, text=True)
+
+
+def build():
+    for name in TABLE_FILES:
+        path = os.path.join(BACKEND_DIR, name)
+        if os.path.exists(path):
+            os.remove(path)
+    # graine de hachage fixe : mêmes fichiers à chaque génération
+    result = import_parser(PISC_BUILD_TABLES="1", PYTHONHASHSEED="0")
+    if result.returncode != 0:
+        sys.exit(result.stderr)
+    print("Generated " + ", ".join(TABLE_FILES))
+
+
+def check():
+    result = import_parser()
+    if result.returncode != 0:
+        sys.exit(result.stderr.strip().splitlines()[-1])
+    print("Tables are up to date")
+
+
+def main():
+    argp = argparse.ArgumentParser(description="Generate or check the PLY tables.")
+    argp.add_argument("--check", action="store_true", help="only check that the tables are up to date")
+    args = argp.parse_args()
+    if args.check:
+        check()
+    else:
+        build()
+
+
+if __name__ == "__main__":
+    main()
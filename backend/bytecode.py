@@ -0,0 +1,425 @@
+# bytecode.py
+
+import operator
+
+from parser import (
+    Program, Assign, Print, If, While, For,
+    BinOp, UnaryOp, Var, Number, Boolean, String, Null, Let, locate
+)
+from budget import step_limit_error, output_limit_error, output_size, checked_operators
+from sinks import EchoSink
+
+# -------------------------
+# Opcodes
+# -------------------------
+# Une instruction est un tuple de taille fixe (opcode, a, b, c).
+# Les opérateurs binaires sont portés par l'instruction (fonction du module
+# `operator`) : une seule branche du dispatch couvre + - * == != < <= > >=,
+# et les variantes _K / _NK / _NN lisent directement leurs opérandes
+# (constante, variable) au lieu de passer par la pile.
+LOAD_NAME     = 0   # a=slot                 -> push variable
+BINARY_NK     = 1   # a=fn, b=slot, c=const  -> push fn(variable, const)
+STORE_NAME    = 2   # a=slot                 -> pop dans la variable
+JUMP_IF_FALSE = 3   # a=target               -> pop la condition
+LOAD_CONST    = 4   # a=const                -> push const
+BINARY        = 5   # a=fn                   -> pop right, left ; push fn(left, right)
+BINARY_K      = 6   # a=fn, b=const          -> pop left ; push fn(left, const)
+BINARY_NN     = 7   # a=fn, b=slot, c=slot   -> push fn(variable, variable)
+JUMP          = 8   # a=target
+FOR_ITER      = 9   # a=slot, b=target       -> variable = next(iter) ou pop + saut
+PRINT         = 10  #                        -> pop et affiche
+BINARY_DIV    = 11  #                        -> division avec contrôle du zéro
+UNARY_NEG     = 12
+PUSH_RANGE    = 13  # a=count                -> push iter(range(count))
+STORE_KEEP    = 14  # a=slot                 -> variable = sommet de pile (sans pop)
+STEP          = 15  #                        -> compte un pas (émis seulement avec max_steps)
+
+OPNAMES = {
+    value: name for name, value in globals().items()
+    if name.isupper() and isinstance(value, int)
+}
+
+BINARY_FUNCTIONS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': operator.truediv,
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+FUNCTION_SYMBOLS = {fn: op for op, fn in BINARY_FUNCTIONS.items()}
+
+
+# -------------------------
+# Code object
+# -------------------------
+class Code:
+    def __init__(self, instructions, consts, names, positions=None):
+        self.instructions = instructions  # list[tuple] : (opcode, a, b, c)
+        self.consts = consts              # pool des constantes du programme
+        self.names = names                # slot -> nom de variable
+        # pc -> position source de l'instruction .pisc compilée (erreurs)
+        self.positions = positions or [None] * len(instructions)
+
+    def __repr__(self):
+        return (f"Code({len(self.instructions)} instructions, "
+                f"{len(self.consts)} consts, {len(self.names)} names)")
+
+
+def _symbol(fn):
+    # les opérateurs contrôlés (max_value_size) portent leur symbole
+    return FUNCTION_SYMBOLS.get(fn) or fn.symbol
+
+
+def disassemble(code):
+    """Retourne une représentation texte lisible du bytecode."""
+    lines = []
+    for pc, (op, a, b, c) in enumerate(code.instructions):
+        text = f"{pc:5d} {OPNAMES[op]:<14}"
+        if op in (LOAD_NAME, STORE_NAME, STORE_KEEP):
+            text += f" {code.names[a]}"
+        elif op == LOAD_CONST:
+            text += f" {a!r}"
+        elif op == BINARY:
+            text += f" {_symbol(a)}"
+        elif op == BINARY_K:
+            text += f" {_symbol(a)} {b!r}"
+        elif op == BINARY_NK:
+            text += f" {code.names[b]} {_symbol(a)} {c!r}"
+        elif op == BINARY_NN:
+            text += f" {code.names[b]} {_symbol(a)} {code.names[c]}"
+        elif op == FOR_ITER:
+            text += f" {code.names[a]} -> {b}"
+        elif op in (JUMP, JUMP_IF_FALSE, PUSH_RANGE):
+            text += f" {a}"
+        lines.append(text)
+    return "\n".join(lines)
+
+
+# -------------------------
+# Compiler (AST -> bytecode)
+# -------------------------
+_LITERALS = (Number, Boolean, String, Null)
+
+
+def _literal_value(expr):
+    return None if isinstance(expr, Null) else expr.value
+
+
+class Compiler:
+    def __init__(self, count_steps=False, max_value_size=None):
+        self.instructions = []
+        self.consts = []
+        self.const_keys = set()
+        self.names = []
+        self.name_index = {}
+        self.positions = []  # parallèle à instructions (voir Code.positions)
+        self.pos = None      # position de l'instruction .pisc en cours de compilation
+        # Budgets : instructions STEP et opérateurs contrôlés seulement si demandés,
+        # le bytecode sans limite reste inchangé.
+        self.count_steps = count_steps
+        self.functions = dict(BINARY_FUNCTIONS)
+        self.functions.update(checked_operators(max_value_size) or {})
+
+    def compile(self, program: Program):
+        self.compile_block(program.statements)
+        return Code(self.instructions, self.consts, self.names, self.positions)
+
+    # --- helpers ---
+    def emit(self, op, a=None, b=None, c=None):
+        self.instructions.append((op, a, b, c))
+        self.positions.append(self.pos)
+        return len(self.instructions) - 1
+
+    def const(self, value):
+        # (type, value) : éviter que 1, 1.0 et True partagent la même entrée
+        key = (type(value), value)
+        if key not in self.const_keys:
+            self.const_keys.add(key)
+            self.consts.append(value)
+        return value
+
+    def slot(self, name):
+        if name not in self.name_index:
+            self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return self.name_index[name]
+
+    def patch(self, index, **fields):
+        op, a, b, c = self.instructions[index]
+        self.instructions[index] = (op, fields.get("a", a), fields.get("b", b), fields.get("c", c))
+
+    # --- statements ---
+    def compile_block(self, statements):
+        for stmt in statements:
+            self.compile_stmt(stmt)
+
+    def step(self):
+        if self.count_steps:
+            self.emit(STEP)
+
+    def compile_stmt(self, stmt):
+        outer, self.pos = self.pos, stmt._pos
+        self.step()
+        if isinstance(stmt, Assign):
+            self.compile_expr(stmt.expr)
+            self.emit(STORE_NAME, self.slot(stmt.name))
+
+        elif isinstance(stmt, Print):
+            self.compile_expr(stmt.expr)
+            self.emit(PRINT)
+
+        elif isinstance(stmt, If):
+            # chaîne elseif compilée en boucle : même bytecode que la récursion
+            # (chaque If de la chaîne a son pas et sa position)
+            end_jumps = []
+            while True:
+                self.compile_expr(stmt.condition)
+                else_jump = self.emit(JUMP_IF_FALSE, 0)
+                self.compile_block(stmt.then_branch)
+                else_branch = stmt.else_branch
+                if not else_branch:
+                    self.patch(else_jump, a=len(self.instructions))
+                    break
+                end_jumps.append(self.emit(JUMP, 0))
+                self.patch(else_jump, a=len(self.instructions))
+                if len(else_branch) == 1 and isinstance(else_branch[0], If):
+                    stmt = else_branch[0]
+                    self.pos = stmt._pos
+                    self.step()
+                    continue
+                self.compile_block(else_branch)
+                break
+            for end_jump in end_jumps:
+                self.patch(end_jump, a=len(self.instructions))
+
+        elif isinstance(stmt, While):
+            start = len(self.instructions)
+            self.compile_expr(stmt.condition)
+            exit_jump = self.emit(JUMP_IF_FALSE, 0)
+            self.step()  # un tour de boucle = un pas
+            self.compile_block(stmt.body)
+            self.emit(JUMP, start)
+            self.patch(exit_jump, a=len(self.instructions))
+
+        elif isinstance(stmt, For):
+            self.emit(PUSH_RANGE, stmt.count)
+            loop = self.emit(FOR_ITER, self.slot(stmt.var), 0)
+            self.step()  # un tour de boucle = un pas
+            self.compile_block(stmt.body)
+            self.emit(JUMP, loop)
+            self.patch(loop, b=len(self.instructions))
+
+        else:
+            raise RuntimeError(f"Unknown statement: {stmt}")
+        self.pos = outer
+
+    # --- expressions ---
+    def compile_expr(self, expr):
+        if isinstance(expr, _LITERALS):
+            self.emit(LOAD_CONST, self.const(_literal_value(expr)))
+        elif isinstance(expr, Var):
+            self.emit(LOAD_NAME, self.slot(expr.name))
+        elif isinstance(expr, BinOp):
+            self.compile_binop(expr)
+        elif isinstance(expr, UnaryOp):
+            if expr.op != '-':
+                raise RuntimeError(f"Unknown unary operator {expr.op}")
+            self.compile_expr(expr.operand)
+            self.emit(UNARY_NEG)
+        elif isinstance(expr, Let):
+            self.compile_expr(expr.expr)
+            self.emit(STORE_KEEP, self.slot(expr.name))
+        else:
+            raise RuntimeError(f"Unknown expression: {expr}")
+
+    def compile_binop(self, expr):
+        # branche gauche en boucle : longues chaînes a + b + c ... sans récursion
+        spine = []
+        while isinstance(expr.left, BinOp):
+            spine.append(expr)
+            expr = expr.left
+        self.compile_operation(expr)
+        for expr in reversed(spine):
+            self.compile_operation(expr, left_compiled=True)
+
+    def compile_operation(self, expr, left_compiled=False):
+        """Une opération ; `left_compiled` : l'opérande gauche (un BinOp) est
+        déjà sur la pile."""
+        if expr.op not in BINARY_FUNCTIONS:
+            raise RuntimeError(f"Unknown binary operator {expr.op}")
+        fn = self.functions[expr.op]
+        left, right = expr.left, expr.right
+        right_is_const = isinstance(right, _LITERALS)
+
+        # Une division n'est spécialisée que si le diviseur est une constante non nulle :
+        # sinon le contrôle "Division by zero" doit être fait à l'exécution.
+        if expr.op == '/' and not (right_is_const and not _literal_value(right) == 0):
+            if not left_compiled:
+                self.compile_expr(left)
+            self.compile_expr(right)
+            self.emit(BINARY_DIV)
+            return
+
+        if right_is_const:
+            value = self.const(_literal_value(right))
+            if isinstance(left, Var):
+                self.emit(BINARY_NK, fn, self.slot(left.name), value)
+            else:
+                if not left_compiled:
+                    self.compile_expr(left)
+                self.emit(BINARY_K, fn, value)
+        elif isinstance(left, Var) and isinstance(right, Var):
+            self.emit(BINARY_NN, fn, self.slot(left.name), self.slot(right.name))
+        else:
+            if not left_compiled:
+                self.compile_expr(left)
+            self.compile_expr(right)
+            self.emit(BINARY, fn)
+
+
+def compile_program(program: Program, count_steps=False, max_value_size=None) -> Code:
+    return Compiler(count_steps, max_value_size).compile(program)
+
+
+# -------------------------
+# Virtual machine
+# -------------------------
+_UNSET = object()  # marqueur de variable jamais assignée
+
+
+class VM:
+    """Machine à pile : même interface que Interpreter (run -> liste des print)."""
+
+    def __init__(self, max_steps=None, max_output=None, max_value_size=None, sink=None):
+        self.output = []
+        self.max_steps = max_steps
+        self.max_output = max_output
+        self.max_value_size = max_value_size
+        self.sink = sink  # voir Interpreter.sink
+
+    def run(self, program):
+        """Compile (si besoin) puis exécute un programme ; retourne les sorties.
+
+        Un `Code` déjà compilé n'applique max_steps / max_value_size que s'il a
+        été compilé avec (compile_program(..., count_steps, max_value_size)).
+        """
+        code = program if isinstance(program, Code) else compile_program(
+            program, self.max_steps is not None, self.max_value_size)
+        sink = EchoSink() if self.sink is None else self.sink
+        self.output = sink.values
+        try:
+            self.execute(code, sink.write)
+        finally:
+            sink.flush()
+        return self.output
+
+    def execute(self, code: Code, emit):
+        instructions = code.instructions
+        names = code.names
+        slots = [_UNSET] * len(names)
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        end = len(instructions)
+        pc = 0
+        max_steps, max_output = self.max_steps, self.max_output
+        steps_left = float("inf") if max_steps is None else max_steps
+        output_left = float("inf") if max_output is None else max_output
+
+        # Opcodes en variables locales : LOAD_FAST au lieu de LOAD_GLOBAL dans le dispatch
+        _LOAD_NAME, _BINARY_NK, _STORE_NAME, _JUMP_IF_FALSE = LOAD_NAME, BINARY_NK, STORE_NAME, JUMP_IF_FALSE
+        _LOAD_CONST, _BINARY, _BINARY_K, _BINARY_NN = LOAD_CONST, BINARY, BINARY_K, BINARY_NN
+        _JUMP, _FOR_ITER, _PRINT, _BINARY_DIV = JUMP, FOR_ITER, PRINT, BINARY_DIV
+        _UNARY_NEG, _PUSH_RANGE, _STORE_KEEP, _STEP, UNSET = UNARY_NEG, PUSH_RANGE, STORE_KEEP, STEP, _UNSET
+
+        # Boucle de dispatch : opcodes testés par fréquence d'apparition
+        try:
+            while pc < end:
+                op, a, b, c = instructions[pc]
+                pc += 1
+                if op == _LOAD_NAME:
+                    value = slots[a]
+                    if value is UNSET:
+                        raise NameError(f"Variable '{names[a]}' not defined")
+                    push(value)
+                elif op == _BINARY_NK:
+                    value = slots[b]
+                    if value is UNSET:
+                        raise NameError(f"Variable '{names[b]}' not defined")
+                    push(a(value, c))
+                elif op == _STORE_NAME:
+                    slots[a] = pop()
+                elif op == _JUMP_IF_FALSE:
+                    if not pop():
+                        pc = a
+                elif op == _LOAD_CONST:
+                    push(a)
+                elif op == _BINARY:
+                    right = pop()
+                    stack[-1] = a(stack[-1], right)
+                elif op == _BINARY_K:
+                    stack[-1] = a(stack[-1], b)
+                elif op == _BINARY_NN:
+                    left = slots[b]
+                    if left is UNSET:
+                        raise NameError(f"Variable '{names[b]}' not defined")
+                    right = slots[c]
+                    if right is UNSET:
+                        raise NameError(f"Variable '{names[c]}' not defined")
+                    push(a(left, right))
+                elif op == _JUMP:
+                    pc = a
+                elif op == _STEP:
+                    steps_left -= 1
+                    if steps_left < 0:
+                        raise step_limit_error(max_steps)
+                elif op == _FOR_ITER:
+                    value = next(stack[-1], UNSET)
+                    if value is UNSET:
+                        pop()
+                        pc = b
+                    else:
+                        slots[a] = value
+                elif op == _PRINT:
+                    value = pop()
+                    if max_output is not None:
+                        output_left -= output_size(value)
+                        if output_left < 0:
+                            raise output_limit_error(max_output)
+                    emit(value)           # stocker, afficher ou transmettre la sortie
+                elif op == _BINARY_DIV:
+                    right = pop()
+                    if right == 0:
+                        raise RuntimeError("Division by zero")
+                    stack[-1] = stack[-1] / right
+                elif op == _UNARY_NEG:
+                    stack[-1] = -stack[-1]
+                elif op == _PUSH_RANGE:
+                    push(iter(range(a)))
+                elif op == _STORE_KEEP:
+                    slots[a] = stack[-1]
+                else:
+                    raise RuntimeError(f"Unknown opcode {op}")
+        except Exception as e:
+            raise locate(e, code.positions[pc - 1])  # pc a déjà avancé
+
+
+# -------------------------
+# Manual test (only if run directly)
+# -------------------------
+if __name__ == "__main__":
+    from lexer import lexer
+    from parser import parser
+
+    code = """
+    a = 0
+    for i in range(5) {
+        a = a + i * 2
+    }
+    print(a)
+    """
+
+    ast = parser.parse(code, lexer=lexer)
+    compiled = compile_program(ast)
+    print(disassemble(compiled))
+
+    print("\n=== Résultats collectés ===")
+    print(VM().run(compiled))
@@ -0,0 +1,287 @@
+# cache.py
+
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from parser import parse_source, node_fields
+from optimizer import optimize as optimize_ast
+from cse import eliminate_common_subexpressions
+from budget import BudgetExceeded
+
+
+def source_hash(code: str) -> str:
+    """Empreinte du texte source (clé du cache)."""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+def estimate_size(value) -> int:
+    """Taille approximative (octets) d'un AST ; un sous-arbre partagé compte une fois."""
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        total += sys.getsizeof(node)
+        if isinstance(node, (list, tuple)):
+            stack.extend(node)
+        elif hasattr(node, "__slots__"):
+            stack.extend(getattr(node, field, None) for field in node.__slots__)
+    return total
+
+
+def ast_hash(program) -> str:
+    """Empreinte de l'AST normalisé (mise en forme et commentaires ignorés).
+
+    Hash de Merkle calculé sans récursion : chaque nœud est haché à partir de
+    son type, de ses champs publics et du hash de ses enfants ; un sous-arbre
+    partagé (hash-consing) n'est haché qu'une fois.
+    """
+    digests = {}
+    stack = [(program, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if id(node) in digests:
+            continue
+        children = node if isinstance(node, list) else (
+            [v for _, v in node_fields(node)] if hasattr(node, "__slots__") else None)
+        if children is None:
+            # feuille : valeur Python (type inclus : 1, 1.0 et true diffèrent)
+            digests[id(node)] = f"{type(node).__name__}:{node!r}"
+            continue
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in children if id(child) not in digests)
+            continue
+        label = "list" if isinstance(node, list) else node.__class__.__name__
+        h = hashlib.sha256(label.encode("utf-8"))
+        for child in children:
+            h.update(b"\0")
+            h.update(digests[id(child)].encode("utf-8"))
+        digests[id(node)] = h.hexdigest()
+    return digests[id(program)]
+
+
+# -------------------------
+# Cache LRU générique
+# -------------------------
+class LRUCache:
+    """Cache LRU thread-safe borné en nombre d'entrées et en octets.
+
+    Chaque valeur stockée expose un attribut `size` (octets estimés).
+    """
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def lookup(self, key):
+        """Entrée associée à `key` (et marquée récente), ou None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            if entry.size > self.max_bytes:
+                return  # trop gros pour être gardé
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old.size
+            self.entries[key] = entry
+            self.bytes += entry.size
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= evicted.size
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# -------------------------
+# Entrée du cache
+# -------------------------
+class CachedProgram:
+    def __init__(self, ast, program, errors, syntax_error=None):
+        self.ast = ast                    # AST tel que parsé
+        self.program = program            # AST après optimize / cse (celui à exécuter)
+        self.errors = errors              # erreurs lexicales
+        self.syntax_error = syntax_error  # message de SyntaxError, ou None
+        self.size = len(errors) + estimate_size([ast, program])  # sous-arbres partagés comptés une fois
+        self._ast_hash = None
+
+    @property
+    def ast_hash(self):
+        """Empreinte de l'AST parsé (clé du cache de résultats), calculée une fois."""
+        if self._ast_hash is None:
+            self._ast_hash = ast_hash(self.ast)
+        return self._ast_hash
+
+    def unpack(self):
+        """(ast, program, errors) ; relève la SyntaxError d'origine le cas échéant."""
+        if self.syntax_error is not None:
+            raise SyntaxError(self.syntax_error)
+        return self.ast, self.program, self.errors
+
+
+# -------------------------
+# Cache LRU
+# -------------------------
+class ASTCache(LRUCache):
+    """Cache LRU des programmes parsés, indexé par le hash du source.
+
+    Un source déjà vu ne repasse ni par le lexer ni par le parser (ni par les
+    passes d'optimisation). L'éviction se fait sur le nombre d'entrées et sur
+    la taille estimée des arbres. Les AST mis en cache sont partagés entre
+    requêtes : les moteurs ne les modifient pas (hormis les slots du resolver,
+    toujours identiques pour un même arbre).
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        super().__init__(max_entries, max_bytes)
+
+    def get(self, code, optimize=True, cse=False):
+        """(ast, program, errors) ; SyntaxError si le source est invalide."""
+        return self.entry(code, optimize, cse).unpack()
+
+    def entry(self, code, optimize=True, cse=False, document=None, timings=None,
+              max_value_size=None) -> CachedProgram:
+        """`document` (incremental.Document) : en cas de miss, le source est
+        reparsé de façon incrémentale depuis la version précédente du document.
+        `timings` (dict) : en cas de miss, reçoit les durées (secondes) des
+        phases "lex", "parse" et "optimize" (voir build).
+        `max_value_size` : limite de l'exécution, respectée par l'optimiseur."""
+        key = (source_hash(code), optimize, cse, max_value_size if optimize else None)
+        entry = self.lookup(key)
+        if entry is None:
+            # parse hors verrou : les autres requêtes ne sont pas bloquées
+            entry = self.build(code, optimize, cse, document, timings, max_value_size)
+            self.put(key, entry)
+        return entry
+
+    @staticmethod
+    def build(code, optimize, cse, document=None, timings=None, max_value_size=None):
+        """Un document reparsé par morceaux n'a qu'une durée "parse" (lexing compris)."""
+        try:
+            if document is None:
+                ast, errors = parse_source(code, timings)
+            elif timings is None:
+                ast, errors = document.parse(code)
+            else:
+                start = time.perf_counter()
+                try:
+                    ast, errors = document.parse(code)
+                finally:
+                    timings["parse"] = time.perf_counter() - start
+        except SyntaxError as e:
+            return CachedProgram(None, None, [], str(e))
+        program = ast
+        if not errors:
+            start = time.perf_counter()
+            if optimize:
+                program = optimize_ast(program, max_value_size)
+            if cse:
+                program = eliminate_common_subexpressions(program)
+            if document is not None:
+                # sous-arbres partagés avec les versions précédentes : mêmes slots
+                document.resolve(program)
+            if timings is not None:
+                timings["optimize"] = time.perf_counter() - start
+        return CachedProgram(ast, program, errors)
+
+
+# -------------------------
+# Cache des résultats d'exécution
+# -------------------------
+# Erreurs qui dépendent des ressources de la machine ou des limites de la
+# requête, et non du programme seul : le résultat n'est pas mis en cache.
+UNCACHEABLE_ERRORS = (RecursionError, MemoryError, BudgetExceeded)
+
+
+class CachedResult:
+    def __init__(self, output, error=None):
+        self.output = tuple(output)  # sorties (valeurs immuables)
+        self.error = error           # (type, message) de l'erreur d'exécution, ou None
+        self.size = sys.getsizeof(self.output) + sum(sys.getsizeof(v) for v in self.output) + (
+            sys.getsizeof(error[1]) if error else 0)
+
+    def unpack(self):
+        """Liste des sorties ; relève l'erreur d'exécution mémorisée le cas échéant."""
+        if self.error is not None:
+            error_type, message = self.error
+            raise error_type(message)
+        return list(self.output)
+
+
+class ResultCache(LRUCache):
+    """Cache LRU des sorties, indexé par le hash de l'AST normalisé.
+
+    Un programme .pisc n'a ni entrée, ni horloge, ni aléatoire : sa sortie (ou
+    son erreur d'exécution) ne dépend que de l'AST, quel que soit le moteur,
+    ainsi que des passes appliquées et des limites (voir la clé dans app.py).
+    L'éviction se fait sur la taille totale des sorties gardées.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=16 * 1024 * 1024):
+        super().__init__(max_entries, max_bytes)
+
+    def store(self, key, output=(), error=None):
+        """Mémorise une sortie ou une erreur d'exécution (sauf erreur de ressources)."""
+        if isinstance(error, UNCACHEABLE_ERRORS):
+            return
+        self.put(key, CachedResult(output, (type(error), str(error)) if error is not None else None))
+
+
+class KnownProgram:
+    """Ce que l'API garde d'un source exécuté dans un worker (voir app.py).
+
+    `location` : (ligne, colonne) de l'erreur d'exécution mémorisée dans le
+    ResultCache ; propre à ce source (le hash d'AST ignore la mise en forme).
+    """
+
+    def __init__(self, ast_hash, ast_text, location=None):
+        self.ast_hash = ast_hash
+        self.ast_text = ast_text
+        self.location = location
+        self.size = sys.getsizeof(ast_hash) + sys.getsizeof(ast_text) + sys.getsizeof(location)
+
+
+class KnownDocument:
+    """Dernier texte reçu d'un document édité (voir app.py)."""
+
+    def __init__(self, text):
+        self.text = text
+        self.size = sys.getsizeof(text)
+
+
+# Cache partagé par les routes de app.py et main.py
+ast_cache = ASTCache()
@@ -0,0 +1,194 @@
+# cse.py
+
+from parser import (
+    Program, Assign, Print, If, While, For,
+    BinOp, UnaryOp, Var, Number, Boolean, String, Null, Let
+)
+
+# -------------------------
+# Élimination des sous-expressions communes (CSE)
+# -------------------------
+# Dans un bloc de base (suite d'Assign / Print, jusqu'à la prochaine
+# instruction de contrôle), une expression BinOp / UnaryOp déjà calculée est
+# réutilisée tant qu'aucune affectation ne touche l'une de ses variables :
+#   x = (a + b) * 2        x = (Let($0, a + b)) * 2
+#   y = (a + b) * 3   ->   y = $0 * 3
+# La première occurrence est évaluée à sa place habituelle (même ordre
+# d'évaluation, mêmes erreurs) ; les suivantes lisent la variable temporaire
+# `$n`, qu'aucun identifiant .pisc ne peut masquer. La condition d'un If
+# appartient au bloc qui le précède ; celle d'un While forme son propre bloc
+# puisqu'elle est réévaluée après le corps de la boucle.
+
+# Le nouvel AST ne partage aucun nœud avec l'original (voir resolver.py :
+# les slots sont propres à un programme).
+
+TEMP_PREFIX = "$"
+
+
+def copy_leaf(expr):
+    if isinstance(expr, Null):
+        return Null()
+    if isinstance(expr, Var):
+        return Var(expr.name)
+    return type(expr)(expr.value)
+
+
+class CommonSubexpressionEliminator:
+    def __init__(self):
+        self.temp_count = 0
+        self.keys = {}       # id(expr) -> clé structurelle (entier)
+        self.shapes = {}     # (type, champs, clés des enfants) -> clé
+        self.variables = {}  # clé -> variables lues par l'expression
+
+    def eliminate(self, program: Program) -> Program:
+        return Program(self.rewrite_block(program.statements))
+
+    # --- clés structurelles ---
+    # Deux expressions de même structure ont la même clé : un entier attribué
+    # à chaque forme (type, champs, clés des enfants), pour que les clés des
+    # longues chaînes restent des tuples courts.
+    def key(self, expr):
+        key = self.keys.get(id(expr))
+        if key is not None:
+            return key
+        if isinstance(expr, BinOp):
+            # branche gauche en boucle : longues chaînes a + b + c ... sans récursion
+            spine = []
+            while isinstance(expr, BinOp) and id(expr) not in self.keys:
+                spine.append(expr)
+                expr = expr.left
+            left = self.key(expr)
+            for expr in reversed(spine):
+                right = self.key(expr.right)
+                left = self.intern(expr, ("BinOp", left, expr.op, right),
+                                   lambda: self.variables[left] | self.variables[right])
+            return left
+        if isinstance(expr, Var):
+            shape, names = ("Var", expr.name), {expr.name}
+        elif isinstance(expr, Null):
+            shape, names = ("Null",), set()
+        elif isinstance(expr, (Number, Boolean, String)):
+            shape, names = (type(expr).__name__, type(expr.value), expr.value), set()
+        elif isinstance(expr, UnaryOp):
+            operand = self.key(expr.operand)
+            shape, names = ("UnaryOp", expr.op, operand), self.variables[operand]
+        else:
+            raise RuntimeError(f"Unknown expression: {expr}")
+        return self.intern(expr, shape, lambda: names)
+
+    def intern(self, expr, shape, names):
+        """Clé de la forme `shape` ; `names()` : variables lues (nouvelle forme)."""
+        key = self.shapes.get(shape)
+        if key is None:
+            key = self.shapes[shape] = len(self.shapes)
+            self.variables[key] = names()
+        self.keys[id(expr)] = key
+        return key
+
+    # --- blocs ---
+    def rewrite_block(self, statements):
+        """Réécrit une liste d'instructions, bloc de base par bloc de base."""
+        result = []
+        pending = []  # instructions simples du bloc de base courant
+        for stmt in statements:
+            if isinstance(stmt, (Assign, Print)):
+                pending.append(stmt)
+                continue
+            if isinstance(stmt, If):
+                result.extend(self.rewrite_if(stmt, pending))
+            else:
+                result.extend(self.rewrite_basic_block(pending)[0])
+                result.append(self.rewrite_compound(stmt))
+            pending = []
+        result.extend(self.rewrite_basic_block(pending)[0])
+        return result
+
+    def rewrite_if(self, stmt, pending):
+        """Instructions en attente puis If réécrits. La chaîne elseif est
+        parcourue en boucle, dans l'ordre de la récursion : conditions, else
+        final, puis branches then de la dernière à la première."""
+        chain = []
+        while True:
+            # la condition est évaluée juste après les instructions en attente
+            simple, condition = self.rewrite_basic_block(pending, stmt.condition)
+            chain.append((stmt, simple, condition))
+            else_branch = stmt.else_branch
+            if else_branch and len(else_branch) == 1 and isinstance(else_branch[0], If):
+                stmt, pending = else_branch[0], []
+                continue
+            rest = self.rewrite_block(else_branch) if else_branch else else_branch
+            break
+        for stmt, simple, condition in reversed(chain):
+            rest = simple + [If(condition, self.rewrite_block(stmt.then_branch), rest, stmt._pos)]
+        return rest
+
+    def rewrite_compound(self, stmt):
+        if isinstance(stmt, While):
+            condition = self.rewrite_basic_block([], stmt.condition)[1]
+            return While(condition, self.rewrite_block(stmt.body), stmt._pos)
+        elif isinstance(stmt, For):
+            return For(stmt.var, stmt.count, self.rewrite_block(stmt.body), stmt._pos)
+        else:
+            raise RuntimeError(f"Unknown statement: {stmt}")
+
+    def rewrite_basic_block(self, statements, condition=None):
+        """Deux parcours identiques : le premier compte les réutilisations,
+        le second insère les Let / variables temporaires."""
+        reused = set()
+        self.walk_block(statements, condition, reused, None)
+        return self.walk_block(statements, condition, reused, {})
+
+    def walk_block(self, statements, condition, reused, temps):
+        available = set()  # clés déjà calculées dans le bloc
+        rewritten = []
+        for stmt in statements:
+            expr = self.walk_expr(stmt.expr, available, reused, temps)
+            if isinstance(stmt, Assign):
+                rewritten.append(Assign(stmt.name, expr, stmt._pos))
+                # l'affectation invalide les expressions qui lisent la variable
+                available = {k for k in available if stmt.name not in self.variables[k]}
+            else:
+                rewritten.append(Print(expr, stmt._pos))
+        if condition is not None:
+            condition = self.walk_expr(condition, available, reused, temps)
+        return rewritten, condition
+
+    def walk_expr(self, expr, available, reused, temps):
+        if not isinstance(expr, (BinOp, UnaryOp)):
+            return expr if temps is None else copy_leaf(expr)
+        key = self.key(expr)
+        if key in available:
+            if temps is None:
+                reused.add(key)
+                return expr
+            return Var(temps[key])
+        if isinstance(expr, BinOp):
+            # branche gauche en boucle, dans l'ordre de la récursion
+            spine = []
+            while isinstance(expr, BinOp) and self.key(expr) not in available:
+                spine.append(expr)
+                expr = expr.left
+            left = self.walk_expr(expr, available, reused, temps)
+            for expr in reversed(spine):
+                right = self.walk_expr(expr.right, available, reused, temps)
+                rebuilt = expr if temps is None else BinOp(left, expr.op, right)
+                left = self.computed(self.key(expr), rebuilt, available, reused, temps)
+            return left
+        operand = self.walk_expr(expr.operand, available, reused, temps)
+        rebuilt = expr if temps is None else UnaryOp(expr.op, operand)
+        return self.computed(key, rebuilt, available, reused, temps)
+
+    def computed(self, key, rebuilt, available, reused, temps):
+        """Expression `rebuilt` de clé `key` évaluée ici : disponible ensuite,
+        rangée dans une variable temporaire si elle est réutilisée."""
+        available.add(key)
+        if temps is not None and key in reused:
+            temps[key] = f"{TEMP_PREFIX}{self.temp_count}"
+            self.temp_count += 1
+            return Let(temps[key], rebuilt)
+        return rebuilt
+
+
+def eliminate_common_subexpressions(program: Program) -> Program:
+    """Retourne un nouvel AST où les sous-expressions répétées sont partagées."""
+    return CommonSubexpressionEliminator().eliminate(program)
@@ -0,0 +1,30 @@
+# engines.py
+
+from interpreter import Interpreter
+from bytecode import VM
+from transpiler import PythonEngine
+
+# -------------------------
+# Moteurs d'exécution disponibles
+# -------------------------
+# Chaque moteur expose la même interface : Engine().run(program) -> liste des print
+# et accepte les mêmes options : Engine(max_steps, max_output, max_value_size, sink)
+ENGINES = {
+    "tree": Interpreter,  # interpréteur par parcours d'AST (historique)
+    "vm": VM,             # compilation en bytecode + machine à pile
+    "python": PythonEngine,  # transpilation en code Python natif
+}
+
+DEFAULT_ENGINE = "tree"
+
+
+def get_engine(name: str = DEFAULT_ENGINE, max_steps=None, max_output=None, max_value_size=None,
+               sink=None):
+    """Retourne une nouvelle instance du moteur demandé.
+
+    Limites : voir budget.py. `sink` (sinks.py) reçoit les print ; par défaut
+    ils sont retournés par run() et affichés sur la console.
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine '{name}' (expected one of: {', '.join(ENGINES)})")
+    return ENGINES[name](max_steps, max_output, max_value_size, sink)
@@ -0,0 +1,253 @@
+# incremental.py
+
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+
+from parser import Program, Assign, Print, If, While, For, parse_source, thread_parser
+from lexer import new_lexer
+from scanner import tokens_from, TYPE_IDS
+from resolver import Resolver, resolve
+from cache import LRUCache
+
+# -------------------------
+# Re-lexing / re-parsing incrémental d'un document
+# -------------------------
+# Un document (l'éditeur d'un client) est découpé en segments : chacun va du
+# premier token d'une instruction de premier niveau au début de la suivante.
+# Après une modification, seuls les segments touchés sont relexés et
+# reparsés ; les autres gardent leurs instructions (sous-arbres réutilisés,
+# simplement repositionnés s'ils ont été décalés).
+#
+# Chaque segment est parsé seul (grammaire : liste d'instructions) : si tous
+# sont valides, leur concaténation est exactement le parse du texte entier.
+# Dès qu'un segment contient une erreur (lexicale ou de syntaxe), le texte
+# entier est reparsé pour obtenir les mêmes erreurs qu'un parse complet.
+
+# Tokens qui commencent une instruction (IDENTIFIER : s'il est suivi de '=')
+STATEMENT_STARTS = {TYPE_IDS[name] for name in ('IF', 'WHILE', 'FOR', 'PRINT', 'COMMENT')}
+IDENTIFIER, EQUALS = TYPE_IDS['IDENTIFIER'], TYPE_IDS['EQUALS']
+BLOCK_START, BLOCK_END = TYPE_IDS['BLOCK_START'], TYPE_IDS['BLOCK_END']
+
+
+def boundaries(text, pos):
+    """Générateur des débuts d'instruction de premier niveau (hors accolades)
+    de `text` à partir de `pos` ; `pos` doit être un début de token."""
+    depth = 0
+    pending = None  # IDENTIFIER en attente du token suivant
+    for kind, start, _ in tokens_from(text, pos):
+        if pending is not None:
+            if kind == EQUALS:
+                yield pending
+            pending = None
+        if kind == BLOCK_START:
+            depth += 1
+        elif kind == BLOCK_END:
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            if kind in STATEMENT_STARTS:
+                yield start
+            elif kind == IDENTIFIER:
+                pending = start
+
+
+def parse_region(text, start, end):
+    """Parse la tranche [start:end] de `text` (bornée par des débuts de token).
+
+    Les positions (nœuds, messages d'erreur) sont celles du texte entier.
+    Retourne (instructions, erreurs lexicales) ; SyntaxError si invalide.
+    """
+    lexer = new_lexer()
+    lexer.input(text)
+    lexer.lexpos, lexer.lexlen = start, end
+    lexer.lineno = text.count("\n", 0, start) + 1
+    program = thread_parser().parse(None, lexer=lexer)
+    return program.statements, lexer.errors
+
+
+def moved(statements, delta):
+    """Copie des instructions décalées de `delta` caractères (expressions partagées)."""
+    if not delta:
+        return statements
+    return [_moved(stmt, delta) for stmt in statements]
+
+
+def _moved(stmt, delta):
+    pos = stmt._pos + delta
+    if isinstance(stmt, Assign):
+        return Assign(stmt.name, stmt.expr, pos)
+    elif isinstance(stmt, Print):
+        return Print(stmt.expr, pos)
+    elif isinstance(stmt, If):
+        # chaîne elseif parcourue en boucle (comme interpreter.py), puis
+        # reconstruite depuis la fin
+        chain = [stmt]
+        else_branch = stmt.else_branch
+        while else_branch and len(else_branch) == 1 and isinstance(else_branch[0], If):
+            chain.append(else_branch[0])
+            else_branch = else_branch[0].else_branch
+        if else_branch:
+            else_branch = moved(else_branch, delta)
+        for link in reversed(chain):
+            node = If(link.condition, moved(link.then_branch, delta), else_branch, link._pos + delta)
+            else_branch = [node]
+        return node
+    elif isinstance(stmt, While):
+        return While(stmt.condition, moved(stmt.body, delta), pos)
+    elif isinstance(stmt, For):
+        return For(stmt.var, stmt.count, moved(stmt.body, delta), pos)
+    raise RuntimeError(f"Unknown statement: {stmt}")
+
+
+def common_affixes(old, new):
+    """(préfixe, suffixe) communs de deux textes, sans chevauchement."""
+    limit = min(len(old), len(new))
+    # dichotomie sur des comparaisons de tranches (boucle en C)
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[:mid] == new[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    prefix = low
+    low, high = 0, limit - prefix
+    while low < high:
+        mid = (low + high + 1) // 2
+        if old[len(old) - mid:] == new[len(new) - mid:]:
+            low = mid
+        else:
+            high = mid - 1
+    return prefix, low
+
+
+def apply_changes(text, changes):
+    """Applique des modifications (début, fin, texte inséré) à `text`, dans
+    l'ordre : chacune porte sur le texte produit par la précédente."""
+    for start, end, insert in changes:
+        if not 0 <= start <= end <= len(text):
+            raise ValueError(f"Invalid change range [{start}, {end}] (document length {len(text)})")
+        text = text[:start] + insert + text[end:]
+    return text
+
+
+class Segment:
+    __slots__ = ('start', 'statements', 'errors', 'syntax_error')
+
+    def __init__(self, start, statements, errors, syntax_error=None):
+        self.start = start                # premier token (0 pour le premier segment)
+        self.statements = statements      # instructions parsées (positions absolues)
+        self.errors = errors              # erreurs lexicales du segment
+        self.syntax_error = syntax_error  # SyntaxError du segment seul, ou None
+
+    @classmethod
+    def parse(cls, text, start, end):
+        try:
+            return cls(start, *parse_region(text, start, end))
+        except SyntaxError as e:
+            return cls(start, [], [], e)
+
+
+class Document:
+    """Dernière version parsée d'un document et ses segments.
+
+    `parse(text)` a le contrat de parser.parse_source : (ast, erreurs
+    lexicales), SyntaxError si le texte est invalide.
+    """
+
+    def __init__(self):
+        self.text = None
+        self.segments = []
+        self.result = None   # (ast, erreurs) ou SyntaxError de la dernière version
+        self.resolver = Resolver()  # slots communs à toutes les versions
+        self.lock = threading.Lock()
+        self.reparsed = 0    # segments reparsés par la dernière mise à jour
+
+    @property
+    def size(self):
+        # taille estimée : le texte (les arbres lui sont proportionnels)
+        return sys.getsizeof(self.text or "")
+
+    def parse(self, text):
+        with self.lock:
+            if text != self.text:
+                self.update(text)
+                self.text = text
+            if isinstance(self.result, SyntaxError):
+                raise SyntaxError(str(self.result))
+            return self.result
+
+    def resolve(self, program):
+        """Slots de `program` (une version de ce document ou un arbre dérivé) :
+        les sous-arbres partagés entre versions gardent les mêmes slots."""
+        with self.lock:
+            return resolve(program, self.resolver)
+
+    def update(self, text):
+        segments = self.segments
+        starts = [segment.start for segment in segments]
+        if self.text is None:
+            first, stop, delta = 0, len(text), 0
+        else:
+            prefix, suffix = common_affixes(self.text, text)
+            # segment touché et le précédent : son dernier token peut toucher la
+            # modification, et son début (IDENTIFIER '=') en dépend parfois
+            first = max(bisect_right(starts, prefix) - 2, 0)
+            stop, delta = len(text) - suffix, len(text) - len(self.text)
+
+        # relexer à partir du premier segment touché, jusqu'à retomber (après
+        # la modification) sur le début décalé d'un ancien segment
+        region_start = starts[first] if segments else 0
+        new_starts, kept = [region_start], []
+        for start in boundaries(text, region_start):
+            if start == region_start:
+                continue
+            if start >= stop:
+                j = bisect_left(starts, start - delta, first + 1)
+                if j < len(starts) and starts[j] == start - delta:
+                    kept = segments[j:]
+                    break
+            new_starts.append(start)
+
+        # nouveaux segments : si le décalage échoue, le document reste intact
+        kept = [Segment(segment.start + delta, moved(segment.statements, delta),
+                        segment.errors, segment.syntax_error) for segment in kept]
+        ends = new_starts[1:] + [kept[0].start if kept else len(text)]
+        fresh = [Segment.parse(text, start, end) for start, end in zip(new_starts, ends)]
+        self.segments = segments[:first] + fresh + kept
+        self.reparsed = len(fresh)
+        self.result = self.assemble(text)
+
+    def assemble(self, text):
+        if any(s.syntax_error is not None or s.errors for s in self.segments):
+            try:
+                return parse_source(text)
+            except SyntaxError as e:
+                return e
+        statements = []
+        for segment in self.segments:
+            statements.extend(segment.statements)
+        return Program(statements), []
+
+
+class DocumentStore(LRUCache):
+    """Documents en cours d'édition, par identifiant client (LRU).
+
+    Chaque processus (worker) a le sien : un document est reparsé de façon
+    incrémentale par rapport à la dernière version que ce processus a vue.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=16 * 1024 * 1024):
+        super().__init__(max_entries, max_bytes)
+
+    def open(self, document_id):
+        """Document `document_id`, créé vide s'il est inconnu (ou évincé)."""
+        return self.lookup(document_id) or Document()
+
+    def save(self, document_id, document):
+        """(Re)range le document après une mise à jour : sa taille a changé."""
+        self.put(document_id, document)
+
+
+# Documents du processus courant (voir worker_pool.execute)
+documents = DocumentStore()
@@ -2,72 +2,145 @@
 
 from parser import (
     Program, Assign, Print, If, While, For,
-    BinOp, UnaryOp, Var, Number, Boolean, String, Null
+    BinOp, UnaryOp, Var, Number, Boolean, String, Null, Let, locate
 )
+from resolver import resolve
+from budget import (
+    step_limit_error, output_limit_error, value_size_error, output_size, checked_operators
+)
+from sinks import EchoSink
 
 # -------------------------
 # Environment (variable storage)
 # -------------------------
-class Environment:
-    def __init__(self):
-        self.vars = {}
+UNSET = object()  # marqueur de variable jamais assignée
 
-    def get(self, name):
-        if name not in self.vars:
-            raise NameError(f"Variable '{name}' not defined")
-        return self.vars[name]
-
-    def set(self, name, value):
-        self.vars[name] = value
+class Environment:
+    """Variables rangées dans une liste indexée par slot (voir resolver.py)."""
+
+    def __init__(self, names=(), initial=None):
+        self.names = list(names)
+        self.values = [UNSET] * len(self.names)
+        if initial:
+            slots = {name: slot for slot, name in enumerate(self.names)}
+            for name, value in initial.items():
+                slot = slots.get(name)
+                if slot is None:
+                    # absente du programme : conservée (slots après ceux du programme)
+                    self.names.append(name)
+                    self.values.append(value)
+                else:
+                    self.values[slot] = value
+
+    def get(self, slot):
+        value = self.values[slot]
+        if value is UNSET:
+            raise NameError(f"Variable '{self.names[slot]}' not defined")
+        return value
+
+    def set(self, slot, value):
+        self.values[slot] = value
+
+    def as_dict(self):
+        """Variables assignées, par nom."""
+        return {name: value for name, value in zip(self.names, self.values) if value is not UNSET}
 
 
 # -------------------------
 # Interpreter
 # -------------------------
 class Interpreter:
-    def __init__(self):
+    def __init__(self, max_steps=None, max_output=None, max_value_size=None, sink=None):
         self.env = Environment()
+        self.values = self.env.values  # raccourci vers les slots (chemin critique)
         self.output = []  # on stocke les résultats des print()
+        # sink (sinks.py) : destination des print ; None = EchoSink à chaque
+        # exécution (valeurs conservées et affichées sur la console)
+        self.sink = sink
+        self.emit = self.output.append
+        # Limites par exécution (budget.py) ; None = illimité
+        self.max_steps = max_steps
+        self.max_output = max_output
+        self.max_value_size = max_value_size
+        self.checked = checked_operators(max_value_size)  # + et * contrôlés, ou None
+        self.steps_left = self.output_left = float("inf")
 
     def run(self, program: Program):
         """Exécute un programme et retourne une liste des sorties (print)."""
-        self.output = []
-        for stmt in program.statements:
-            self.exec_stmt(stmt)
+        # Les variables d'une exécution précédente restent visibles (par nom)
+        self.env = Environment(resolve(program), self.env.as_dict())
+        self.values = self.env.values
+        sink = EchoSink() if self.sink is None else self.sink
+        self.output = sink.values
+        self.emit = sink.write
+        # compteurs décrémentés à chaque pas : inf quand il n'y a pas de limite
+        self.steps_left = float("inf") if self.max_steps is None else self.max_steps
+        self.output_left = float("inf") if self.max_output is None else self.max_output
+        try:
+            for stmt in program.statements:
+                self.exec_stmt(stmt)
+        finally:
+            sink.flush()
         return self.output
 
     def exec_stmt(self, stmt):
-        if isinstance(stmt, Assign):
-            value = self.eval_expr(stmt.expr)
-            self.env.set(stmt.name, value)
-
-        elif isinstance(stmt, Print):
-            value = self.eval_expr(stmt.expr)
-            self.output.append(value)  # stocker la sortie
-            print(value)               # conserver l’affichage console
-
-        elif isinstance(stmt, If):
-            cond = self.eval_expr(stmt.condition)
-            if cond:
-                for s in stmt.then_branch:
-                    self.exec_stmt(s)
-            elif stmt.else_branch:
-                for s in stmt.else_branch:
-                    self.exec_stmt(s)
-
-        elif isinstance(stmt, While):
-            while self.eval_expr(stmt.condition):
-                for s in stmt.body:
-                    self.exec_stmt(s)
-
-        elif isinstance(stmt, For):
-            for i in range(stmt.count):
-                self.env.set(stmt.var, i)
-                for s in stmt.body:
-                    self.exec_stmt(s)
-
-        else:
-            raise RuntimeError(f"Unknown statement: {stmt}")
+        try:
+            self.steps_left -= 1
+            if self.steps_left < 0:
+                raise step_limit_error(self.max_steps)
+
+            if isinstance(stmt, Assign):
+                self.values[stmt._slot] = self.eval_expr(stmt.expr)
+
+            elif isinstance(stmt, Print):
+                value = self.eval_expr(stmt.expr)
+                if self.max_output is not None:
+                    self.output_left -= output_size(value)
+                    if self.output_left < 0:
+                        raise output_limit_error(self.max_output)
+                self.emit(value)           # stocker, afficher ou transmettre la sortie
+
+            elif isinstance(stmt, If):
+                # chaîne elseif (If seul dans else_branch) parcourue en boucle,
+                # sans un appel récursif par branche
+                while not self.eval_expr(stmt.condition):
+                    else_branch = stmt.else_branch
+                    if else_branch and len(else_branch) == 1 and isinstance(else_branch[0], If):
+                        stmt = else_branch[0]
+                        self.steps_left -= 1  # comme l'exécution d'une instruction
+                        if self.steps_left < 0:
+                            raise step_limit_error(self.max_steps)
+                        continue
+                    if else_branch:
+                        for s in else_branch:
+                            self.exec_stmt(s)
+                    break
+                else:
+                    for s in stmt.then_branch:
+                        self.exec_stmt(s)
+
+            elif isinstance(stmt, While):
+                while self.eval_expr(stmt.condition):
+                    self.steps_left -= 1  # un tour de boucle = un pas
+                    if self.steps_left < 0:
+                        raise step_limit_error(self.max_steps)
+                    for s in stmt.body:
+                        self.exec_stmt(s)
+
+            elif isinstance(stmt, For):
+                values, slot = self.values, stmt._slot
+                for i in range(stmt.count):
+                    self.steps_left -= 1  # un tour de boucle = un pas
+                    if self.steps_left < 0:
+                        raise step_limit_error(self.max_steps)
+                    values[slot] = i
+                    for s in stmt.body:
+                        self.exec_stmt(s)
+
+            else:
+                raise RuntimeError(f"Unknown statement: {stmt}")
+        except Exception as e:
+            raise locate(e, stmt._pos)  # instruction la plus interne
 
     # -------------------------
     # Expression evaluation
@@ -82,34 +155,78 @@ class Interpreter:
         elif isinstance(expr, Null):
             return None
         elif isinstance(expr, Var):
-            return self.env.get(expr.name)
+            value = self.values[expr._slot]
+            if value is UNSET:
+                raise NameError(f"Variable '{expr.name}' not defined")
+            return value
 
         elif isinstance(expr, BinOp):
+            if isinstance(expr.left, BinOp) and isinstance(expr.left.left, BinOp):
+                return self.eval_chain(expr)
             left = self.eval_expr(expr.left)
             right = self.eval_expr(expr.right)
-            if expr.op == '+': return left + right
-            if expr.op == '-': return left - right
-            if expr.op == '*': return left * right
-            if expr.op == '/':
-                if right == 0:
-                    raise RuntimeError("Division by zero")
-                return left / right
-            if expr.op == '==': return left == right
-            if expr.op == '!=': return left != right
-            if expr.op == '<': return left < right
-            if expr.op == '<=': return left <= right
-            if expr.op == '>': return left > right
-            if expr.op == '>=': return left >= right
-            raise RuntimeError(f"Unknown binary operator {expr.op}")
+            return self.binary(expr.op, left, right)
 
         elif isinstance(expr, UnaryOp):
             val = self.eval_expr(expr.operand)
             if expr.op == '-': return -val
             raise RuntimeError(f"Unknown unary operator {expr.op}")
 
+        elif isinstance(expr, Let):
+            # sous-expression commune (cse.py) : calculée une fois, puis relue via Var
+            value = self.values[expr._slot] = self.eval_expr(expr.expr)
+            return value
+
         else:
             raise RuntimeError(f"Unknown expression: {expr}")
 
+    def eval_chain(self, expr):
+        """Chaîne d'opérateurs associatifs à gauche (a + b - c ...) : la branche
+        gauche est parcourue en boucle, seuls les opérandes droits sont évalués
+        récursivement (pas de RecursionError sur une longue chaîne).
+
+        Les concaténations successives de chaînes sont regroupées en un seul
+        join (linéaire au lieu de recopier le résultat à chaque +).
+        """
+        spine = []
+        while isinstance(expr, BinOp):
+            spine.append(expr)
+            expr = expr.left
+        value = self.eval_expr(expr)
+        parts = None  # morceaux de la concaténation en cours (valeur = leur join)
+        for node in reversed(spine):
+            right = self.eval_expr(node.right)
+            if node.op == '+' and right.__class__ is str and (parts is not None or value.__class__ is str):
+                if parts is None:
+                    parts, length = [value], len(value)
+                parts.append(right)
+                length += len(right)
+                if self.max_value_size is not None and length > self.max_value_size:
+                    raise value_size_error(self.max_value_size)
+                continue
+            if parts is not None:
+                value, parts = "".join(parts), None
+            value = self.binary(node.op, value, right)
+        return value if parts is None else "".join(parts)
+
+    def binary(self, op, left, right):
+        if self.checked is not None and op in self.checked:
+            return self.checked[op](left, right)
+        if op == '+': return left + right
+        if op == '-': return left - right
+        if op == '*': return left * right
+        if op == '/':
+            if right == 0:
+                raise RuntimeError("Division by zero")
+            return left / right
+        if op == '==': return left == right
+        if op == '!=': return left != right
+        if op == '<': return left < right
+        if op == '<=': return left <= right
+        if op == '>': return left > right
+        if op == '>=': return left >= right
+        raise RuntimeError(f"Unknown binary operator {op}")
+
 
 # -------------------------
 # Manual test (only if run directly)
@@ -1,3 +1,8 @@
+import hashlib
+import os
+from array import array
+from bisect import bisect_right
+
 from ply import lex
 
 # --- Reserved keywords ---
@@ -83,26 +88,104 @@ def t_newline(t):
     t.lexer.lineno += len(t.value)
 
 # --- Error collection ---
+# Chaque lexer écrit dans sa propre liste `errors` ; celle du lexer global
+# est `lexer_errors` (compatibilité avec le code existant).
 lexer_errors = []
 
 def t_error(t):
-    last_newline = t.lexer.lexdata.rfind('\n', 0, t.lexpos)
-    if last_newline < 0:
-        last_newline = -1
-    col = t.lexpos - last_newline
-    msg = f"Illegal character '{t.value[0]}' at line {t.lineno}, col {col}"
-    lexer_errors.append(msg)
+    line, col = line_index(t.lexer.lexdata, t.lexer).location(t.lexpos)
+    msg = f"Illegal character '{t.value[0]}' at line {line}, col {col}"
+    t.lexer.errors.append(msg)
     t.lexer.skip(1)
 
+# --- Prebuilt tables ---
+# Les tables du lexer (lextab.py) et du parser (parsetab.py) sont générées par
+# build_tables.py et livrées avec le code : à l'import, PLY les lit en mode
+# optimisé au lieu de relire et valider toutes les règles. Des tables absentes
+# ou périmées lèvent StaleTables (jamais de régénération au démarrage).
+TABLES_DIR = os.path.dirname(os.path.abspath(__file__))
+BUILDING_TABLES = os.environ.get("PISC_BUILD_TABLES") == "1"  # positionné par build_tables.py
+
+class StaleTables(RuntimeError):
+    """Tables PLY absentes ou générées pour d'autres règles que celles du code."""
+
+def rules_signature():
+    """Empreinte des règles du lexer : change dès qu'un token ou une regex change."""
+    rules = sorted((name, value if isinstance(value, str) else value.__doc__)
+                   for name, value in globals().items() if name.startswith("t_"))
+    return hashlib.sha256(repr((tokens, literals, rules)).encode()).hexdigest()
+
+def build_lexer():
+    signature = rules_signature()
+    if BUILDING_TABLES:
+        built = lex.lex()  # règles relues et validées
+        built.writetab("lextab", TABLES_DIR)
+        with open(os.path.join(TABLES_DIR, "lextab.py"), "a", encoding="utf-8") as f:
+            f.write(f"_signature     = {signature!r}\n")
+        return built
+    try:
+        import lextab
+    except ImportError:
+        lextab = None
+    if getattr(lextab, "_signature", None) != signature:
+        raise StaleTables("lextab.py is missing or out of date: run `python build_tables.py`")
+    return lex.lex(optimize=True, lextab="lextab")
+
 # --- Build the lexer ---
-lexer = lex.lex()
+lexer = build_lexer()
+lexer.errors = lexer_errors
+
+# --- Reentrant lexers ---
+def new_lexer():
+    """Lexer indépendant du lexer global : ses erreurs et son numéro de ligne
+    lui sont propres, il peut donc être utilisé en parallèle dans un thread."""
+    clone = lexer.clone()
+    clone.errors = []
+    clone.lineno = 1
+    clone.interner = None
+    clone.line_index = None
+    return clone
+
+# --- Line / column ---
+# Les débuts de ligne d'un texte sont calculés une fois ; chaque position est
+# ensuite convertie par dichotomie (au lieu d'un rfind par position).
+class LineIndex:
+    """Position dans un texte -> (ligne, colonne), numérotées à partir de 1."""
+
+    def __init__(self, source):
+        self.source = source
+        starts = array('L', [0])
+        find = source.find
+        pos = find('\n')
+        while pos >= 0:
+            starts.append(pos + 1)
+            pos = find('\n', pos + 1)
+        self.starts = starts
+
+    def line(self, pos):
+        return bisect_right(self.starts, pos)
+
+    def location(self, pos):
+        line = bisect_right(self.starts, pos)
+        return line, pos - self.starts[line - 1] + 1
+
+def line_index(source, owner=None):
+    """LineIndex de `source`.
+
+    `owner` : objet qui lit ce source (lexer PLY, scanner.TokenBuffer) ; l'index
+    lui est attaché et réutilisé tant qu'il lit le même texte. Sans `owner`,
+    l'index est construit pour un seul usage.
+    """
+    if owner is None:
+        return LineIndex(source)
+    index = getattr(owner, "line_index", None)
+    if index is None or index.source is not source:
+        index = owner.line_index = LineIndex(source)
+    return index
 
 # --- Helper to compute column ---
 def find_column(input_text, token):
-    last_newline = input_text.rfind('\n', 0, token.lexpos)
-    if last_newline < 0:
-        last_newline = -1
-    return token.lexpos - last_newline
+    return line_index(input_text, getattr(token, "lexer", None)).location(token.lexpos)[1]
 
 # --- Manual run for debug ---
 if __name__ == "__main__":
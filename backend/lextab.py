@@ -0,0 +1,11 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('BLOCK_END', 'BLOCK_START', 'BOOLEAN', 'COMMENT', 'DIVIDE', 'ELSE', 'ELSEIF', 'EQ', 'EQUALS', 'FOR', 'GEQ', 'GT', 'IDENTIFIER', 'IF', 'IN', 'LEQ', 'LPAREN', 'LT', 'MINUS', 'NEQ', 'NULL', 'NUMBER', 'PLUS', 'PRINT', 'RANGE', 'RPAREN', 'SEMICOLON', 'STRING', 'TIMES', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = '+-*/=(){}.;,:#?!'
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_IDENTIFIER>[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_newline>\\n+)|(?P<t_STRING>"([^"\\\\]*(\\\\.[^"\\\\]*)*)")|(?P<t_NUMBER>\\d+(\\.\\d+)?)|(?P<t_COMMENT>\\#.*)|(?P<t_PLUS>\\+)|(?P<t_TIMES>\\*)|(?P<t_EQ>==)|(?P<t_NEQ>!=)|(?P<t_LEQ><=)|(?P<t_GEQ>>=)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_BLOCK_START>\\{)|(?P<t_BLOCK_END>\\})|(?P<t_MINUS>-)|(?P<t_DIVIDE>/)|(?P<t_EQUALS>=)|(?P<t_LT><)|(?P<t_GT>>)|(?P<t_SEMICOLON>;)', [None, ('t_IDENTIFIER', 'IDENTIFIER'), ('t_newline', 'newline'), (None, 'STRING'), None, None, (None, 'NUMBER'), None, (None, 'COMMENT'), (None, 'PLUS'), (None, 'TIMES'), (None, 'EQ'), (None, 'NEQ'), (None, 'LEQ'), (None, 'GEQ'), (None, 'LPAREN'), (None, 'RPAREN'), (None, 'BLOCK_START'), (None, 'BLOCK_END'), (None, 'MINUS'), (None, 'DIVIDE'), (None, 'EQUALS'), (None, 'LT'), (None, 'GT'), (None, 'SEMICOLON')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_signature     = 'fe22ed095a56a135100c00b0ea30381931afdb3d67fd646ce214bce2d5937cdb'
@@ -1,19 +1,25 @@
 # main.py 
 
 from flask import Flask, request, jsonify
-from lexer import lexer
-from parser import parser
+from parser import parse_source
+from lexer import line_index
 from ast_visualizer import generate_ast_graph
-from interpreter import Interpreter
+from engines import get_engine, DEFAULT_ENGINE
+from optimizer import optimize as optimize_ast
+from cse import eliminate_common_subexpressions
+from cache import ast_cache
+from sinks import BufferedWriterSink, CaptureSink
 import os
 
-def run_file(filename: str):
+def run_file(filename: str, engine: str = DEFAULT_ENGINE, optimize: bool = True, cse: bool = False):
     # Lire le code source
     with open(filename, "r", encoding="utf-8") as f:
         code = f.read()
 
     # Parser en AST
-    ast = parser.parse(code, lexer=lexer)
+    ast, errors = parse_source(code)
+    for error in errors:
+        print(error)
 
     # Afficher l'AST en texte
     print("=== AST ===")
@@ -28,8 +34,12 @@ def run_file(filename: str):
 
     # Exécuter le code
     print("\n=== Execution ===")
-    interpreter = Interpreter()
-    interpreter.run(ast)
+    program = optimize_ast(ast) if optimize else ast
+    if cse:
+        program = eliminate_common_subexpressions(program)
+    # sortie console par blocs plutôt qu'un print par valeur
+    interpreter = get_engine(engine, sink=BufferedWriterSink())
+    interpreter.run(program)
 
 
 # --- Flask API ---
@@ -43,18 +53,25 @@ def home():
 def run_code():
     code = request.data.decode("utf-8")  # Récupère le code envoyé
     try:
-        ast = parser.parse(code, lexer=lexer)
+        optimize = request.args.get("optimize", "true").lower() != "false"
+        # un source déjà soumis ne repasse pas par le lexer / parser
+        ast, program, errors = ast_cache.get(code, optimize)
+        if errors:
+            return jsonify({"status": "error", "message": "\n".join(errors)}), 400
         print(ast)  # Affiche l’AST dans les logs du conteneur
 
         # Génère un graphe AST (fichier PNG dans le volume backend)
         generate_ast_graph(ast, filename="ast_output", view=False)
 
-        interpreter = Interpreter()
-        output = interpreter.run(ast)
+        interpreter = get_engine(request.args.get("engine", DEFAULT_ENGINE), sink=CaptureSink())
+        output = interpreter.run(program)
 
         return jsonify({"status": "ok", "ast": str(ast), "output": str(output)})
     except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 400
+        message = str(e)
+        if getattr(e, "pisc_pos", None) is not None:
+            message += " (line {}, col {})".format(*line_index(code).location(e.pisc_pos))
+        return jsonify({"status": "error", "message": message}), 400
 
 
 if __name__ == "__main__":
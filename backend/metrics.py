@@ -0,0 +1,193 @@
+# metrics.py
+
+import threading
+from bisect import bisect_left
+
+from budget import BudgetExceeded
+
+# -------------------------
+# Métriques Prometheus (format texte)
+# -------------------------
+# Compteurs et histogrammes tenus en mémoire dans le processus API et publiés
+# par GET /metrics au format texte de Prometheus (version 0.0.4), sans
+# dépendance : une observation coûte une recherche dans les bornes et deux
+# additions sous verrou. Les quantiles (p50, p99, ...) se calculent côté
+# Prometheus à partir des buckets :
+#   histogram_quantile(0.99, sum by (le, phase) (rate(pisc_phase_seconds_bucket[5m])))
+#
+# Les durées de lexing, parsing, optimisation et exécution sont mesurées dans
+# le worker (worker_pool.execute, clé "timings" du résultat) ; la
+# sérialisation de la réponse dans le processus API.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# secondes : de 50 µs (petit programme déjà lexé) à 10 s (limite de temps)
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def label_text(names, values):
+    return ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Compteur croissant, une série par combinaison de labels."""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values = {}  # tuple de valeurs des labels -> total
+        self.lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def set(self, value, *labels):
+        """Valeur relevée à la collecte (statistiques tenues ailleurs)."""
+        with self.lock:
+            self.values[labels] = value
+
+    def value(self, *labels):
+        return self.values.get(labels, 0)
+
+    def samples(self):
+        with self.lock:
+            values = sorted(self.values.items())
+        for labels, total in values:
+            yield self.name, label_text(self.labels, labels), total
+
+
+class Histogram:
+    """Histogramme à buckets fixes (bornes supérieures, en secondes)."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.series = {}  # tuple de valeurs des labels -> [comptes par bucket, somme, nombre]
+        self.lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        i = bisect_left(self.buckets, value)  # bucket `le` : value <= borne
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels):
+        series = self.series.get(labels)
+        return series[2] if series is not None else 0
+
+    def samples(self):
+        with self.lock:
+            series = sorted((labels, (list(counts), total, n))
+                            for labels, (counts, total, n) in self.series.items())
+        for labels, (counts, total, n) in series:
+            prefix = label_text(self.labels, labels)
+            prefix = prefix + "," if prefix else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", f'{prefix}le="{number(bound)}"', cumulative
+            yield f"{self.name}_sum", prefix.rstrip(","), total
+            yield f"{self.name}_count", prefix.rstrip(","), n
+
+
+class Gauge(Counter):
+    """Valeur instantanée (peut diminuer)."""
+
+    kind = "gauge"
+
+
+def exposition(metrics):
+    """Texte publié par /metrics pour une liste de métriques."""
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{{{labels}}} {number(value)}" if labels else f"{name} {number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------
+# Métriques de l'API
+# -------------------------
+PHASE_SECONDS = Histogram(
+    "pisc_phase_seconds", "Duration of each processing phase of a request",
+    ("endpoint", "phase"))
+REQUEST_SECONDS = Histogram(
+    "pisc_request_seconds", "Duration of a request in its route handler", ("endpoint",))
+ERRORS = Counter(
+    "pisc_errors_total", "Requests answered with an error, by kind", ("endpoint", "kind"))
+RECEIVED_BYTES = Counter(
+    "pisc_received_bytes_total", "Program source bytes received", ("endpoint",))
+SENT_BYTES = Counter(
+    "pisc_sent_bytes_total", "Response body bytes sent", ("endpoint",))
+
+# collectés à chaque lecture de /metrics (statistiques existantes des caches) :
+# caches de l'API ("sources", "results") et caches d'AST des workers ("ast")
+CACHE_HITS = Counter("pisc_cache_hits_total", "Cache hits", ("cache",))
+CACHE_MISSES = Counter("pisc_cache_misses_total", "Cache misses", ("cache",))
+CACHE_EVICTIONS = Counter("pisc_cache_evictions_total", "Cache evictions", ("cache",))
+CACHE_ENTRIES = Gauge("pisc_cache_entries", "Entries held by a cache", ("cache",))
+CACHE_BYTES = Gauge("pisc_cache_bytes", "Estimated bytes held by a cache", ("cache",))
+
+
+def error_kind(result):
+    """Catégorie d'erreur d'un résultat de worker_pool.execute, ou None."""
+    if "syntax_error" in result:
+        return "syntax"
+    if "errors" in result:
+        return "lexical"
+    error = result.get("exception")
+    if error is None:
+        return None
+    if isinstance(error, BudgetExceeded):
+        return "limit"
+    return "runtime"
+
+
+def observe_result(endpoint, result):
+    """Durées des phases (mesurées dans le worker) et erreur d'un résultat de
+    worker_pool.execute. Un résultat servi par le cache de l'API (sans
+    "timings") ne compte que son erreur éventuelle."""
+    for phase, seconds in result.get("timings", {}).items():
+        PHASE_SECONDS.observe(seconds, endpoint, phase)
+    kind = error_kind(result)
+    if kind is not None:
+        ERRORS.inc(endpoint, kind)
+
+
+def observe_caches(caches):
+    """Relève les statistiques des caches : {nom: LRUCache.stats()}."""
+    for name, stats in caches.items():
+        CACHE_HITS.set(stats["hits"], name)
+        CACHE_MISSES.set(stats["misses"], name)
+        CACHE_EVICTIONS.set(stats["evictions"], name)
+        CACHE_ENTRIES.set(stats["entries"], name)
+        CACHE_BYTES.set(stats["bytes"], name)
+
+
+API_METRICS = [REQUEST_SECONDS, PHASE_SECONDS, ERRORS, RECEIVED_BYTES, SENT_BYTES,
+               CACHE_HITS, CACHE_MISSES, CACHE_EVICTIONS, CACHE_ENTRIES, CACHE_BYTES]
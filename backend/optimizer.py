@@ -0,0 +1,226 @@
+# optimizer.py
+
+import operator
+
+from budget import checked_operators
+from parser import (
+    Program, Assign, Print, If, While, For,
+    BinOp, UnaryOp, Var, Number, Boolean, String, Null
+)
+
+# -------------------------
+# Optimiseur d'AST
+# -------------------------
+# Passe optionnelle entre parser.parse et Interpreter.run :
+#   - calcule à l'avance les BinOp / UnaryOp dont les opérandes sont littéraux ;
+#   - supprime les branches de If jamais prises et les boucles jamais exécutées.
+# Une opération qui échouerait (division par zéro, types incompatibles, valeur
+# au-delà de max_value_size) n'est pas calculée : l'erreur reste levée à
+# l'exécution, au même endroit.
+# L'AST d'origine n'est jamais modifié : seuls les nœuds qui changent sont
+# reconstruits, les autres sont partagés avec lui.
+
+BINARY_FUNCTIONS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul,
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+# Taille maximale d'une chaîne produite à la compilation (évite "x" * 10**9)
+MAX_FOLDED_STRING = 4096
+
+_LITERALS = (Number, Boolean, String, Null)
+
+
+def is_literal(expr):
+    return isinstance(expr, _LITERALS)
+
+
+def literal_value(expr):
+    return None if isinstance(expr, Null) else expr.value
+
+
+def make_literal(value):
+    if value is None:
+        return Null()
+    if isinstance(value, bool):
+        return Boolean(value)
+    if isinstance(value, str):
+        return String(value)
+    return Number(value)
+
+
+def _divide(left, right):
+    if right == 0:
+        raise RuntimeError("Division by zero")
+    return left / right
+
+
+def _same(statements, original):
+    """Vrai si `statements` sont exactement les instructions `original` (ou None)."""
+    original = original or []
+    return len(statements) == len(original) and all(a is b for a, b in zip(statements, original))
+
+
+def _fold_size_ok(op, left, right):
+    if op == '*':
+        for text, count in ((left, right), (right, left)):
+            if isinstance(text, str) and isinstance(count, int) \
+                    and len(text) * count > MAX_FOLDED_STRING:
+                return False
+    if op == '+' and isinstance(left, str) and isinstance(right, str):
+        return len(left) + len(right) <= MAX_FOLDED_STRING
+    return True
+
+
+class Optimizer:
+    def __init__(self, max_value_size=None):
+        self.folded = 0          # nombre d'expressions calculées
+        self.removed = 0         # nombre d'instructions supprimées
+        self.memo = {}           # id(expression d'origine) -> expression optimisée
+        # + et * contrôlés comme dans les moteurs (budget.py)
+        self.checked = checked_operators(max_value_size) or {}
+
+    def optimize(self, program: Program) -> Program:
+        optimized = Program(self.optimize_block(program.statements))
+        optimized._origin = program  # sous-arbres partagés : voir resolver.resolve
+        return optimized
+
+    # --- statements ---
+    def optimize_block(self, statements):
+        result = []
+        for stmt in statements:
+            result.extend(self.optimize_stmt(stmt))
+        return result
+
+    def optimize_stmt(self, stmt):
+        """Retourne la liste des instructions qui remplacent `stmt`."""
+        if isinstance(stmt, Assign):
+            expr = self.optimize_expr(stmt.expr)
+            return [stmt if expr is stmt.expr else Assign(stmt.name, expr, stmt._pos)]
+
+        elif isinstance(stmt, Print):
+            expr = self.optimize_expr(stmt.expr)
+            return [stmt if expr is stmt.expr else Print(expr, stmt._pos)]
+
+        elif isinstance(stmt, If):
+            return self.optimize_if(stmt)
+
+        elif isinstance(stmt, While):
+            condition = self.optimize_expr(stmt.condition)
+            if is_literal(condition) and not literal_value(condition):
+                self.removed += 1
+                return []
+            body = self.optimize_block(stmt.body)
+            if condition is stmt.condition and _same(body, stmt.body):
+                return [stmt]
+            return [While(condition, body, stmt._pos)]
+
+        elif isinstance(stmt, For):
+            if stmt.count <= 0:
+                self.removed += 1
+                return []
+            body = self.optimize_block(stmt.body)
+            return [stmt if _same(body, stmt.body) else For(stmt.var, stmt.count, body, stmt._pos)]
+
+        else:
+            raise RuntimeError(f"Unknown statement: {stmt}")
+
+    def optimize_if(self, stmt):
+        # chaîne elseif parcourue en boucle (comme resolver.py), puis
+        # reconstruite depuis la fin
+        kept = []  # (If d'origine, condition, branche then) des tests conservés
+        while True:
+            condition = self.optimize_expr(stmt.condition)
+            else_branch = stmt.else_branch
+            elseif = else_branch and len(else_branch) == 1 and isinstance(else_branch[0], If)
+            if is_literal(condition):
+                # Pas de portée de bloc : la branche prise remplace le If
+                self.removed += 1
+                if literal_value(condition):
+                    rest = self.optimize_block(stmt.then_branch)
+                    break
+            else:
+                kept.append((stmt, condition, self.optimize_block(stmt.then_branch)))
+            if elseif:
+                stmt = else_branch[0]
+                continue
+            rest = self.optimize_block(else_branch) if else_branch else []
+            break
+        for stmt, condition, then_branch in reversed(kept):
+            if condition is stmt.condition and _same(then_branch, stmt.then_branch) \
+                    and _same(rest, stmt.else_branch):
+                rest = [stmt]
+            else:
+                rest = [If(condition, then_branch, rest or None, stmt._pos)]
+        return rest
+
+    # --- expressions ---
+    # Une expression inchangée est retournée telle quelle : l'arbre optimisé
+    # partage ses sous-arbres avec l'AST d'origine (hash-consing conservé) ;
+    # `memo` garde ce partage pour les sous-arbres reconstruits.
+    def optimize_expr(self, expr):
+        optimized = self.memo.get(id(expr))
+        if optimized is None:
+            optimized = self.memo[id(expr)] = self._optimize_expr(expr)
+        return optimized
+
+    def _optimize_expr(self, expr):
+        if isinstance(expr, (Var, Null, Number, Boolean, String)):
+            return expr
+
+        elif isinstance(expr, BinOp):
+            # branche gauche en boucle : longues chaînes a + b + c ... sans récursion
+            spine = []
+            while isinstance(expr, BinOp) and id(expr) not in self.memo:
+                spine.append(expr)
+                expr = expr.left
+            left = self.optimize_expr(expr)
+            for expr in reversed(spine):
+                right = self.optimize_expr(expr.right)
+                left = self.memo[id(expr)] = self.optimize_binop(expr, left, right)
+            return left
+
+        elif isinstance(expr, UnaryOp):
+            operand = self.optimize_expr(expr.operand)
+            if expr.op == '-' and is_literal(operand):
+                try:
+                    value = -literal_value(operand)
+                except Exception:
+                    pass  # ex: -"abc" : l'erreur sera levée à l'exécution
+                else:
+                    self.folded += 1
+                    return make_literal(value)
+            return expr if operand is expr.operand else UnaryOp(expr.op, operand)
+
+        else:
+            raise RuntimeError(f"Unknown expression: {expr}")
+
+    def optimize_binop(self, expr, left, right):
+        if is_literal(left) and is_literal(right):
+            folded = self.fold_binop(expr.op, literal_value(left), literal_value(right))
+            if folded is not None:
+                return folded
+        if left is expr.left and right is expr.right:
+            return expr
+        return BinOp(left, expr.op, right)
+
+    def fold_binop(self, op, left, right):
+        function = _divide if op == '/' else self.checked.get(op) or BINARY_FUNCTIONS.get(op)
+        if function is None or not _fold_size_ok(op, left, right):
+            return None
+        try:
+            value = function(left, right)
+        except Exception:
+            return None  # erreur conservée pour l'exécution
+        self.folded += 1
+        return make_literal(value)
+
+
+def optimize(program: Program, max_value_size=None) -> Program:
+    """Retourne une version optimisée du programme (l'AST d'origine n'est pas modifié).
+
+    `max_value_size` : limite de l'exécution (budget.py) ; une valeur plus
+    grosse n'est pas calculée d'avance.
+    """
+    return Optimizer(max_value_size).optimize(program)
@@ -1,96 +1,387 @@
 # parser.py
+import copy
+import os
+import re
+import threading
+import time
 import ply.yacc as yacc
 import ast as _ast
-from lexer import tokens  # tokens must be defined in lexer.py
+from lexer import tokens, new_lexer  # tokens must be defined in lexer.py
+from lexer import TABLES_DIR, BUILDING_TABLES, StaleTables, line_index
 
 # -------------------------
 # AST node classes
 # -------------------------
+# Nœuds compacts : __slots__ au lieu d'un __dict__ par instance.
+# Les champs préfixés par "_" sont des annotations internes (ex: _slot posé
+# par resolver.py) : ils ne font pas partie de l'arbre sérialisé.
+# `_pos` d'une instruction : position de son premier token dans le source
+# (localisation des erreurs d'exécution), None pour un nœud construit à la main.
+# `_origin` d'un programme dérivé (optimizer.py) : le programme dont il partage
+# les sous-arbres, numéroté avant lui par resolver.py (mêmes slots).
 class Program:
+    __slots__ = ('statements', '_names', '_origin')
     def __init__(self, statements):
         self.statements = statements
     def __repr__(self):
-        return f"Program({self.statements})"
+        return ast_repr(self)
 
 class Assign:
-    def __init__(self, name, expr):
+    __slots__ = ('name', 'expr', '_slot', '_pos')
+    def __init__(self, name, expr, pos=None):
         self.name = name
         self.expr = expr
+        self._pos = pos
     def __repr__(self):
-        return f"Assign({self.name}, {self.expr})"
+        return ast_repr(self)
 
 class Print:
-    def __init__(self, expr):
+    __slots__ = ('expr', '_pos')
+    def __init__(self, expr, pos=None):
         self.expr = expr
+        self._pos = pos
     def __repr__(self):
-        return f"Print({self.expr})"
+        return ast_repr(self)
 
 class If:
-    def __init__(self, condition, then_branch, else_branch=None):
+    __slots__ = ('condition', 'then_branch', 'else_branch', '_pos', '_depth')
+    def __init__(self, condition, then_branch, else_branch=None, pos=None):
         self.condition = condition
         self.then_branch = then_branch  # list of statements
         self.else_branch = else_branch  # list of statements or nested If
+        self._pos = pos
     def __repr__(self):
-        return f"If({self.condition}, {self.then_branch}, {self.else_branch})"
+        return ast_repr(self)
 
 class While:
-    def __init__(self, condition, body):
+    __slots__ = ('condition', 'body', '_pos', '_depth')
+    def __init__(self, condition, body, pos=None):
         self.condition = condition
         self.body = body
+        self._pos = pos
     def __repr__(self):
-        return f"While({self.condition}, {self.body})"
+        return ast_repr(self)
 
 class For:
-    def __init__(self, var, count, body):
+    __slots__ = ('var', 'count', 'body', '_slot', '_pos', '_depth')
+    def __init__(self, var, count, body, pos=None):
         self.var = var      # variable name
         self.count = count  # upper bound (int)
         self.body = body    # list of statements
+        self._pos = pos
     def __repr__(self):
-        return f"For({self.var}, range({self.count}), {self.body})"
+        return ast_repr(self)
 
 class BinOp:
+    __slots__ = ('left', 'op', 'right')
     def __init__(self, left, op, right):
         self.left = left
         self.op = op
         self.right = right
     def __repr__(self):
-        return f"BinOp({self.left}, {self.op}, {self.right})"
+        return ast_repr(self)
 
 class UnaryOp:
+    __slots__ = ('op', 'operand')
     def __init__(self, op, operand):
         self.op = op
         self.operand = operand
     def __repr__(self):
-        return f"UnaryOp({self.op}, {self.operand})"
+        return ast_repr(self)
 
 class Var:
+    __slots__ = ('name', '_slot')
     def __init__(self, name):
         self.name = name
     def __repr__(self):
         return f"Var({self.name})"
 
 class Number:
+    __slots__ = ('value',)
     def __init__(self, value):
         self.value = value
     def __repr__(self):
         return f"Number({self.value})"
 
 class Boolean:
+    __slots__ = ('value',)
     def __init__(self, value):
         self.value = value
     def __repr__(self):
         return f"Boolean({self.value})"
 
 class String:
+    __slots__ = ('value',)
     def __init__(self, value):
         self.value = value
     def __repr__(self):
         return f"String({self.value!r})"
 
 class Null:
+    __slots__ = ()
     def __repr__(self):
         return "Null()"
 
+# Nœud produit par cse.py (jamais par la grammaire) : évalue `expr`,
+# range la valeur dans la variable temporaire `name` et la retourne.
+class Let:
+    __slots__ = ('name', 'expr', '_slot')
+    def __init__(self, name, expr):
+        self.name = name
+        self.expr = expr
+    def __repr__(self):
+        return ast_repr(self)
+
+def _repr_parts(node):
+    """Morceaux du repr d'un nœud composé : textes et enfants (nœuds, listes)."""
+    if isinstance(node, list):
+        parts = ["["]
+        for i, child in enumerate(node):
+            parts.extend((", ", child) if i else (child,))
+        parts.append("]")
+        return parts
+    cls = node.__class__
+    if cls is BinOp:
+        return ["BinOp(", node.left, f", {node.op}, ", node.right, ")"]
+    if cls is Program:
+        return ["Program(", node.statements, ")"]
+    if cls is Assign:
+        return [f"Assign({node.name}, ", node.expr, ")"]
+    if cls is Print:
+        return ["Print(", node.expr, ")"]
+    if cls is If:
+        return ["If(", node.condition, ", ", node.then_branch, ", ", node.else_branch, ")"]
+    if cls is While:
+        return ["While(", node.condition, ", ", node.body, ")"]
+    if cls is For:
+        return [f"For({node.var}, range({node.count}), ", node.body, ")"]
+    if cls is UnaryOp:
+        return [f"UnaryOp({node.op}, ", node.operand, ")"]
+    if cls is Let:
+        return [f"Let({node.name}, ", node.expr, ")"]
+    return None  # feuille : son propre repr
+
+
+def ast_repr(node):
+    """Texte de l'arbre (repr des nœuds), construit sans récursion : longues
+    chaînes elseif ou d'opérateurs."""
+    out = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if item.__class__ is str:
+            out.append(item)
+            continue
+        parts = _repr_parts(item)
+        if parts is None:
+            out.append(repr(item))
+        else:
+            stack.extend(reversed(parts))
+    return "".join(out)
+
+# -------------------------
+# Hash-consing des expressions
+# -------------------------
+# Pendant un parse, les sous-arbres d'expression identiques (littéraux,
+# variables, BinOp/UnaryOp de sous-arbres déjà partagés) sont un seul et même
+# objet. Les instructions (Assign, If, ...) ne sont jamais partagées.
+class Interner:
+    def __init__(self, source=None):
+        self.source = source  # texte en cours d'analyse (table propre à un parse)
+        self.table = {}
+
+    def intern(self, key, factory):
+        node = self.table.get(key)
+        if node is None:
+            node = self.table[key] = factory()
+        return node
+
+    def number(self, value):
+        # le type fait partie de la clé : 1, 1.0 et True restent distincts
+        return self.intern(("Number", type(value), value), lambda: Number(value))
+
+    def boolean(self, value):
+        return self.intern(("Boolean", value), lambda: Boolean(value))
+
+    def string(self, value):
+        return self.intern(("String", value), lambda: String(value))
+
+    def null(self):
+        return self.intern(("Null",), Null)
+
+    def var(self, name):
+        return self.intern(("Var", name), lambda: Var(name))
+
+    # Les enfants étant déjà partagés, leur identité suffit comme clé.
+    def binop(self, left, op, right):
+        return self.intern(("BinOp", id(left), op, id(right)), lambda: BinOp(left, op, right))
+
+    def unaryop(self, op, operand):
+        return self.intern(("UnaryOp", op, id(operand)), lambda: UnaryOp(op, operand))
+
+
+def _interner(p):
+    """Table de hash-consing du parse en cours (rattachée au lexer utilisé)."""
+    lexer = p.lexer
+    interner = getattr(lexer, "interner", None)
+    if interner is None or interner.source is not lexer.lexdata:
+        interner = lexer.interner = Interner(lexer.lexdata)
+    return interner
+
+# -------------------------
+# Construction des nœuds (partagée avec pratt_parser.py)
+# -------------------------
+def build_if(cond, then_branch, elifs, else_branch, pos=None):
+    # Fold elifs into nested Ifs so representation is simple:
+    current_else = else_branch
+    # build from last to first ; elifs : (condition, corps, position du elseif)
+    for econd, ebody, epos in reversed(elifs):
+        current_else = [If(econd, ebody, current_else, epos)]
+    return nested(If(cond, then_branch, current_else, pos),
+                  [then_branch, else_branch] + [ebody for _, ebody, _ in elifs])
+
+# Profondeur maximale d'imbrication des blocs (if / while / for). Les passes
+# sur l'arbre (resolver, optimiseurs, compilateurs, interpréteur) descendent
+# récursivement dans les blocs : au-delà, le source est refusé par une
+# SyntaxError au lieu d'une RecursionError à l'exécution. Les chaînes elseif
+# et d'opérateurs ne sont pas des imbrications et ne sont pas limitées.
+MAX_NESTING = 200
+
+def nested(stmt, bodies):
+    """Pose `stmt._depth` : 1 + la profondeur du plus profond de ses corps."""
+    depth = 0
+    for body in bodies:
+        for child in body or ():
+            depth = max(depth, getattr(child, "_depth", 0))  # Assign, Print : 0
+    stmt._depth = depth + 1
+    return stmt
+
+def blocks(stmt):
+    """Corps directs d'une instruction parsée (ceux d'une chaîne elseif compris)."""
+    if isinstance(stmt, If):
+        yield stmt.then_branch
+        else_branch = stmt.else_branch
+        # un elseif est un If imbriqué construit par build_if, sans `_depth`
+        while else_branch and len(else_branch) == 1 and isinstance(else_branch[0], If) \
+                and not hasattr(else_branch[0], "_depth"):
+            yield else_branch[0].then_branch
+            else_branch = else_branch[0].else_branch
+        if else_branch:
+            yield else_branch
+    elif isinstance(stmt, (While, For)):
+        yield stmt.body
+
+def too_deep(statements):
+    """Première instruction (ordre du source) au niveau MAX_NESTING + 1, ou None."""
+    level = 1
+    while True:
+        stmt = next((s for s in statements if level + getattr(s, "_depth", 0) > MAX_NESTING + 1), None)
+        if stmt is None or level > MAX_NESTING:
+            return stmt
+        statements = [child for body in blocks(stmt) for child in body]
+        level += 1
+
+def nesting_error(pos, source):
+    line, col = line_index(source).location(pos)
+    return SyntaxError(f"Blocks nested too deeply (more than {MAX_NESTING} levels), line {line}, col {col}")
+
+# Les expressions aussi : parenthèses et moins unaires ouverts en même temps,
+# au plus MAX_NESTING. Le parser Pratt les compte en descendant ; pour yacc,
+# ils sont suivis sur le flux de tokens (nesting_checked), et l'erreur tombe
+# sur le même token : celui qui ouvre le niveau MAX_NESTING + 1.
+OPERAND_TOKENS = frozenset(('NUMBER', 'IDENTIFIER', 'STRING', 'BOOLEAN', 'NULL'))
+
+def expression_nesting_error(pos, source):
+    line, col = line_index(source).location(pos)
+    return SyntaxError(f"Expressions nested too deeply (more than {MAX_NESTING} levels), "
+                       f"line {line}, col {col}")
+
+def nesting_checked(get_token, source):
+    """`get_token` (lexer.token) qui lève expression_nesting_error au besoin."""
+    frames = [[False, 0]]  # par parenthèse : [d'expression ?, moins unaires en attente]
+    depth = 0
+    previous = None
+
+    def token():
+        nonlocal depth, previous
+        tok = get_token()
+        if tok is None:
+            return None
+        kind = tok.type
+        if kind in OPERAND_TOKENS:
+            # opérande complet : fin des moins unaires qui le précèdent
+            depth -= frames[-1][1]
+            frames[-1][1] = 0
+        elif kind == 'MINUS':
+            if previous not in OPERAND_TOKENS and previous != 'RPAREN':  # moins unaire
+                frames[-1][1] += 1
+                depth += 1
+                if depth > MAX_NESTING:
+                    raise expression_nesting_error(tok.lexpos, source)
+        elif kind == 'LPAREN':
+            grouping = previous not in ('PRINT', 'RANGE')
+            frames.append([grouping, 0])
+            if grouping:
+                depth += 1
+                if depth > MAX_NESTING:
+                    raise expression_nesting_error(tok.lexpos, source)
+        elif kind == 'RPAREN' and len(frames) > 1:
+            grouping, pending = frames.pop()
+            depth -= grouping + pending
+            if grouping:  # (expression) : opérande complet
+                depth -= frames[-1][1]
+                frames[-1][1] = 0
+        previous = kind
+        return tok
+
+    return token
+
+def number_value(text):
+    # NUMBER token value may be string; try to convert
+    try:
+        if isinstance(text, (int, float)):
+            return text
+        elif isinstance(text, str) and '.' in text:
+            return float(text)
+        else:
+            return int(text)
+    except Exception:
+        # fallback: keep raw
+        return text
+
+def boolean_value(text):
+    # token value expected 'true' or 'false' (string)
+    return True if str(text).lower() == "true" else False
+
+def string_value(text):
+    # STRING token from lexer has quotes. Use ast.literal_eval to unescape safely
+    try:
+        return _ast.literal_eval(text)
+    except Exception:
+        # fallback: strip quotes if present
+        return text[1:-1] if len(text) >= 2 else text
+
+def locate(error, pos):
+    """Rattache à `error` (attribut `pisc_pos`) la position de l'instruction qui
+    l'a levée ; la plus interne l'emporte. Retourne `error`."""
+    if pos is not None and getattr(error, "pisc_pos", None) is None:
+        error.pisc_pos = pos
+    return error
+
+def syntax_error(token, source=None):
+    """SyntaxError pour le token inattendu (None = fin de l'entrée)."""
+    if token:
+        if source is None:
+            source = getattr(getattr(token, "lexer", None), "lexdata", None)
+        lexpos = getattr(token, "lexpos", -1)
+        if source is not None and lexpos >= 0:
+            lineno, col = line_index(source).location(lexpos)
+        else:
+            lineno, col = getattr(token, "lineno", "?"), "?"
+        return SyntaxError(f"Syntax error at token {token.type!r}, value {token.value!r}, line {lineno}, col {col}")
+    else:
+        return SyntaxError("Unexpected end of input")
+
 # -------------------------
 # Precedence (to reduce conflicts)
 # -------------------------
@@ -109,6 +400,7 @@ def p_program(p):
     "program : statement_list_opt"
     # p[1] is a list
     p[0] = Program(p[1])
+    p.lexer.interner = None  # libérer la table de hash-consing
 
 def p_statement_list_opt(p):
     """statement_list_opt : statement_list
@@ -122,10 +414,10 @@ def p_statement_list(p):
         lst = p[1]
         stmt = p[2]
         # skip None statements (comments)
+        # append en place : O(1) amorti au lieu de recopier la liste (lst + [stmt])
         if stmt is not None:
-            p[0] = lst + [stmt]
-        else:
-            p[0] = lst
+            lst.append(stmt)
+        p[0] = lst
     else:
         stmt = p[1]
         p[0] = [] if stmt is None else [stmt]
@@ -147,12 +439,12 @@ def p_statement(p):
 # assignment: IDENTIFIER = expression
 def p_assignment(p):
     "assignment : IDENTIFIER EQUALS expression"
-    p[0] = Assign(p[1], p[3])
+    p[0] = Assign(p[1], p[3], p.lexpos(1))
 
 # print: print(expr)
 def p_print_stmt(p):
     "print_stmt : PRINT LPAREN expression RPAREN"
-    p[0] = Print(p[3])
+    p[0] = Print(p[3], p.lexpos(1))
 
 # if / elseif / else with block braces { }
 def p_if_stmt(p):
@@ -161,15 +453,9 @@ def p_if_stmt(p):
     """
     cond = p[2]
     then_branch = p[4]
-    elifs = p[6]      # list of (cond, body) tuples or []
+    elifs = p[6]      # list of (cond, body, pos) tuples or []
     else_branch = p[7]  # either None or list
-
-    # Fold elifs into nested Ifs so representation is simple:
-    current_else = else_branch
-    # build from last to first
-    for econd, ebody in reversed(elifs):
-        current_else = [If(econd, ebody, current_else)]
-    p[0] = If(cond, then_branch, current_else)
+    p[0] = build_if(cond, then_branch, elifs, else_branch, p.lexpos(1))
 
 def p_elif_list_empty(p):
     "elif_list : empty"
@@ -177,11 +463,12 @@ def p_elif_list_empty(p):
 
 def p_elif_list_one(p):
     "elif_list : ELSEIF expression BLOCK_START statement_list_opt BLOCK_END"
-    p[0] = [(p[2], p[4])]
+    p[0] = [(p[2], p[4], p.lexpos(1))]
 
 def p_elif_list_many(p):
     "elif_list : elif_list ELSEIF expression BLOCK_START statement_list_opt BLOCK_END"
-    p[0] = p[1] + [(p[3], p[5])]
+    p[1].append((p[3], p[5], p.lexpos(2)))  # en place, comme statement_list
+    p[0] = p[1]
 
 def p_else_part_empty(p):
     "else_part : empty"
@@ -194,7 +481,7 @@ def p_else_part(p):
 # while
 def p_while_stmt(p):
     "while_stmt : WHILE expression BLOCK_START statement_list_opt BLOCK_END"
-    p[0] = While(p[2], p[4])
+    p[0] = nested(While(p[2], p[4], p.lexpos(1)), [p[4]])
 
 # for (Python-like): for IDENTIFIER in range(NUMBER) { body }
 def p_for_stmt(p):
@@ -202,7 +489,7 @@ def p_for_stmt(p):
     # Equivalent to: for i in range(5) { body }
     var_name = p[2]
     count = int(p[6])  # NUMBER
-    p[0] = For(var_name, count, p[9])
+    p[0] = nested(For(var_name, count, p[9], p.lexpos(1)), [p[9]])
 
 # -------------------------
 # Expressions
@@ -218,11 +505,11 @@ def p_expression_binop(p):
                   | expression LEQ expression
                   | expression GT expression
                   | expression GEQ expression"""
-    p[0] = BinOp(p[1], p[2], p[3])
+    p[0] = _interner(p).binop(p[1], p[2], p[3])
 
 def p_expression_uminus(p):
     "expression : MINUS expression %prec UMINUS"
-    p[0] = UnaryOp('-', p[2])
+    p[0] = _interner(p).unaryop('-', p[2])
 
 def p_expression_group(p):
     "expression : LPAREN expression RPAREN"
@@ -230,42 +517,23 @@ def p_expression_group(p):
 
 def p_expression_number(p):
     "expression : NUMBER"
-    # NUMBER token value may be string; try to convert
-    try:
-        if isinstance(p[1], (int, float)):
-            val = p[1]
-        elif isinstance(p[1], str) and '.' in p[1]:
-            val = float(p[1])
-        else:
-            val = int(p[1])
-    except Exception:
-        # fallback: keep raw
-        val = p[1]
-    p[0] = Number(val)
+    p[0] = _interner(p).number(number_value(p[1]))
 
 def p_expression_boolean(p):
     "expression : BOOLEAN"
-    # token value expected 'true' or 'false' (string)
-    val = True if str(p[1]).lower() == "true" else False
-    p[0] = Boolean(val)
+    p[0] = _interner(p).boolean(boolean_value(p[1]))
 
 def p_expression_null(p):
     "expression : NULL"
-    p[0] = Null()
+    p[0] = _interner(p).null()
 
 def p_expression_string(p):
     "expression : STRING"
-    # STRING token from lexer has quotes. Use ast.literal_eval to unescape safely
-    try:
-        s = _ast.literal_eval(p[1])
-    except Exception:
-        # fallback: strip quotes if present
-        s = p[1][1:-1] if len(p[1]) >= 2 else p[1]
-    p[0] = String(s)
+    p[0] = _interner(p).string(string_value(p[1]))
 
 def p_expression_var(p):
     "expression : IDENTIFIER"
-    p[0] = Var(p[1])
+    p[0] = _interner(p).var(p[1])
 
 # -------------------------
 # Helpers & error
@@ -275,32 +543,155 @@ def p_empty(p):
     p[0] = None
     
 def p_error(p):
-    if p:
-        lineno = getattr(p, "lineno", "?")
-        lexpos = getattr(p, "lexpos", -1)
-        raise SyntaxError(f"Syntax error at token {p.type!r}, value {p.value!r}, line {lineno}, pos {lexpos}")
-    else:
-        raise SyntaxError("Unexpected end of input")
+    raise syntax_error(p)
+
+
+def node_fields(node):
+    """Champs publics d'un nœud, dans l'ordre de déclaration : [(nom, valeur)]."""
+    return [(name, getattr(node, name)) for name in node.__slots__ if not name.startswith("_")]
 
 
 def ast_to_dict(node):
-    """Convert AST objects into simple dicts/lists for JSON serialization."""
-    if node is None:
-        return None
-    if isinstance(node, list):
-        return [ast_to_dict(n) for n in node]
-    # primitive (string, number, bool)
-    if isinstance(node, (str, int, float, bool)):
-        return node
-    # objects with attributes
-    if hasattr(node, "__dict__"):
-        data = {}
-        for k, v in vars(node).items():
-            data[k] = ast_to_dict(v)
-        return {node.__class__.__name__: data}
-    # fallback
-    return str(node)
+    """Convert AST objects into simple dicts/lists for JSON serialization.
+
+    Sans récursion (pile explicite) : longues chaînes elseif ou d'opérateurs.
+    """
+    root = [None]
+    stack = [(node, root, 0)]  # (nœud, conteneur du résultat, clé)
+    while stack:
+        node, container, key = stack.pop()
+        if node is None or isinstance(node, (str, int, float, bool)):
+            container[key] = node
+        elif isinstance(node, list):
+            items = container[key] = [None] * len(node)
+            stack.extend((child, items, i) for i, child in enumerate(node))
+        elif hasattr(node, "__slots__"):
+            data = {}
+            container[key] = {node.__class__.__name__: data}
+            for k, v in node_fields(node):
+                data[k] = None  # ordre des champs conservé
+                stack.append((v, data, k))
+        else:
+            container[key] = str(node)  # fallback
+    return root[0]
 
 
 # Build the parser
-parser = yacc.yacc()
+def grammar_signature(signature):
+    """Signature PLY de la grammaire, sans l'indentation des docstrings
+    (Python 3.13 les dédente : mêmes tables quelle que soit la version)."""
+    return re.sub(r"\n\s+", "\n", signature)
+
+def build_parser():
+    """Parser LALR lu depuis parsetab.py (voir build_tables.py)."""
+    if BUILDING_TABLES:
+        return yacc.yacc(debug=False, write_tables=True, outputdir=TABLES_DIR)
+    grammar = yacc.ParserReflect(globals())
+    grammar.get_all()
+    if grammar.error:
+        raise yacc.YaccError("Unable to build parser")
+    try:
+        import parsetab
+    except ImportError:
+        parsetab = None
+    if parsetab is None or \
+            grammar_signature(parsetab._lr_signature) != grammar_signature(grammar.signature()):
+        raise StaleTables("parsetab.py is missing or out of date: run `python build_tables.py`")
+    tables = yacc.LRTable()
+    tables.read_table("parsetab")
+    tables.bind_callables(grammar.pdict)
+    return LRParser(tables, grammar.error_func)
+
+class LRParser(yacc.LRParser):
+    """Parser LALR de PLY, plus les limites d'imbrication.
+
+    Celle des blocs est vérifiée sur l'arbre complet (une SyntaxError levée
+    dans une règle lance la reprise sur erreur de PLY au lieu de remonter) ;
+    l'instruction signalée est la même que pour le parser Pratt, qui la
+    détecte en descendant. Celle des expressions l'est token par token.
+    """
+
+    def parse(self, input=None, lexer=None, debug=False, tracking=False, tokenfunc=None):
+        if lexer is None:
+            from lexer import lexer
+        if input is not None:
+            lexer.input(input)
+        tokenfunc = nesting_checked(tokenfunc or lexer.token, lexer.lexdata)
+        program = super().parse(None, lexer, debug, tracking, tokenfunc)
+        stmt = too_deep(program.statements)
+        if stmt is not None:
+            raise nesting_error(stmt._pos, lexer.lexdata)
+        return program
+
+yacc_parser = build_parser()
+
+# Choix du parser à l'import : PISC_PARSER=pratt utilise le parser écrit à la
+# main (pratt_parser.py), qui produit les mêmes arbres et les mêmes erreurs.
+PARSER_BACKEND = os.environ.get("PISC_PARSER", "ply")
+if PARSER_BACKEND == "pratt":
+    from pratt_parser import PrattParser
+    from scanner import scan
+    parser = PrattParser()
+else:
+    parser = yacc_parser
+
+
+# -------------------------
+# API réentrante
+# -------------------------
+# `parser` et le `lexer` global gardent leur état entre deux appels (pile LR,
+# erreurs, numéro de ligne) : un parse concurrent sur les mêmes objets
+# mélangerait les résultats. Chaque thread a donc son propre parser, et
+# chaque appel son propre lexer.
+_thread_state = threading.local()
+
+def thread_parser():
+    """Parser (yacc ou Pratt, selon PISC_PARSER) propre au thread courant."""
+    local_parser = getattr(_thread_state, "parser", None)
+    if local_parser is None:
+        if PARSER_BACKEND == "pratt":
+            local_parser = PrattParser()
+        else:
+            local_parser = copy.copy(yacc_parser)  # les tables LALR sont partagées
+        _thread_state.parser = local_parser
+    return local_parser
+
+def parse_source(code, timings=None):
+    """Lexe et parse `code` sans toucher à l'état global.
+
+    Retourne (ast, erreurs lexicales). Une erreur de syntaxe lève SyntaxError.
+    `timings` (dict) reçoit les durées "lex" et "parse" en secondes ; avec
+    PLY, le temps du lexer est cumulé token par token (le source n'est pas
+    lexé d'avance : mémoire inchangée).
+    """
+    lexer = new_lexer()
+    if timings is None:
+        ast = thread_parser().parse(code, lexer=lexer)
+        return ast, lexer.errors
+
+    local_parser = thread_parser()
+    start = time.perf_counter()
+    if PARSER_BACKEND == "pratt":
+        buffer = scan(code)
+        lexed = time.perf_counter()
+        try:
+            ast = local_parser.parse(code, lexer=lexer, buffer=buffer)
+        finally:
+            timings["lex"], timings["parse"] = lexed - start, time.perf_counter() - lexed
+    else:
+        lexer.input(code)
+        lexing = 0.0
+        clock, next_token = time.perf_counter, lexer.token
+
+        def timed_token():
+            nonlocal lexing
+            before = clock()
+            tok = next_token()
+            lexing += clock() - before
+            return tok
+
+        try:
+            ast = local_parser.parse(lexer=lexer, tokenfunc=timed_token)
+        finally:
+            timings["lex"], timings["parse"] = lexing, time.perf_counter() - start - lexing
+    return ast, lexer.errors
@@ -0,0 +1,256 @@
+# pratt_parser.py
+
+from parser import (
+    Program, Assign, Print, While, For, Interner, MAX_NESTING,
+    build_if, nested, nesting_error, expression_nesting_error, number_value, boolean_value,
+    string_value, syntax_error
+)
+from scanner import scan, TYPE_NAMES
+
+# -------------------------
+# Binding powers (équivalent de `precedence` dans parser.py)
+# -------------------------
+# Tous les opérateurs binaires sont associatifs à gauche ; le moins unaire
+# lie plus fort que tous les opérateurs binaires (%prec UMINUS).
+BINARY_POWER = {
+    'EQ': 10, 'NEQ': 10, 'LT': 10, 'LEQ': 10, 'GT': 10, 'GEQ': 10,
+    'PLUS': 20, 'MINUS': 20,
+    'TIMES': 30, 'DIVIDE': 30,
+}
+# Valeur (texte) des opérateurs : pas besoin de la relire dans le source
+OPERATORS = {
+    'EQ': '==', 'NEQ': '!=', 'LT': '<', 'LEQ': '<=', 'GT': '>', 'GEQ': '>=',
+    'PLUS': '+', 'MINUS': '-', 'TIMES': '*', 'DIVIDE': '/',
+}
+UNARY_POWER = 40
+PREFIX_TOKENS = {'NUMBER', 'IDENTIFIER', 'STRING', 'BOOLEAN', 'NULL', 'MINUS', 'LPAREN'}
+
+
+# -------------------------
+# Parser
+# -------------------------
+class PrattParser:
+    """Parser descendant écrit à la main pour la grammaire .pisc.
+
+    Même interface que le parser yacc (`parse(data, lexer=...)`), mêmes arbres
+    (hash-consing compris) et mêmes messages de SyntaxError. Les tokens sont
+    lus dans le tampon colonnaire de scanner.py, sans objet par token ; le
+    `lexer` ne sert qu'à recevoir les erreurs lexicales. En cas d'erreur de
+    syntaxe, seules celles que le parser LALR aurait vues (tokens lus jusqu'au
+    token fautif) sont transmises.
+    """
+
+    def __init__(self):
+        self.buffer = None
+        self.types = None
+        self.pos = 0
+        self.kind = None   # type du token courant, None en fin d'entrée
+        self.interner = None
+        self.depth = 0     # blocs ouverts
+        self.nesting = 0   # parenthèses et moins unaires ouverts (expressions)
+
+    def parse(self, data, lexer=None, buffer=None):
+        """`buffer` : tokens de `data` déjà découpés par scan()."""
+        if lexer is None:
+            from lexer import lexer
+        if data is None:
+            # comme yacc : suite de l'entrée déjà donnée au lexer (lexpos..lexlen)
+            data = lexer.lexdata
+            buffer = scan(data, lexer.lexpos, lexer.lexlen)
+        elif buffer is None:
+            buffer = scan(data)
+        self.buffer, self.types, self.pos = buffer, buffer.types, 0
+        self.kind = TYPE_NAMES[self.types[0]]
+        self.interner = Interner(data)
+        self.depth = self.nesting = 0
+        try:
+            statements = self.parse_statements()
+            lexer.errors.extend(buffer.errors)
+            return Program(statements)
+        except SyntaxError:
+            lexer.errors.extend(buffer.errors_seen(self.pos))
+            raise
+        finally:
+            self.buffer = self.types = self.kind = self.interner = None
+
+    # --- tokens ---
+    def advance(self):
+        """Passe au token suivant ; retourne la position du token consommé."""
+        pos = self.pos
+        self.pos = pos + 1
+        self.kind = TYPE_NAMES[self.types[pos + 1]]
+        return pos
+
+    def expect(self, type_):
+        if self.kind != type_:
+            raise self.error()
+        return self.advance()
+
+    def value(self, pos):
+        return self.buffer.value(pos)
+
+    def error(self):
+        """SyntaxError sur le token courant (seul token matérialisé)."""
+        token = self.buffer.token(self.pos) if self.kind is not None else None
+        return syntax_error(token, self.buffer.source)
+
+    # --- statements ---
+    def parse_statements(self):
+        """Instructions du programme, jusqu'à la fin de l'entrée."""
+        statements = []
+        while self.kind is not None:
+            stmt = self.parse_statement(self.kind)
+            if stmt is not None:  # comments produce None
+                statements.append(stmt)
+        return statements
+
+    def parse_block(self):
+        # boucle ici plutôt qu'un appel de plus par niveau de blocs : la pile
+        # Python doit tenir MAX_NESTING blocs et MAX_NESTING niveaux d'expression
+        self.expect('BLOCK_START')
+        body = []
+        while True:
+            kind = self.kind
+            if kind is None:
+                raise self.error()
+            if kind == 'BLOCK_END':
+                self.advance()
+                return body
+            stmt = self.parse_statement(kind)
+            if stmt is not None:
+                body.append(stmt)
+
+    def enter(self, pos):
+        """Ouvre le niveau de blocs d'une instruction if / while / for."""
+        self.depth += 1
+        if self.depth > MAX_NESTING:
+            raise nesting_error(pos, self.buffer.source)
+
+    def parse_statement(self, kind):
+        starts = self.buffer.starts
+        pos = starts[self.pos]  # position du premier token (voir parser.py)
+        if kind == 'IDENTIFIER':
+            name = self.value(self.advance())
+            self.expect('EQUALS')
+            return Assign(name, self.parse_expression(), pos)
+
+        elif kind == 'PRINT':
+            self.advance()
+            self.expect('LPAREN')
+            expr = self.parse_expression()
+            self.expect('RPAREN')
+            return Print(expr, pos)
+
+        elif kind == 'IF':
+            self.enter(pos)
+            self.advance()
+            cond = self.parse_expression()
+            then_branch = self.parse_block()
+            elifs = []
+            while self.kind == 'ELSEIF':
+                epos = starts[self.advance()]
+                econd = self.parse_expression()
+                elifs.append((econd, self.parse_block(), epos))
+            else_branch = None
+            if self.kind == 'ELSE':
+                self.advance()
+                else_branch = self.parse_block()
+            self.depth -= 1
+            return build_if(cond, then_branch, elifs, else_branch, pos)
+
+        elif kind == 'WHILE':
+            self.enter(pos)
+            self.advance()
+            cond = self.parse_expression()
+            body = self.parse_block()
+            self.depth -= 1
+            return nested(While(cond, body, pos), [body])
+
+        elif kind == 'FOR':
+            self.enter(pos)
+            self.advance()
+            var_name = self.value(self.expect('IDENTIFIER'))
+            self.expect('IN')
+            self.expect('RANGE')
+            self.expect('LPAREN')
+            count = self.value(self.expect('NUMBER'))
+            self.expect('RPAREN')
+            body = self.parse_block()
+            self.depth -= 1
+            # int() après le corps : yacc ne réduit la règle qu'à la fin
+            return nested(For(var_name, int(count), body, pos), [body])
+
+        elif kind == 'COMMENT':
+            self.advance()
+            return None
+
+        raise self.error()
+
+    # --- expressions ---
+    def open_expression(self, pos):
+        """Ouvre un niveau d'expression (parenthèse ou moins unaire), token `pos`."""
+        self.nesting += 1
+        if self.nesting > MAX_NESTING:
+            raise expression_nesting_error(self.buffer.starts[pos], self.buffer.source)
+
+    def parse_expression(self, min_power=0):
+        left = self.parse_prefix()
+        while True:
+            kind = self.kind
+            power = BINARY_POWER.get(kind)
+            if power is None or power <= min_power:
+                return left
+            self.advance()
+            op = OPERATORS[kind]
+            right = self.parse_expression(power)
+            left = self.interner.binop(left, op, right)
+
+    def parse_prefix(self):
+        kind = self.kind
+        if kind not in PREFIX_TOKENS:
+            # ne pas lire au-delà du token fautif (erreurs lexicales identiques)
+            raise self.error()
+        pos = self.advance()
+        if kind == 'NUMBER':
+            return self.interner.number(number_value(self.value(pos)))
+        elif kind == 'IDENTIFIER':
+            return self.interner.var(self.value(pos))
+        elif kind == 'STRING':
+            return self.interner.string(string_value(self.value(pos)))
+        elif kind == 'BOOLEAN':
+            return self.interner.boolean(boolean_value(self.value(pos)))
+        elif kind == 'NULL':
+            return self.interner.null()
+        elif kind == 'MINUS':
+            # moins consécutifs en boucle ; l'opérande d'un moins unaire est un
+            # préfixe (aucun opérateur binaire ne lie plus fort que UNARY_POWER)
+            self.open_expression(pos)
+            count = 1
+            while self.kind == 'MINUS':
+                self.open_expression(self.advance())
+                count += 1
+            operand = self.parse_prefix()
+            for _ in range(count):
+                operand = self.interner.unaryop('-', operand)
+            self.nesting -= count
+            return operand
+        else:  # LPAREN
+            self.open_expression(pos)
+            expr = self.parse_expression()
+            self.expect('RPAREN')
+            self.nesting -= 1
+            return expr
+
+
+# -------------------------
+# Manual test (only if run directly)
+# -------------------------
+if __name__ == "__main__":
+    from lexer import lexer
+    from parser import ast_to_dict
+
+    code = """
+    x = 1 + 2 * -3
+    if x < 0 { print("neg") } elseif x == 0 { print("zero") } else { print(x) }
+    """
+    print(ast_to_dict(PrattParser().parse(code, lexer=lexer)))
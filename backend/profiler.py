@@ -0,0 +1,83 @@
+# profiler.py
+
+from time import perf_counter
+
+from interpreter import Interpreter
+from lexer import line_index
+from parser import BinOp
+
+# -------------------------
+# Profilage d'une exécution (opt-in)
+# -------------------------
+# ProfilingInterpreter est une sous-classe de l'interpréteur "tree" : sans
+# profilage, c'est Interpreter qui s'exécute, inchangé (aucun test ni
+# compteur sur le chemin critique).
+#
+# Par ligne du source : nombre d'exécutions des instructions qui y commencent,
+# temps cumulé (instructions filles comprises, sans compter deux fois une
+# instruction imbriquée sur la même ligne) et temps propre (sans les filles).
+# Un if et ses elseif sont une seule instruction (ligne du if).
+# Par type de nœud d'expression : nombre d'évaluations.
+
+PROFILE_LINES = 100  # lignes les plus coûteuses retournées par table()
+
+
+class ProfilingInterpreter(Interpreter):
+    def __init__(self, source, max_steps=None, max_output=None, max_value_size=None, sink=None):
+        super().__init__(max_steps, max_output, max_value_size, sink)
+        self.line = line_index(source).line
+        self.lines = {}         # ligne -> [exécutions, temps cumulé, temps propre]
+        self.nodes = {}         # type de nœud -> évaluations
+        self.current = None     # ligne de l'instruction en cours
+        self.children = 0.0     # temps des instructions filles de l'instruction en cours
+        self.total = 0.0
+
+    def run(self, program):
+        start = perf_counter()
+        try:
+            return super().run(program)
+        finally:
+            self.total += perf_counter() - start
+
+    def exec_stmt(self, stmt):
+        line = self.line(stmt._pos) if stmt._pos is not None else None
+        outer, outer_children = self.current, self.children
+        self.current, self.children = line, 0.0
+        start = perf_counter()
+        try:
+            super().exec_stmt(stmt)
+        finally:
+            elapsed = perf_counter() - start
+            record = self.lines.get(line)
+            if record is None:
+                record = self.lines[line] = [0, 0.0, 0.0]
+            record[0] += 1
+            if outer != line:  # sinon déjà compté dans l'instruction englobante
+                record[1] += elapsed
+            record[2] += elapsed - self.children
+            self.current, self.children = outer, outer_children + elapsed
+
+    def eval_expr(self, expr):
+        name = expr.__class__.__name__
+        self.nodes[name] = self.nodes.get(name, 0) + 1
+        return super().eval_expr(expr)
+
+    def eval_chain(self, expr):
+        # nœuds de la branche gauche évalués en boucle, sans eval_expr
+        node = expr.left
+        while isinstance(node, BinOp):
+            self.nodes["BinOp"] = self.nodes.get("BinOp", 0) + 1
+            node = node.left
+        return super().eval_chain(expr)
+
+    def table(self, limit=PROFILE_LINES):
+        """Table de chaleur sérialisable (JSON) : lignes triées par temps propre."""
+        lines = sorted(self.lines.items(), key=lambda item: item[1][2], reverse=True)
+        return {
+            "total_time": round(self.total, 6),
+            "lines": [{"line": line, "count": count, "time": round(cumulative, 6),
+                       "self_time": round(own, 6)}
+                      for line, (count, cumulative, own) in lines[:limit]],
+            "lines_total": len(lines),
+            "nodes": dict(sorted(self.nodes.items(), key=lambda item: item[1], reverse=True)),
+        }
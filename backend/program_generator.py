@@ -0,0 +1,87 @@
+# program_generator.py
+# Programmes .pisc valides générés par taille et par forme, pour les tests de
+# montée en charge (tests/test_scaling.py) et les benchmarks : les exemples de
+# tests/samples font quelques lignes et ne révèlent ni coût quadratique ni
+# limite de récursion.
+#   python program_generator.py SHAPE SIZE > programme.pisc
+
+
+def flat(n):
+    """`n` instructions de premier niveau (affectations, un print sur dix)."""
+    lines, last = ["x0 = 0"], 0
+    for i in range(1, n):
+        if i % 10 == 0:
+            lines.append(f"print(x{last})")
+        else:
+            lines.append(f"x{i % 100} = x{last} + {i}")
+            last = i % 100
+    return "\n".join(lines) + "\n"
+
+
+def elif_chain(n):
+    """Un `if` suivi de `n - 1` branches `elseif` (et un `else`)."""
+    branches = "\n".join(f"}} elseif a == {i} {{\n  b = {i}" for i in range(1, n))
+    return f"a = {n - 1}\nif a == 0 {{\n  b = 0\n{branches}\n}} else {{\n  b = -1\n}}\nprint(b)\n"
+
+
+def nested_blocks(n):
+    """`n` blocs imbriqués (if, while, for en alternance), une instruction au fond."""
+    setup, opening, closing = [f"n = {n}"], [], []
+    for depth in range(n):
+        indent = "  " * min(depth, 8)  # indentation bornée : source linéaire en n
+        if depth % 3 == 0:
+            setup.append(f"d{depth} = 0")
+            opening.append(f"{indent}if d{depth} == 0 {{")
+            closing.append([f"{indent}}}"])
+        elif depth % 3 == 1:
+            setup.append(f"d{depth} = 0")
+            opening.append(f"{indent}while d{depth} < 1 {{")
+            closing.append([f"{indent}  d{depth} = d{depth} + 1", f"{indent}}}"])
+        else:
+            opening.append(f"{indent}for d{depth} in range(1) {{")
+            closing.append([f"{indent}}}"])
+    lines = setup + opening + ["  " * min(n, 8) + "print(n)"]
+    for block_end in reversed(closing):
+        lines.extend(block_end)
+    return "\n".join(lines) + "\n"
+
+
+def expression_chain(n):
+    """Une expression de `n` opérandes : + et - en alternance (associativité à
+    gauche), un opérande sur trois multiplié (priorité) ; la valeur reste petite."""
+    terms = ["1"]
+    for i in range(1, n):
+        operand = f"{i % 7 + 1} * 2" if i % 3 == 0 else f"{i % 7 + 1}"
+        terms.append(f"{'+' if i % 2 else '-'} {operand}")
+    return f"x = {' '.join(terms)}\nprint(x)\n"
+
+
+def string_concat(n):
+    """Une concaténation de `n` chaînes."""
+    return "s = " + " + ".join(f'"p{i}"' for i in range(n)) + "\nprint(s)\n"
+
+
+SHAPES = {
+    "flat": flat,
+    "elif_chain": elif_chain,
+    "nested_blocks": nested_blocks,
+    "expression_chain": expression_chain,
+    "string_concat": string_concat,
+}
+
+
+def generate(shape, size):
+    """Programme de forme `shape` (voir SHAPES) et de taille `size`."""
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown shape '{shape}' (expected one of: {', '.join(SHAPES)})")
+    return SHAPES[shape](size)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    argp = argparse.ArgumentParser(description="Génère un programme .pisc valide")
+    argp.add_argument("shape", choices=sorted(SHAPES))
+    argp.add_argument("size", type=int)
+    args = argp.parse_args()
+    print(generate(args.shape, args.size), end="")
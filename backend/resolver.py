@@ -0,0 +1,94 @@
+# resolver.py
+
+from parser import (
+    Program, Assign, Print, If, While, For,
+    BinOp, UnaryOp, Var, Let
+)
+
+# -------------------------
+# Resolver : nom de variable -> slot
+# -------------------------
+# Passe statique exécutée une fois par programme : chaque identifiant reçoit
+# un numéro de slot (ordre de première apparition), stocké dans l'attribut
+# privé `_slot` des nœuds Var / Assign / For / Let. L'interpréteur lit et écrit
+# alors les variables dans une liste au lieu d'un dictionnaire.
+# La table slot -> nom est conservée dans `program._names`.
+
+class Resolver:
+    def __init__(self):
+        self.names = []
+        self.slots = {}
+
+    def slot(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.names)
+            self.names.append(name)
+        return self.slots[name]
+
+    def resolve_block(self, statements):
+        for stmt in statements:
+            self.resolve_stmt(stmt)
+
+    def resolve_stmt(self, stmt):
+        if isinstance(stmt, Assign):
+            self.resolve_expr(stmt.expr)
+            stmt._slot = self.slot(stmt.name)
+        elif isinstance(stmt, Print):
+            self.resolve_expr(stmt.expr)
+        elif isinstance(stmt, If):
+            # chaîne elseif parcourue en boucle (même ordre que la récursion)
+            while True:
+                self.resolve_expr(stmt.condition)
+                self.resolve_block(stmt.then_branch)
+                else_branch = stmt.else_branch
+                if else_branch and len(else_branch) == 1 and isinstance(else_branch[0], If):
+                    stmt = else_branch[0]
+                    continue
+                if else_branch:
+                    self.resolve_block(else_branch)
+                break
+        elif isinstance(stmt, While):
+            self.resolve_expr(stmt.condition)
+            self.resolve_block(stmt.body)
+        elif isinstance(stmt, For):
+            stmt._slot = self.slot(stmt.var)
+            self.resolve_block(stmt.body)
+
+    def resolve_expr(self, expr):
+        if isinstance(expr, Var):
+            expr._slot = self.slot(expr.name)
+        elif isinstance(expr, BinOp):
+            # branche gauche en boucle : longues chaînes a + b + c ... sans récursion
+            rights = []
+            while isinstance(expr, BinOp):
+                rights.append(expr.right)
+                expr = expr.left
+            self.resolve_expr(expr)
+            for right in reversed(rights):
+                self.resolve_expr(right)
+        elif isinstance(expr, UnaryOp):
+            self.resolve_expr(expr.operand)
+        elif isinstance(expr, Let):
+            self.resolve_expr(expr.expr)
+            expr._slot = self.slot(expr.name)
+
+
+def resolve(program: Program, resolver=None):
+    """Annote le programme (une seule fois) et retourne la table slot -> nom.
+
+    `resolver` : table partagée par plusieurs programmes dont les arbres ont
+    des sous-arbres communs (versions d'un document, voir incremental.py) ;
+    un même nom garde alors le même slot dans tous ces programmes.
+    """
+    names = getattr(program, "_names", None)
+    if names is None:
+        if resolver is None:
+            resolver = Resolver()
+            origin = getattr(program, "_origin", None)
+            if origin is not None:
+                # nœuds partagés avec `origin` : mêmes slots que lorsqu'il est
+                # résolu seul (première apparition dans `origin`)
+                resolver.resolve_block(origin.statements)
+        resolver.resolve_block(program.statements)
+        names = program._names = list(resolver.names)
+    return names
@@ -0,0 +1,162 @@
+# scanner.py
+
+import re
+from array import array
+from bisect import bisect_right
+
+from ply.lex import LexToken
+
+from lexer import tokens, literals, reserved, line_index
+import lextab  # tables vérifiées à l'import de lexer.py
+
+# -------------------------
+# Scanner à tampon colonnaire
+# -------------------------
+# Même découpage que le lexer PLY (même expression maîtresse, lue dans
+# lextab.py), mais sans un LexToken ni un appel de fonction par token : les
+# tokens sont rangés en colonnes (type, début, fin, ligne) dans des array.
+# La valeur d'un token est la tranche source[début:fin], comme pour PLY.
+
+# Types : tokens de lexer.py, puis littéraux (type = le caractère), puis END
+TYPE_NAMES = list(tokens) + list(dict.fromkeys(literals)) + [None]
+TYPE_IDS = {name: i for i, name in enumerate(TYPE_NAMES)}
+END = len(TYPE_NAMES) - 1  # sentinelle en fin de `types` (fin de l'entrée)
+
+# Groupes de l'expression qui ne produisent pas directement un token
+_IDENTIFIER, _NEWLINE, _LITERAL, _ERROR = -1, -2, -3, -4
+
+
+def _master():
+    """Expression maîtresse de PLY, complétée par ce que PLY traite hors regex :
+    caractères ignorés (absorbés devant chaque token : une itération de moins
+    par espace), littéraux, puis n'importe quel caractère (erreur).
+    Retourne (regex compilée, action par numéro de groupe)."""
+    (pattern, _), = lextab._lexstatere['INITIAL']
+    ignore = re.escape(lextab._lexstateignore['INITIAL'])
+    pattern = (f"[{ignore}]*(?:{pattern}"
+               f"|(?P<literal>[{re.escape(lextab._lexliterals)}])"
+               f"|(?P<error>[^{ignore}]))")
+    regex = re.compile(pattern, lextab._lexreflags)
+
+    special = {"t_IDENTIFIER": _IDENTIFIER, "t_newline": _NEWLINE,
+               "literal": _LITERAL, "error": _ERROR}
+    actions = [None] * (regex.groups + 1)
+    for name, index in regex.groupindex.items():
+        actions[index] = special.get(name)
+        if actions[index] is None:
+            actions[index] = TYPE_IDS[name[len("t_"):]]  # t_NUMBER -> NUMBER
+    return regex, actions
+
+
+MASTER, ACTIONS = _master()
+RESERVED_IDS = {word: TYPE_IDS[name] for word, name in reserved.items()}
+IDENTIFIER_ID = TYPE_IDS['IDENTIFIER']
+
+
+class TokenBuffer:
+    """Tokens d'un source, en colonnes.
+
+    `types[i]` (TYPE_NAMES), `starts[i]` / `ends[i]` (positions dans `source`),
+    `lines[i]` ; `types` se termine par END. `errors` contient les erreurs
+    lexicales (messages du lexer PLY), `error_marks` le nombre de tokens lus
+    avant chacune.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.types = array('B')
+        self.starts = array('L')
+        self.ends = array('L')
+        self.lines = array('L')
+        self.errors = []
+        self.error_marks = array('L')
+        self.line_index = None  # lexer.LineIndex de `source`, construit à la première erreur
+
+    def __len__(self):
+        return len(self.starts)
+
+    def type(self, i):
+        return TYPE_NAMES[self.types[i]]
+
+    def value(self, i):
+        return self.source[self.starts[i]:self.ends[i]]
+
+    def pairs(self):
+        """[(type, valeur)], comme `[(tok.type, tok.value) for tok in lexer]`."""
+        return [(self.type(i), self.value(i)) for i in range(len(self))]
+
+    def token(self, i):
+        """LexToken du i-ème token (messages d'erreur, débogage)."""
+        token = LexToken()
+        token.type, token.value = self.type(i), self.value(i)
+        token.lineno, token.lexpos = self.lines[i], self.starts[i]
+        return token
+
+    def errors_seen(self, read):
+        """Erreurs qu'aurait signalées le lexer PLY une fois lus les tokens 0..read
+        (toutes si `read` atteint la fin) : mêmes erreurs qu'un parse à la demande."""
+        return self.errors[:bisect_right(self.error_marks, read)]
+
+
+def scan(source, start=0, end=None):
+    """Découpe `source` (ou sa tranche [start:end], bornée par des débuts de
+    token) en tokens ; retourne un TokenBuffer."""
+    buffer = TokenBuffer(source)
+    add_type, add_start = buffer.types.append, buffer.starts.append
+    add_end, add_line = buffer.ends.append, buffer.lines.append
+    actions, reserved_ids = ACTIONS, RESERVED_IDS
+    lineno = source.count("\n", 0, start) + 1
+
+    for match in MASTER.finditer(source, start, len(source) if end is None else end):
+        group = match.lastindex
+        action = actions[group]
+        start, end = match.span(group)
+        if action >= 0:
+            pass
+        elif action == _IDENTIFIER:
+            action = reserved_ids.get(source[start:end], IDENTIFIER_ID)
+        elif action == _NEWLINE:
+            lineno += end - start
+            continue
+        elif action == _LITERAL:
+            action = TYPE_IDS[source[start]]
+        else:
+            line, col = line_index(source, buffer).location(start)
+            buffer.errors.append(f"Illegal character '{source[start]}' at line {line}, col {col}")
+            buffer.error_marks.append(len(buffer.starts))
+            continue
+        add_type(action)
+        add_start(start)
+        add_end(end)
+        add_line(lineno)
+
+    add_type(END)
+    return buffer
+
+
+def tokens_from(source, pos=0):
+    """Générateur (type, début, fin) des tokens de `source` à partir de `pos`,
+    un par un (re-lexing partiel, voir incremental.py). Un caractère illégal
+    donne le type None ; les fins de ligne ne sont pas des tokens."""
+    actions, reserved_ids = ACTIONS, RESERVED_IDS
+    for match in MASTER.finditer(source, pos):
+        group = match.lastindex
+        action = actions[group]
+        start, end = match.span(group)
+        if action >= 0:
+            yield action, start, end
+        elif action == _IDENTIFIER:
+            yield reserved_ids.get(source[start:end], IDENTIFIER_ID), start, end
+        elif action == _LITERAL:
+            yield TYPE_IDS[source[start]], start, end
+        elif action == _ERROR:
+            yield None, start, end
+
+
+# -------------------------
+# Manual test (only if run directly)
+# -------------------------
+if __name__ == "__main__":
+    buffer = scan('x = 1\nif x >= 1 { print("ok") } $')
+    print(buffer.pairs())
+    print(buffer.errors)
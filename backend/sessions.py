@@ -0,0 +1,98 @@
+# sessions.py
+
+import asyncio
+import sys
+import time
+import uuid
+
+from cache import LRUCache
+
+# -------------------------
+# Sessions REPL
+# -------------------------
+# Une session garde les variables d'un utilisateur entre deux envois de
+# code : seules les nouvelles instructions sont exécutées, sur l'état laissé
+# par les précédentes (Interpreter.run conserve les variables par nom).
+# L'état vit dans le processus API ; chaque envoi est exécuté dans un worker
+# avec ces variables (worker_pool.execute(..., variables=...)), qui renvoie
+# l'état suivant. Un job tué (timeout) laisse donc la session intacte.
+
+
+class SessionMemoryExceeded(RuntimeError):
+    """Les variables de la session dépassent la mémoire autorisée."""
+
+
+def variables_size(variables):
+    """Taille estimée (octets) des variables d'une session."""
+    return sum(sys.getsizeof(name) + sys.getsizeof(value) for name, value in variables.items())
+
+
+class Session:
+    def __init__(self, session_id, max_bytes=None):
+        self.id = session_id
+        self.variables = {}
+        self.max_bytes = max_bytes  # None : pas de limite propre à la session
+        self.size = sys.getsizeof(session_id)
+        self.last_used = time.monotonic()
+        self.lock = asyncio.Lock()  # un envoi à la fois (plusieurs connexions possibles)
+
+    def touch(self):
+        self.last_used = time.monotonic()
+
+    def update(self, variables):
+        """Remplace l'état ; SessionMemoryExceeded (état inchangé) s'il est trop gros."""
+        size = sys.getsizeof(self.id) + variables_size(variables)
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise SessionMemoryExceeded(
+                f"Session memory limit exceeded ({size} > {self.max_bytes} bytes): "
+                "variables kept from before this code")
+        self.variables = variables
+        self.size = size
+
+
+class SessionStore(LRUCache):
+    """Sessions actives (LRU) : bornées en nombre et en mémoire totale, et
+    fermées après `idle_timeout` secondes sans utilisation."""
+
+    def __init__(self, max_entries=1024, max_bytes=256 * 1024 * 1024, idle_timeout=600.0,
+                 session_max_bytes=16 * 1024 * 1024):
+        super().__init__(max_entries, max_bytes)
+        self.idle_timeout = idle_timeout
+        self.session_max_bytes = session_max_bytes
+        self.expired = 0
+
+    def open(self, session_id=None):
+        """(session, créée) : la session `session_id` si elle existe encore,
+        sinon une nouvelle (sous cet identifiant s'il est fourni)."""
+        self.evict_idle()
+        session = self.lookup(session_id) if session_id else None
+        if session is not None:
+            session.touch()
+            return session, False
+        session = Session(session_id or uuid.uuid4().hex, self.session_max_bytes)
+        self.put(session.id, session)
+        return session, True
+
+    def save(self, session):
+        """Range la session après une exécution (taille et récence à jour)."""
+        session.touch()
+        self.put(session.id, session)
+
+    def alive(self, session):
+        """La session est-elle toujours dans le store (ni évincée, ni expirée) ?"""
+        self.evict_idle()
+        with self.lock:
+            return self.entries.get(session.id) is session
+
+    def evict_idle(self):
+        deadline = time.monotonic() - self.idle_timeout
+        with self.lock:
+            idle = [key for key, session in self.entries.items() if session.last_used < deadline]
+            for key in idle:
+                self.bytes -= self.entries.pop(key).size
+            self.expired += len(idle)
+
+    def stats(self):
+        stats = super().stats()
+        stats["expired"] = self.expired
+        return stats
@@ -0,0 +1,93 @@
+# sinks.py
+
+import sys
+
+# -------------------------
+# Sorties des print (output sinks)
+# -------------------------
+# Chaque moteur écrit les valeurs affichées dans un sink : `write(value)` à
+# chaque print, `flush()` en fin d'exécution (même en cas d'erreur).
+# `values` est la liste retournée par Engine.run() : vide pour les sinks qui
+# ne conservent rien.
+#
+# Pour les sinks les plus utilisés, `write` est directement la méthode de la
+# liste ou le callback (pas d'appel Python intermédiaire dans la boucle).
+
+
+class CaptureSink:
+    """Conserve les valeurs en mémoire, sans rien écrire (API)."""
+
+    def __init__(self):
+        self.values = []
+        self.write = self.values.append
+
+    def flush(self):
+        pass
+
+
+class EchoSink:
+    """Conserve les valeurs et les affiche ligne par ligne (comportement historique)."""
+
+    def __init__(self, stream=None):
+        self.values = []
+        self.stream = stream  # None : sys.stdout au moment de l'écriture
+
+    def write(self, value):
+        self.values.append(value)
+        print(value, file=self.stream)
+
+    def flush(self):
+        pass
+
+
+class BufferedWriterSink:
+    """Écrit les valeurs dans un fichier texte (stdout par défaut) par gros blocs.
+
+    Une seule écriture (et un seul flush) par `buffer_size` caractères au lieu
+    d'un print par valeur ; les valeurs ne sont pas conservées.
+    """
+
+    def __init__(self, stream=None, buffer_size=64 * 1024):
+        self.values = []
+        self.stream = stream if stream is not None else sys.stdout
+        self.buffer_size = buffer_size
+        self.lines = []
+        self.pending = 0
+
+    def write(self, value):
+        line = str(value)
+        self.lines.append(line)
+        self.pending += len(line) + 1
+        if self.pending >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            self.stream.write("\n".join(self.lines) + "\n")
+            self.lines = []
+            self.pending = 0
+        self.stream.flush()
+
+
+class DiscardSink:
+    """Ignore toutes les valeurs (benchmarks, exécution pour les seules erreurs)."""
+
+    def __init__(self):
+        self.values = []
+
+    def write(self, value):
+        pass
+
+    def flush(self):
+        pass
+
+
+class CallbackSink:
+    """Transmet chaque valeur à `callback(value)` (streaming)."""
+
+    def __init__(self, callback):
+        self.values = []
+        self.write = callback
+
+    def flush(self):
+        pass
@@ -1,4 +1,10 @@
 # backend/tests/conftest.py
+import os, sys
+import pytest
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -11,3 +17,29 @@ def pytest_addoption(parser):
 def pytest_configure(config):
     # Make option accessible via config in tests
     config.update_golden = config.getoption("--update-golden")
+
+
+# -------------------------
+# API (app.py) : fixtures partagées
+# -------------------------
+# petit pool pour les tests (app.py lit ces variables à l'import) ; une valeur
+# déjà présente dans l'environnement est respectée
+API_ENV = {"PISC_WORKERS": "2", "PISC_TIMEOUT": "1"}
+
+
+@pytest.fixture(scope="session")
+def api():
+    """Module app.py, importé avec API_ENV ; l'environnement est restauré ensuite."""
+    pytest.importorskip("fastapi.testclient")
+    with pytest.MonkeyPatch.context() as mp:
+        for name, value in API_ENV.items():
+            mp.setenv(name, os.environ.get(name, value))
+        import app
+    return app
+
+
+@pytest.fixture(scope="module")
+def client(api):
+    from fastapi.testclient import TestClient
+    with TestClient(api.app) as client:  # lifespan : pool démarré puis fermé
+        yield client
@@ -0,0 +1,55 @@
+import os, sys
+import json
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+PROGRAMS = [
+    {"code": "x = 6 * 7\nprint(x)"},
+    {"code": "x = $ 1"},                               # erreur du lexer
+    {"code": "x = 1 2"},                               # erreur de syntaxe
+    {"code": "print(1 / 0)", "engine": "python"},      # erreur d'exécution
+    {"code": "while true { }", "max_steps": 1000},     # limite de pas
+    {"code": "print(1)", "engine": "nope"},            # moteur inconnu
+    {"code": "for i in range(3) { print(i) }", "engine": "vm"},
+]
+
+
+def test_batch_results_in_order(client):
+    body = client.post("/batch", json={"programs": PROGRAMS}).json()
+    results = body["results"]
+    assert results == [client.post("/parse-json", json=p).json() for p in PROGRAMS]
+    assert results[0]["output"] == [42]
+    assert results[1] == {"errors": ["Illegal character '$' at line 1, col 5"]}
+    assert results[2]["errors"][0].startswith("Syntax error")
+    assert results[3] == {"errors": ["Runtime error: Division by zero (line 1, col 1)"]}
+    assert results[4] == {"errors": ["Runtime error: Step limit exceeded (1000 steps) (line 1, col 1)"]}
+    assert results[6]["output"] == [0, 1, 2]
+    assert body["stats"]["programs"] == len(PROGRAMS)
+
+
+def test_batch_timeout_is_isolated(client):
+    programs = [{"code": "x = 0\nwhile true { x = x + 1 }", "max_steps": 10 ** 9},
+                {"code": "print(2)"}]
+    results = client.post("/batch", json={"programs": programs}).json()["results"]
+    assert results == [{"errors": ["Execution timed out after 1s"]},
+                       {"ast": results[1]["ast"], "output": [2], "message": "Analyse réussie"}]
+
+
+def test_batch_larger_than_the_pool(client, api):
+    # bien plus de programmes que de workers, plus de 1 s de calcul en tout pour un
+    # délai de 1 s par programme : aucun ne doit expirer en attendant son tour
+    restarts = api.get_pool().stats()["restarts"]
+    programs = [{"code": f"i = {n}\nwhile i < 50000 {{ i = i + 1 }}\nprint(i)"} for n in range(20)]
+    results = client.post("/batch", json={"programs": programs}).json()["results"]
+    assert [r.get("output") for r in results] == [[50000]] * 20
+    assert api.get_pool().stats()["restarts"] == restarts
+
+
+def test_batch_stream(client):
+    response = client.post("/batch", json={"programs": PROGRAMS, "stream": True})
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    results = [json.loads(data[len("data: "):]) for event, data in events if event == "event: result"]
+    assert sorted(r.pop("index") for r in results) == list(range(len(PROGRAMS)))
+    assert events[-1][0] == "event: done"
+    assert len(results) == len(PROGRAMS)
@@ -0,0 +1,138 @@
+import glob
+import os, sys
+import contextlib
+from io import StringIO
+import pytest
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from parser import parse_source
+from engines import ENGINES, get_engine
+from interpreter import Interpreter
+from budget import BudgetExceeded, Limits
+from worker_pool import execute
+
+BASE_DIR = os.path.dirname(__file__)
+SAMPLES_DIR = os.path.join(BASE_DIR, "samples")
+
+PROGRAMS = [
+    "x = 1\nprint(x)",
+    "i = 0\nwhile i < 5 { i = i + 1 }\nprint(i)",
+    "for i in range(4) { if i < 2 { print(i) } elseif i == 2 { print(-i) } else { x = i } }",
+    "n = 0\nfor i in range(3) { for j in range(3) { n = n + i * j } }\nprint(n)",
+    "x = 3\nif x == 1 { print(1) } elseif x == 2 { print(2) } elseif x == 3 { print(3) }",
+    "while false { print(1) }\nfor i in range(0) { print(i) }\nprint(\"fin\")",
+]
+
+
+def parse(code):
+    ast, errors = parse_source(code)
+    assert errors == []
+    return ast
+
+
+def run(engine, code, **limits):
+    """(sorties, message d'erreur ou None)."""
+    instance = get_engine(engine, **limits)
+    with contextlib.redirect_stdout(StringIO()):
+        try:
+            instance.run(parse(code))
+        except BudgetExceeded as e:
+            return instance.output, str(e)
+    return instance.output, None
+
+
+def steps_of(code):
+    interpreter = Interpreter(max_steps=10 ** 9)
+    with contextlib.redirect_stdout(StringIO()):
+        interpreter.run(parse(code))
+    return 10 ** 9 - interpreter.steps_left
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize("code", PROGRAMS)
+def test_steps_are_counted_identically(engine, code):
+    steps = steps_of(code)
+    expected, _ = run("tree", code)
+    assert run(engine, code, max_steps=steps) == (expected, None)
+
+    output, error = run(engine, code, max_steps=steps - 1)
+    assert error == f"Step limit exceeded ({steps - 1} steps)"
+    assert (output, error) == run("tree", code, max_steps=steps - 1)
+
+
+def test_step_definition():
+    # une instruction = un pas, un tour de boucle = un pas
+    assert steps_of("x = 1\nprint(x)") == 2
+    assert steps_of("i = 0\nwhile i < 3 { i = i + 1 }") == 1 + 1 + 3 * 2
+    assert steps_of("for i in range(2) { }") == 1 + 2
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_infinite_loop_stops(engine):
+    output, error = run(engine, "while true { }", max_steps=1000)
+    assert error == "Step limit exceeded (1000 steps)"
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_output_limit(engine):
+    # chaque print(i) écrit 2 caractères ("i\n")
+    code = "for i in range(10) { print(i) }"
+    output, error = run(engine, code, max_output=10)
+    assert error == "Output limit exceeded (10 characters)"
+    assert output == [0, 1, 2, 3, 4]
+    assert run(engine, code, max_output=20) == (list(range(10)), None)
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize("code", [
+    's = "ab"\nwhile true { s = s + s }',   # doublement de chaîne
+    's = "ab"\nwhile true { s = s * 2 }',
+    'x = 3\nwhile true { x = x * x }',      # entier qui explose
+    's = "' + "x" * 10 + '"' + ' + "xxxxxxxxxx"' * 200,  # longue chaîne de +
+])
+def test_value_size_limit(engine, code):
+    output, error = run(engine, code, max_value_size=1000)
+    assert error == "Value size limit exceeded (1000)"
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_value_size_checked_before_allocation(engine):
+    _, error = run(engine, 'print("x" * 1000000000000)', max_value_size=10 ** 6)
+    assert error == "Value size limit exceeded (1000000)"
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize("optimize", [True, False])
+def test_value_size_limit_with_optimizer(engine, optimize):
+    # concaténation calculée d'avance ou à l'exécution : même erreur
+    limits = Limits(max_value_size=5)
+    result = execute('print("abc" + "def")', engine, optimize, limits=limits)
+    assert str(result["exception"]) == "Value size limit exceeded (5)"
+    assert execute('print("ab" + "cde")', engine, optimize, limits=limits)["output"] == ["abcde"]
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize("source_file", glob.glob(os.path.join(SAMPLES_DIR, "*.pisc")))
+def test_samples_run_within_default_limits(engine, source_file):
+    with open(source_file, "r", encoding="utf-8") as f:
+        code = f.read()
+    ast, errors = parse_source(code)
+    if errors:
+        pytest.skip("lexer errors")
+    limited, plain = get_engine(engine, **Limits(10 ** 6, 10 ** 6, 10 ** 6).as_kwargs()), get_engine(engine)
+    with contextlib.redirect_stdout(StringIO()):
+        results = []
+        for instance in (limited, plain):
+            try:
+                results.append(instance.run(ast))
+            except RuntimeError as e:
+                results.append(str(e))
+    assert results[0] == results[1]
+
+
+def test_limits_capped():
+    server = Limits(1000, 500, None)
+    assert server.capped().key() == (1000, 500, None)
+    assert server.capped(max_steps=10, max_output=10 ** 9, max_value_size=7).key() == (10, 500, 7)
@@ -0,0 +1,168 @@
+import os, sys
+import pytest
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import cache
+from cache import ASTCache, ResultCache, source_hash, ast_hash
+from parser import ast_to_dict, parse_source, Program, Assign, UnaryOp, Number
+from engines import get_engine
+
+
+def count_parses(monkeypatch):
+    calls = []
+    def counting_parse(code, timings=None):
+        calls.append(code)
+        return parse_source(code, timings)
+    monkeypatch.setattr(cache, "parse_source", counting_parse)
+    return calls
+
+
+def test_repeated_source_is_parsed_once(monkeypatch):
+    calls = count_parses(monkeypatch)
+    c = ASTCache()
+    first = c.get("x = 1 + 2\nprint(x)")
+    second = c.get("x = 1 + 2\nprint(x)")
+    assert len(calls) == 1
+    assert first[0] is second[0] and first[1] is second[1]
+    assert c.stats()["hits"] == 1 and c.stats()["misses"] == 1
+
+
+def test_program_is_optimized_and_ast_is_not():
+    ast, program, errors = ASTCache().get("x = 1 + 2")
+    assert errors == []
+    assert ast_to_dict(ast.statements[0].expr) == {"BinOp": {
+        "left": {"Number": {"value": 1}}, "op": "+", "right": {"Number": {"value": 2}}}}
+    assert ast_to_dict(program.statements[0].expr) == {"Number": {"value": 3}}
+
+    ast, program, _ = ASTCache().get("x = 1 + 2", optimize=False)
+    assert program is ast
+
+
+def test_flags_are_part_of_the_key(monkeypatch):
+    calls = count_parses(monkeypatch)
+    c = ASTCache()
+    c.get("x = 1", optimize=True)
+    c.get("x = 1", optimize=False)
+    c.get("x = 1", optimize=True, cse=True)
+    assert len(calls) == 3
+
+
+def test_errors_are_cached(monkeypatch):
+    calls = count_parses(monkeypatch)
+    c = ASTCache()
+    for _ in range(3):
+        _, _, errors = c.get("x = $ 1")
+        assert errors == ["Illegal character '$' at line 1, col 5"]
+        with pytest.raises(SyntaxError, match="Syntax error at token 'NUMBER'"):
+            c.get("x = 1 2")
+    assert len(calls) == 2
+
+
+def test_lru_eviction_by_entries():
+    c = ASTCache(max_entries=2)
+    c.get("a = 1")
+    c.get("b = 2")
+    c.get("a = 1")          # a devient le plus récent
+    c.get("c = 3")          # évince b
+    keys = {key[0] for key in c.entries}
+    assert keys == {source_hash("a = 1"), source_hash("c = 3")}
+    assert c.stats()["evictions"] == 1
+
+
+def test_eviction_by_bytes():
+    small = "x = 1"
+    big = "\n".join(f"v{i} = v{i} + {i}" for i in range(200))
+    c = ASTCache(max_bytes=10_000)
+    c.get(small)
+    size_small = c.stats()["bytes"]
+    c.get(big)   # trop gros : jamais gardé
+    assert c.stats()["bytes"] == size_small and c.stats()["entries"] == 1
+
+    c = ASTCache(max_bytes=size_small * 2 + 1)
+    for code in ("x = 1", "y = 2", "z = 3"):
+        c.get(code)
+    assert c.stats()["entries"] == 2 and c.stats()["bytes"] <= c.max_bytes
+
+
+# -------------------------
+# Cache des résultats
+# -------------------------
+def key_of(code):
+    return ast_hash(parse_source(code)[0])
+
+
+def test_ast_hash_ignores_formatting_and_comments():
+    assert key_of("x = 1 + 2\nprint(x)") == key_of("# calcul\nx   =   1+2\n\n  print( x )")
+    assert key_of("x = 1 + 2") != key_of("x = 2 + 1")
+    assert key_of("x = 1") != key_of("x = 1.0")
+    assert key_of("x = 1") != key_of('x = "1"')
+    assert key_of("x = a") != key_of('x = "a"')
+
+
+def test_ast_hash_of_deep_tree_does_not_recurse():
+    # plus profond que ce que les parsers acceptent (MAX_NESTING) : arbre construit à la main
+    expr = Number(1)
+    for _ in range(5000):
+        expr = UnaryOp("-", expr)
+    assert len(ast_hash(Program([Assign("x", expr)]))) == 64
+
+
+def run(results, code):
+    """Comme app.run_program : sorties depuis le cache, sinon exécutées puis mémorisées."""
+    ast, _ = parse_source(code)
+    key = ast_hash(ast)
+    entry = results.lookup(key)
+    if entry is not None:
+        return entry.unpack()
+    try:
+        output = get_engine("tree").run(ast)
+    except Exception as e:
+        results.store(key, error=e)
+        raise
+    results.store(key, output)
+    return output
+
+
+def test_results_are_memoized(capsys):
+    results = ResultCache()
+    for _ in range(3):
+        assert run(results, "i = 0\nwhile i < 100 { i = i + 1 }\nprint(i)") == [100]
+    assert results.stats()["hits"] == 2 and results.stats()["entries"] == 1
+
+
+def test_runtime_errors_are_memoized(capsys):
+    results = ResultCache()
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="Division by zero"):
+            run(results, "print(1)\nprint(1 / 0)")
+        with pytest.raises(NameError, match="Variable 'y' not defined"):
+            run(results, "print(y)")
+    assert results.stats()["hits"] == 2 and results.stats()["entries"] == 2
+
+
+def test_resource_errors_are_not_memoized():
+    results = ResultCache()
+    results.store("key", error=RecursionError("maximum recursion depth exceeded"))
+    assert results.lookup("key") is None and results.stats()["entries"] == 0
+
+
+def test_results_evicted_by_output_size(capsys):
+    results = ResultCache(max_bytes=2000)
+    for n in range(5):
+        run(results, f'print("{"x" * 600}{n}")')
+    stats = results.stats()
+    assert stats["bytes"] <= 2000 and stats["evictions"] >= 3
+
+
+# -------------------------
+# API : clé du cache des résultats
+# -------------------------
+def test_api_result_depends_on_passes(client):
+    # l'optimiseur supprime le test du if : un pas de moins
+    request = {"code": "if true { x = 1 }\nprint(x)  # passes", "max_steps": 2}
+    for _ in range(2):
+        assert client.post("/parse-json", json={**request, "optimize": True}).json()["output"] == [1]
+        assert client.post("/parse-json", json={**request, "optimize": False}).json() == \
+            {"errors": ["Runtime error: Step limit exceeded (2 steps) (line 2, col 1)"]}
@@ -0,0 +1,94 @@
+import glob
+import json
+import os, sys
+import contextlib
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from lexer import lexer_errors
+from parser import parse_source, ast_to_dict, thread_parser
+from engines import ENGINES, get_engine
+
+BASE_DIR = os.path.dirname(__file__)
+SAMPLES_DIR = os.path.join(BASE_DIR, "samples")
+
+
+def load_golden(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_samples():
+    samples = []
+    for source_file in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pisc"))):
+        with open(source_file, "r", encoding="utf-8") as f:
+            code = f.read()
+        samples.append({
+            "name": os.path.basename(source_file),
+            "code": code,
+            "ast": load_golden(source_file.replace(".pisc", ".ast.json")),
+            "ast_errors": load_golden(source_file.replace(".pisc", ".ast.errors.json")),
+            "run": load_golden(source_file.replace(".pisc", ".run.json")),
+            "run_errors": load_golden(source_file.replace(".pisc", ".run.errors.json")),
+        })
+    return samples
+
+
+def check_sample(sample, engine):
+    """Parse + exécute un exemple ; retourne la liste des écarts avec ses goldens."""
+    try:
+        ast, errors = parse_source(sample["code"])
+    except SyntaxError as e:
+        return [] if str(e) in sample["ast_errors"] else [f"syntax error {e}"]
+    if errors:
+        return [] if errors == sample["ast_errors"] else [f"lexer errors {errors}"]
+    if ast_to_dict(ast) != sample["ast"]:
+        return ["AST mismatch"]
+
+    try:
+        output = get_engine(engine).run(ast)
+    except RuntimeError as e:
+        return [] if [str(e)] == sample["run_errors"] else [f"runtime error {e}"]
+    lines = [str(value) for value in output]
+    return [] if lines == sample["run"] else [f"output {lines}"]
+
+
+def test_parse_source_does_not_touch_global_state():
+    lexer_errors.clear()
+    ast, errors = parse_source("x = 1 $\ny = @ 2")
+    assert errors == [
+        "Illegal character '$' at line 1, col 7",
+        "Illegal character '@' at line 2, col 5",
+    ]
+    assert lexer_errors == []
+
+    # un nouvel appel repart de la ligne 1 avec une liste vide
+    _, errors = parse_source("\n\nx = $ 1")
+    assert errors == ["Illegal character '$' at line 3, col 5"]
+
+
+def test_thread_parser_is_per_thread():
+    main_parser = thread_parser()
+    assert thread_parser() is main_parser
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        parsers = list(pool.map(lambda _: thread_parser(), range(50)))
+    assert all(p is not main_parser for p in parsers)
+
+
+def test_concurrent_programs_match_goldens():
+    samples = load_samples()
+    engines = sorted(ENGINES)
+    jobs = [(samples[i % len(samples)], engines[i % len(engines)]) for i in range(600)]
+
+    with contextlib.redirect_stdout(StringIO()):
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda job: check_sample(*job), jobs))
+
+    failures = [(sample["name"], engine, problems)
+                for (sample, engine), problems in zip(jobs, results) if problems]
+    assert failures == []
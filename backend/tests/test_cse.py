@@ -0,0 +1,89 @@
+import pytest
+import os, sys
+import contextlib
+from io import StringIO
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from lexer import lexer, lexer_errors
+from parser import parser, parse_source, Let, Var
+from cse import eliminate_common_subexpressions
+from engines import ENGINES, get_engine
+from program_generator import generate
+
+
+def parse_code(source):
+    lexer_errors.clear()
+    lexer.lineno = 1
+    return parser.parse(source, lexer=lexer)
+
+
+def run(program, engine="tree"):
+    try:
+        with contextlib.redirect_stdout(StringIO()):
+            return get_engine(engine).run(program)
+    except (RuntimeError, NameError) as e:
+        return f"{type(e).__name__}: {e}"
+
+
+PROGRAMS = [
+    "a = 2\nb = 3\nx = (a + b) * 2\ny = (a + b) * 3\nprint(x + y)",
+    "a = 1\nb = 2\nx = a + b\na = 10\ny = a + b\nprint(x)\nprint(y)",
+    "a = 4\nprint((a * a) + (a * a) - (a * a))",
+    "i = 0\nt = 0\nwhile i < 5 {\n t = t + (i * 2) + (i * 2)\n i = i + 1\n}\nprint(t)",
+    "a = 1\nif (a + 1) > 1 {\n print(a + 1)\n} else {\n print(0)\n}",
+    "a = 0\nprint(1 / a)\nprint(1 / a)",
+    "print((b + 1) * (b + 1))",
+]
+
+
+def test_parser_interns_identical_subtrees():
+    program = parse_code("x = a + b\ny = a + b\nz = \"s\"\nw = \"s\"")
+    first, second, third, fourth = program.statements
+    assert first.expr is second.expr
+    assert first.expr.left is second.expr.left
+    assert third.expr is fourth.expr
+    # les instructions ne sont jamais partagées
+    assert first is not second
+
+
+def test_parser_interning_distinguishes_types():
+    program = parse_code("x = 1\ny = 1.0\nz = true")
+    values = [stmt.expr for stmt in program.statements]
+    assert len({id(v) for v in values}) == 3
+
+
+def test_cse_reuses_expression_within_block():
+    program = eliminate_common_subexpressions(parse_code(PROGRAMS[0]))
+    _, _, x, y, _ = program.statements
+    assert isinstance(x.expr.left, Let)
+    assert isinstance(y.expr.left, Var) and y.expr.left.name == x.expr.left.name
+
+
+def test_cse_invalidated_by_assignment():
+    program = eliminate_common_subexpressions(parse_code(PROGRAMS[1]))
+    assert not any(isinstance(stmt.expr, Let) for stmt in program.statements if hasattr(stmt, "expr"))
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize("source", PROGRAMS)
+def test_cse_preserves_results(source, engine):
+    ast = parse_code(source)
+    expected = run(ast)
+    assert run(eliminate_common_subexpressions(ast), engine) == expected
+    # l'AST d'origine reste exécutable tel quel
+    assert run(ast, engine) == expected
+
+
+@pytest.mark.parametrize("code", [
+    generate("elif_chain", 3000),
+    generate("expression_chain", 5000),
+    # sous-expression commune à deux longues chaînes
+    "a = 1\nx = " + " + ".join(["a"] * 3000) + "\ny = " + " + ".join(["a"] * 3000) + " + 1\nprint(y - x)",
+])
+def test_cse_long_chains(code):
+    """Chaînes elseif et opérateurs associatifs à gauche parcourus sans récursion."""
+    program = parse_source(code)[0]
+    rewritten = eliminate_common_subexpressions(program)
+    assert run(rewritten) == run(program)
@@ -0,0 +1,163 @@
+import glob
+import json
+import pytest
+import os, sys
+import contextlib
+from io import StringIO
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from lexer import lexer, lexer_errors, LineIndex
+from parser import parser, parse_source
+from engines import ENGINES, get_engine
+from optimizer import optimize
+from cse import eliminate_common_subexpressions
+from sinks import CaptureSink, BufferedWriterSink, DiscardSink, CallbackSink
+from program_generator import generate
+
+BASE_DIR = os.path.dirname(__file__)
+SAMPLES_DIR = os.path.join(BASE_DIR, "samples")
+
+
+# Passes d'AST appliquées avant l'exécution
+PIPELINES = {
+    "plain": [],
+    "optimized": [optimize],
+    "cse": [eliminate_common_subexpressions],
+    "optimized+cse": [optimize, eliminate_common_subexpressions],
+}
+
+
+def run_with_engine(source: str, engine: str, pipeline: str = "plain"):
+    """Parse et exécute le code avec le moteur demandé ; capture sortie console, liste et erreurs."""
+    lexer_errors.clear()
+    lexer.lineno = 1
+
+    stdout = StringIO()
+    output = None
+    errors = []
+
+    try:
+        ast = parser.parse(source, lexer=lexer)
+        for transform in PIPELINES[pipeline]:
+            ast = transform(ast)
+        interpreter = get_engine(engine)
+        with contextlib.redirect_stdout(stdout):
+            output = interpreter.run(ast)
+    except RuntimeError as e:
+        errors.append(str(e))
+
+    return stdout.getvalue().splitlines(), output, errors
+
+
+@pytest.mark.parametrize("pipeline", PIPELINES)
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize("source_file", glob.glob(os.path.join(SAMPLES_DIR, "*.pisc")))
+def test_engine_against_golden(source_file, engine, pipeline):
+    run_file = source_file.replace(".pisc", ".run.json")
+    err_file = source_file.replace(".pisc", ".run.errors.json")
+
+    with open(source_file, "r", encoding="utf-8") as f:
+        code = f.read()
+
+    lines, output, errors = run_with_engine(code, engine, pipeline)
+
+    if errors:
+        with open(err_file, "r", encoding="utf-8") as f:
+            expected_errors = json.load(f)
+        assert errors == expected_errors, f"Runtime error mismatch for {source_file} ({engine}, {pipeline})"
+    else:
+        with open(run_file, "r", encoding="utf-8") as f:
+            expected_output = json.load(f)
+        assert lines == expected_output, f"Output mismatch for {source_file} ({engine}, {pipeline})"
+
+        # La liste retournée doit être identique à celle de l'interpréteur historique
+        _, reference, _ = run_with_engine(code, "tree")
+        assert output == reference, f"Returned output mismatch for {source_file} ({engine}, {pipeline})"
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize("code, message", [
+    ("print(x)", "Variable 'x' not defined"),
+    ("a = 1\nwhile a < 3 {\n a = a + 1\n}\nprint(b)", "Variable 'b' not defined"),
+])
+def test_engine_undefined_variable(code, message, engine):
+    lexer_errors.clear()
+    lexer.lineno = 1
+    ast = parser.parse(code, lexer=lexer)
+    with pytest.raises(NameError, match=message):
+        with contextlib.redirect_stdout(StringIO()):
+            get_engine(engine).run(ast)
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        get_engine("nope")
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_engine_callback_sink(engine):
+    lexer_errors.clear()
+    lexer.lineno = 1
+    ast = parser.parse('for i in range(3) { print(i * 2) }\nprint("fin")', lexer=lexer)
+    received = []
+    stdout = StringIO()
+    with contextlib.redirect_stdout(stdout):
+        output = get_engine(engine, sink=CallbackSink(received.append)).run(ast)
+    assert received == [0, 2, 4, "fin"]
+    assert output == []  # rien n'est accumulé
+    assert stdout.getvalue() == ""
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize("limited", [False, True])
+def test_engine_sinks(engine, limited):
+    lexer_errors.clear()
+    lexer.lineno = 1
+    ast = parser.parse('for i in range(3) { print(i * 2) }\nprint("fin")', lexer=lexer)
+    limits = {"max_steps": 100, "max_output": 100, "max_value_size": 100} if limited else {}
+    stdout = StringIO()
+    with contextlib.redirect_stdout(stdout):
+        assert get_engine(engine, **limits, sink=CaptureSink()).run(ast) == [0, 2, 4, "fin"]
+        assert get_engine(engine, **limits, sink=DiscardSink()).run(ast) == []
+        assert stdout.getvalue() == ""  # capture et discard n'écrivent rien
+
+        written = StringIO()
+        get_engine(engine, **limits, sink=BufferedWriterSink(written)).run(ast)
+        assert written.getvalue() == "0\n2\n4\nfin\n"  # vidé en fin d'exécution
+        assert get_engine(engine, **limits).run(ast) == [0, 2, 4, "fin"]
+    assert stdout.getvalue() == "0\n2\n4\nfin\n"  # défaut : affichage console
+
+
+LOCATED_ERRORS = [
+    ('x = 1\nwhile x < 3 {\n  x = x + 1\n}\nif x > 5 { print(1) }\n'
+     'elseif x > 1 {\n  print("a")\n  print(x / 0)\n}', (8, 3)),
+    ("a = 1\nfor i in range(2) {\n  if i == 1 {\n    b = a + c\n  }\n}", (4, 5)),
+    ('x = 2\nif x == 1 { print(1) } elseif x == 2 { print(-"s") }', (2, 40)),
+]
+
+
+@pytest.mark.parametrize("pipeline", PIPELINES)
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize("code, location", LOCATED_ERRORS)
+def test_runtime_error_location(code, location, engine, pipeline):
+    lexer_errors.clear()
+    lexer.lineno = 1
+    ast = parser.parse(code, lexer=lexer)
+    for transform in PIPELINES[pipeline]:
+        ast = transform(ast)
+    with pytest.raises(Exception) as info:
+        get_engine(engine, sink=CaptureSink()).run(ast)
+    assert LineIndex(code).location(info.value.pisc_pos) == location
+
+
+@pytest.mark.parametrize("shape, size", [
+    ("elif_chain", 3000), ("expression_chain", 5000), ("string_concat", 5000),
+])
+def test_vm_compiles_long_chains(shape, size):
+    """Chaînes elseif et opérateurs associatifs à gauche compilés sans récursion."""
+    program = parse_source(generate(shape, size))[0]
+    expected = get_engine("tree", sink=CaptureSink()).run(program)
+    assert get_engine("vm", max_steps=10 ** 6, max_value_size=10 ** 6,
+                      sink=CaptureSink()).run(program) == expected
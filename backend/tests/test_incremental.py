@@ -0,0 +1,140 @@
+import glob
+import random
+import pytest
+import os, sys
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from parser import parse_source, ast_to_dict
+from incremental import Document, apply_changes, common_affixes
+from engines import get_engine
+from sinks import CaptureSink
+
+BASE_DIR = os.path.dirname(__file__)
+SAMPLES_DIR = os.path.join(BASE_DIR, "samples")
+
+SAMPLES = []
+for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pisc"))):
+    with open(path, "r", encoding="utf-8") as f:
+        SAMPLES.append(f.read())
+
+# Morceaux insérés au hasard : instructions entières, débuts/fins de bloc,
+# tokens isolés (souvent invalides) et caractères illégaux
+PIECES = ["x = 1\n", "print(x)\n", "if x > 1 {\n", "}\n", "} else {\n", "} elseif y {",
+          " y = x * 2\n", "while x < 3 { x = x + 1 }\n", "for i in range(3) { print(i) }\n",
+          "# c\n", '"s\n"', "=", "==", "$", "(", ")", "-", "\n", " ", "z", "2", "{", "}", "a = b\n"]
+
+
+def positions(node, found):
+    """[(type, _pos)] de toutes les instructions (ast_to_dict ignore `_pos`)."""
+    if isinstance(node, list):
+        for child in node:
+            positions(child, found)
+    elif hasattr(node, "__slots__"):
+        if hasattr(node, "_pos"):
+            found.append((type(node).__name__, node._pos))
+        for field in node.__slots__:
+            if not field.startswith("_"):
+                positions(getattr(node, field, None), found)
+    return found
+
+
+def outcome(parse, text):
+    try:
+        ast, errors = parse(text)
+        return ast_to_dict(ast), list(errors), positions(ast.statements, [])
+    except SyntaxError as e:
+        return f"SyntaxError: {e}"
+
+
+def test_random_edits_match_full_reparse():
+    rng = random.Random(0)
+    for _ in range(80):
+        document = Document()
+        text = rng.choice(SAMPLES)
+        for _ in range(25):
+            assert outcome(document.parse, text) == outcome(parse_source, text), text
+            start = rng.randint(0, len(text))
+            end = min(len(text), start + rng.choice([0, 0, 1, 3, 10]))
+            insert = "".join(rng.choice(PIECES) for _ in range(rng.choice([0, 1, 1, 2])))
+            text = text[:start] + insert + text[end:]
+
+
+def numbered_program(count):
+    return "".join(f"x{i} = {i} * 2\nif x{i} > 3 {{\n  print(x{i})\n}}\n" for i in range(count))
+
+
+def test_only_touched_statements_are_reparsed():
+    document = Document()
+    text = numbered_program(200)
+    before, _ = document.parse(text)
+
+    # ajout en fin de document : les instructions existantes sont réutilisées
+    text += "print(x3)\n"
+    after, _ = document.parse(text)
+    assert document.reparsed <= 3
+    assert all(a is b for a, b in zip(before.statements[:-2], after.statements))
+
+    # modification au milieu : décalées, les instructions suivantes gardent
+    # leurs expressions et reçoivent leur nouvelle position
+    middle = text.index("x100 = 100")
+    edited = text[:middle] + "print(-1)\n" + text[middle:]
+    ast, _ = document.parse(edited)
+    assert document.reparsed <= 3
+    assert ast.statements[-2].condition is after.statements[-2].condition
+    assert outcome(document.parse, edited) == outcome(parse_source, edited)
+
+
+def test_document_versions_share_slots():
+    document = Document()
+    first, _ = document.parse("a = 1\nb = a + 1\nprint(b)\n")
+    second, _ = document.parse("c = 5\na = 1\nb = a + 1\nprint(b + c)\n")
+    document.resolve(second)
+    document.resolve(first)  # sous-arbres communs : mêmes slots dans les deux versions
+    for program, expected in [(first, [2]), (second, [7])]:
+        assert get_engine("tree", sink=CaptureSink()).run(program) == expected
+
+
+def test_long_elseif_chain_is_moved_without_recursion():
+    chain = "a = 9\nif a == 0 { print(0) }\n" + \
+        "".join(f"elseif a == {i} {{ print({i}) }}\n" for i in range(1, 2000))
+    document = Document()
+    document.parse(chain)
+    edited = "print(1)\n" + chain  # segments suivants décalés
+    program, errors = document.parse(edited)
+    assert errors == [] and document.reparsed <= 2
+    assert get_engine("tree", sink=CaptureSink()).run(program) == [1, 9]
+
+    def last_branch(program):
+        stmt = program.statements[-1]
+        while stmt.else_branch:
+            stmt = stmt.else_branch[0]
+        return stmt
+    assert last_branch(program)._pos == last_branch(parse_source(edited)[0])._pos
+
+
+def test_apply_changes_and_affixes():
+    assert apply_changes("x = 1\nprint(x)", [(4, 5, "42"), (0, 0, "# a\n")]) == "# a\nx = 42\nprint(x)"
+    with pytest.raises(ValueError, match="Invalid change range"):
+        apply_changes("x = 1", [(3, 9, "")])
+    assert common_affixes("abcxyz", "abcQxyz") == (3, 3)
+    assert common_affixes("aaaa", "aa") == (2, 0)
+
+
+# -------------------------
+# API : document + changes
+# -------------------------
+def test_parse_json_with_document_changes(client):
+    code = "x = 2\nprint(x * 3)\n"
+    body = client.post("/parse-json", json={"code": code, "document": "doc-1"}).json()
+    assert body["output"] == [6], body
+
+    changes = [{"from": 4, "to": 5, "insert": "5"}, {"from": 18, "to": 18, "insert": "print(x)\n"}]
+    body = client.post("/parse-json", json={"document": "doc-1", "changes": changes}).json()
+    assert body["output"] == [15, 5]
+    assert body == client.post("/parse-json", json={"code": "x = 5\nprint(x * 3)\nprint(x)\n"}).json()
+
+    body = client.post("/parse-json", json={"document": "nope", "changes": []}).json()
+    assert body == {"errors": ["Unknown document 'nope': send the full code"]}
+    assert client.post("/parse-json", json={}).json() == {"errors": ["No code provided"]}
@@ -3,6 +3,8 @@ import json
 import pytest
 import sys
 import os
+import contextlib
+from io import StringIO
 
 # Ensure the backend directory is in sys.path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -60,3 +62,19 @@ def test_interpreter_against_golden(source_file, request):
             with open(run_file, "r", encoding="utf-8") as f:
                 expected_output = json.load(f)
             assert output == expected_output, f"Output mismatch for {source_file}"
+
+
+def test_interpreter_keeps_variables_between_runs():
+    """Les slots sont propres à chaque programme, mais les variables survivent par nom."""
+    interpreter = Interpreter()
+    with contextlib.redirect_stdout(StringIO()):
+        interpreter.run(parser.parse("a = 2\nb = 3", lexer=lexer))
+        output = interpreter.run(parser.parse("c = b * a\nprint(c)", lexer=lexer))
+    assert output == [6]
+
+
+def test_interpreter_read_before_write():
+    interpreter = Interpreter()
+    with pytest.raises(NameError, match="Variable 'x' not defined"):
+        with contextlib.redirect_stdout(StringIO()):
+            interpreter.run(parser.parse("y = 1\nprint(x)\nx = 2", lexer=lexer))
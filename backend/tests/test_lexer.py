@@ -1,5 +1,6 @@
 import json
 import glob
+import random
 import pytest
 import sys
 import os
@@ -7,7 +8,8 @@ import os
 # Ensure the backend directory is in sys.path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from lexer import lexer, lexer_errors
+from lexer import lexer, lexer_errors, LineIndex, new_lexer
+from scanner import scan
 
 # Base directory = directory of this file
 BASE_DIR = os.path.dirname(__file__)
@@ -48,3 +50,66 @@ def test_lexer_against_golden(source_file, request):
                 expected = json.load(f)
             assert lexer_errors == []
             assert tokens == [tuple(e) for e in expected], f"Token mismatch in {source_file}"
+
+
+# -------------------------
+# Scanner colonnaire (scanner.py) : mêmes tokens et mêmes erreurs que PLY
+# -------------------------
+@pytest.mark.parametrize("source_file", glob.glob(os.path.join(SAMPLES_DIR, "*.pisc")))
+def test_scanner_against_golden(source_file):
+    with open(source_file, "r", encoding="utf-8") as f:
+        code = f.read()
+
+    buffer = scan(code)
+    error_file = source_file.replace(".pisc", ".errors.json")
+    if buffer.errors:
+        with open(error_file, "r") as f:
+            assert buffer.errors == json.load(f)
+    else:
+        with open(source_file.replace(".pisc", ".json"), "r", encoding="utf-8") as f:
+            expected = json.load(f)
+        assert buffer.pairs() == [tuple(e) for e in expected]
+
+def test_scanner_positions_match_ply():
+    pieces = list('ab_09 \t\n"\\.+-*/=<>!(){};,:#?$') + ["if", "elseif", "print", "1.5", "==", '"x"']
+    rng = random.Random(0)
+    for _ in range(2000):
+        code = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+        expected = [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in ply_tokens(code)]
+        buffer = scan(code)
+        assert [(buffer.type(i), buffer.value(i), buffer.lines[i], buffer.starts[i])
+                for i in range(len(buffer))] == expected, code
+        assert buffer.errors == lexer_errors, code
+
+def ply_tokens(code):
+    lexer_errors.clear()
+    lexer.lineno = 1
+    lexer.input(code)
+    return list(lexer)
+
+def test_line_index_locations():
+    source = "ab\n\ncd\n"
+    index = LineIndex(source)
+    assert [index.location(pos) for pos in range(len(source) + 1)] == [
+        (1, 1), (1, 2), (1, 3), (2, 1), (3, 1), (3, 2), (3, 3), (4, 1)]
+    assert LineIndex("").location(0) == (1, 1)
+
+def test_line_index_is_kept_by_its_owner():
+    first, second = new_lexer(), new_lexer()
+    for lexer_, code in ((first, "a = $\nb = $"), (second, "c = 1\n$"), (first, "a = $\nb = $")):
+        lexer_.input(code)
+        list(lexer_)
+    assert first.errors == ["Illegal character '$' at line 1, col 5",
+                            "Illegal character '$' at line 2, col 5"] * 2
+    assert second.errors == ["Illegal character '$' at line 2, col 1"]
+    assert first.line_index.source is not second.line_index.source
+    buffer = scan("x = $ 1 $")
+    assert buffer.errors[1] == "Illegal character '$' at line 1, col 9"
+    assert buffer.line_index.source is buffer.source
+
+
+def test_errors_after_multiline_string_have_exact_line():
+    code = 'x = "a\nb"\ny = $'
+    ply_tokens(code)
+    assert lexer_errors == ["Illegal character '$' at line 3, col 5"]
+    assert scan(code).errors == lexer_errors
@@ -0,0 +1,112 @@
+import os, sys
+import glob
+import pytest
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import parser as parser_module
+from parser import parse_source
+from metrics import Counter, Histogram, exposition
+
+SAMPLES = os.path.join(os.path.dirname(__file__), "samples")
+
+
+def test_timed_parse_gives_the_same_result():
+    programs = [open(path, encoding="utf-8").read()
+                for path in sorted(glob.glob(os.path.join(SAMPLES, "*.pisc")))]
+    for code in programs + ["x = $ 1\nprint(x) @", "x = (1 +\n"]:
+        timings = {}
+        try:
+            expected = parse_source(code)
+        except SyntaxError as e:
+            with pytest.raises(SyntaxError, match=str(e)):
+                parse_source(code, timings)
+        else:
+            ast, errors = parse_source(code, timings)
+            assert (str(ast), errors) == (str(expected[0]), expected[1])
+        assert set(timings) == {"lex", "parse"} and min(timings.values()) >= 0
+
+
+def test_timed_parse_lexes_on_demand(monkeypatch):
+    if parser_module.PARSER_BACKEND == "pratt":
+        pytest.skip("le parser de Pratt lit un TokenBuffer complet")
+    lexers, new_lexer = [], parser_module.new_lexer
+    monkeypatch.setattr(parser_module, "new_lexer", lambda: lexers.append(new_lexer()) or lexers[-1])
+    code = "x = (1 +\n" + "print(1)\n" * 10_000
+    with pytest.raises(SyntaxError):
+        parse_source(code, {})
+    assert lexers[0].lexpos < 100  # arrêté à l'erreur, pas de lexing d'avance
+
+
+def test_exposition_format():
+    histogram = Histogram("t_seconds", "Test durations", ("phase",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "lex")
+    counter = Counter("t_total", "Test counter", ("kind",))
+    counter.inc('say "hi"\n', amount=2)
+    assert exposition([histogram, counter]) == """\
+# HELP t_seconds Test durations
+# TYPE t_seconds histogram
+t_seconds_bucket{phase="lex",le="0.1"} 2
+t_seconds_bucket{phase="lex",le="1.0"} 3
+t_seconds_bucket{phase="lex",le="+Inf"} 4
+t_seconds_sum{phase="lex"} 3.65
+t_seconds_count{phase="lex"} 4
+# HELP t_total Test counter
+# TYPE t_total counter
+t_total{kind="say \\"hi\\"\\n"} 2
+"""
+
+
+# -------------------------
+# API : /metrics
+# -------------------------
+def scrape(client):
+    """{'nom{labels}': valeur} des échantillons publiés par /metrics."""
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_metrics_endpoint(client):
+    before = scrape(client)
+    code = "x = 0\nfor i in range(50) { x = x + i }\nprint(x)  # metrics"
+    responses = [client.post("/parse-json", json={"code": code}) for _ in range(2)]  # 2e : cache
+    responses.append(client.post("/parse-json", json={"code": "x = (1"}))
+    responses.append(client.post("/parse-json", json={"code": "print(1 / 0)  # metrics"}))
+    responses.append(client.post("/parse-json", json={"code": "while true { }", "max_steps": 10}))
+    responses.append(client.post("/parse-json", json={"code": "print(1)", "engine": "nope"}))
+    responses.append(client.post("/parse", data={"code": "print(2)  # metrics"}))
+    assert responses[0].json()["output"] == [1225] and responses[-1].text == "2"
+    after = scrape(client)
+
+    def delta(sample):
+        return after.get(sample, 0) - before.get(sample, 0)
+
+    json_phase = 'pisc_phase_seconds_count{{endpoint="/parse-json",phase="{}"}}'
+    assert delta(json_phase.format("serialize")) == 6
+    assert delta(json_phase.format("execute")) == 3   # succès, division par zéro, limite
+    assert delta(json_phase.format("lex")) == delta(json_phase.format("parse")) == 4
+    assert delta('pisc_phase_seconds_count{endpoint="/parse",phase="execute"}') == 1
+    assert delta('pisc_request_seconds_count{endpoint="/parse-json"}') == 6
+    assert delta('pisc_request_seconds_bucket{endpoint="/parse-json",le="+Inf"}') == 6
+
+    for kind in ("syntax", "runtime", "limit", "invalid"):
+        assert delta(f'pisc_errors_total{{endpoint="/parse-json",kind="{kind}"}}') == 1
+    assert delta('pisc_received_bytes_total{endpoint="/parse-json"}') == \
+        2 * len(code) + len("x = (1") + len("print(1 / 0)  # metrics") + len("while true { }") + len("print(1)")
+    assert delta('pisc_sent_bytes_total{endpoint="/parse-json"}') == \
+        sum(len(r.content) for r in responses[:-1])
+    assert delta('pisc_sent_bytes_total{endpoint="/parse"}') == 1
+    assert delta('pisc_cache_hits_total{cache="results"}') == 1
+    # caches d'AST des workers : chaque source exécuté dans un worker est nouveau
+    assert delta('pisc_cache_misses_total{cache="ast"}') == 5
+    assert delta('pisc_cache_hits_total{cache="ast"}') == 0
+    assert after['pisc_cache_entries{cache="ast"}'] >= 5
+    assert 'pisc_cache_evictions_total{cache="ast"}' in after
@@ -0,0 +1,110 @@
+import pytest
+import os, sys
+import contextlib
+from io import StringIO
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from lexer import lexer, lexer_errors
+from parser import parser, ast_to_dict, parse_source
+from optimizer import optimize
+from interpreter import Interpreter
+from sinks import CaptureSink
+from program_generator import generate
+
+
+def parse_code(source):
+    lexer_errors.clear()
+    lexer.lineno = 1
+    return parser.parse(source, lexer=lexer)
+
+
+def optimized_dict(source):
+    return ast_to_dict(optimize(parse_code(source)))
+
+
+@pytest.mark.parametrize("source, expected", [
+    ("a = 2 + 3 * 4", "a = 14"),
+    ("a = 10 - -(1 + 1)", "a = 12"),
+    ("a = \"Hello \" + \"World\"", "a = \"Hello World\""),
+    ("a = 1 < 2", "a = true"),
+    ("a = null == null", "a = true"),
+    ("a = b + 2 * 3", "a = b + 6"),
+    ("if true { a = 1 } else { a = 2 }", "a = 1"),
+    ("if 1 > 2 { a = 1 } elseif x { a = 2 } else { a = 3 }", "if x { a = 2 } else { a = 3 }"),
+    ("while false { a = 1 }\nprint(2)", "print(2)"),
+    ("for i in range(0) { a = 1 }", ""),
+])
+def test_optimizer_folds(source, expected):
+    assert optimized_dict(source) == ast_to_dict(parse_code(expected))
+
+
+@pytest.mark.parametrize("source", [
+    "a = 1 / 0",
+    "a = \"x\" + 1",
+    "a = -\"x\"",
+    "a = \"x\" * 100000",
+])
+def test_optimizer_keeps_failing_or_huge_expressions(source):
+    assert optimized_dict(source) == ast_to_dict(parse_code(source))
+
+
+def test_optimizer_respects_value_size_limit():
+    ast = parse_code('a = "abc" + "def"')
+    assert ast_to_dict(optimize(ast, max_value_size=5)) == ast_to_dict(ast)
+    assert ast_to_dict(optimize(parse_code('a = "abc" + "def"'), max_value_size=6)) == \
+        ast_to_dict(parse_code('a = "abcdef"'))
+
+
+def test_optimizer_folds_unary_minus():
+    assert optimized_dict("a = -(1 + 1)") == {
+        "Program": {"statements": [{"Assign": {"name": "a", "expr": {"Number": {"value": -2}}}}]}
+    }
+
+
+def test_optimizer_preserves_error_point():
+    """La division par zéro reste levée après les print qui la précèdent."""
+    program = optimize(parse_code("print(1)\nprint(2 / (1 - 1))\nprint(3)"))
+    interpreter = Interpreter()
+    with pytest.raises(RuntimeError, match="Division by zero"):
+        with contextlib.redirect_stdout(StringIO()):
+            interpreter.run(program)
+    assert interpreter.output == [1]
+
+
+def test_optimizer_does_not_modify_original():
+    ast = parse_code("a = 1 + 2\nif true { print(a) }")
+    before = ast_to_dict(ast)
+    optimize(ast)
+    assert ast_to_dict(ast) == before
+
+
+def test_optimizer_shares_unchanged_subtrees():
+    ast = parse_code("a = b + c\nprint(b + c)\nif a { x = b + c * 2 }\ny = 1 + 2")
+    program = optimize(ast)
+    assign, show, test, folded = program.statements
+    assert assign is ast.statements[0] and show is ast.statements[1] and test is ast.statements[2]
+    assert show.expr is assign.expr  # hash-consing du parser conservé
+    assert folded is not ast.statements[3]
+
+
+@pytest.mark.parametrize("shape, size", [
+    ("elif_chain", 3000), ("expression_chain", 5000), ("string_concat", 5000),
+    ("nested_blocks", 150),
+])
+def test_optimizer_long_chains(shape, size):
+    """Chaînes elseif et opérateurs associatifs à gauche parcourus sans récursion."""
+    ast = parse_source(generate(shape, size))[0]
+    program = optimize(ast)
+    run = lambda tree: Interpreter(sink=CaptureSink()).run(tree)
+    assert run(program) == run(ast)
+
+
+def test_original_and_optimized_programs_share_slots():
+    """Les nœuds partagés gardent le même slot quel que soit l'ordre d'exécution."""
+    run = lambda tree: Interpreter(sink=CaptureSink()).run(tree)
+    for order in ([0, 1, 0], [1, 0, 1]):
+        ast = parse_source("if false { a = 1 }\nb = 2 + 3\nprint(b)")[0]
+        trees = [ast, optimize(ast)]
+        assert [run(trees[i]) for i in order] == [[5]] * 3
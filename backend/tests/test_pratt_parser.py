@@ -0,0 +1,152 @@
+import glob
+import json
+import random
+import pytest
+import os, sys
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from lexer import lexer, lexer_errors
+from parser import yacc_parser, ast_to_dict, MAX_NESTING
+from pratt_parser import PrattParser
+
+BASE_DIR = os.path.dirname(__file__)
+SAMPLES_DIR = os.path.join(BASE_DIR, "samples")
+
+pratt_parser = PrattParser()
+
+
+def parse_result(parser, source):
+    """(AST en dict ou message de SyntaxError, erreurs lexicales)."""
+    lexer_errors.clear()
+    lexer.lineno = 1
+    try:
+        result = ast_to_dict(parser.parse(source, lexer=lexer))
+    except SyntaxError as e:
+        result = f"SyntaxError: {e}"
+    return result, list(lexer_errors)
+
+
+@pytest.mark.parametrize("source_file", glob.glob(os.path.join(SAMPLES_DIR, "*.pisc")))
+def test_pratt_against_golden(source_file):
+    with open(source_file, "r", encoding="utf-8") as f:
+        code = f.read()
+
+    actual, errors = parse_result(pratt_parser, code)
+
+    json_file = source_file.replace(".pisc", ".ast.json")
+    error_file = source_file.replace(".pisc", ".ast.errors.json")
+    if os.path.exists(error_file):
+        with open(error_file, "r", encoding="utf-8") as f:
+            expected_errors = json.load(f)
+        if errors:
+            assert errors == expected_errors
+        else:
+            assert actual.removeprefix("SyntaxError: ") in expected_errors
+    else:
+        with open(json_file, "r", encoding="utf-8") as f:
+            expected_ast = json.load(f)
+        assert actual == expected_ast, f"AST mismatch for {source_file}"
+
+
+# Cas où les deux parsers pourraient diverger : priorités, associativité,
+# moins unaire, elseif, commentaires, erreurs à chaque position.
+TRICKY_SOURCES = [
+    "",
+    "# seulement un commentaire",
+    "x = 1 - 2 - 3",
+    "x = 8 / 4 / 2 * 3",
+    "x = -2 * 3 + -(4 - 1)",
+    "x = - - 1",
+    "x = a < b == c != d >= e",
+    "x = 1 + 2 < 3 * 4",
+    'print("a\\"b")',
+    "if x { } elseif y { print(1) } elseif z { } else { # vide\n }",
+    "while i < 3 { i = i + 1 }",
+    "for i in range(3) { for j in range(2) { print(i * j) } }",
+    "x = (1 + 2",
+    "x = 1 + ",
+    "x = 1 2",
+    "print(1 2)",
+    "print 1",
+    "if { }",
+    "if x { ",
+    "if x { } else if y { }",
+    "}",
+    "x == 1",
+    "for i in range(x) { }",
+    "for i range(3) { }",
+    "x = 1; y = 2",
+    "x = 1 $ 2",
+    "x = @",
+    "a = true\nb = null\nc = false == b",
+]
+
+
+@pytest.mark.parametrize("source", TRICKY_SOURCES)
+def test_pratt_matches_yacc(source):
+    assert parse_result(pratt_parser, source) == parse_result(yacc_parser, source)
+
+
+def test_pratt_matches_yacc_on_mutated_samples():
+    """Supprime / duplique / échange des tokens des exemples : mêmes arbres, mêmes erreurs."""
+    rng = random.Random(1234)
+    sources = []
+    for source_file in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pisc"))):
+        with open(source_file, "r", encoding="utf-8") as f:
+            sources.append(f.read().split(" "))
+
+    for _ in range(500):
+        words = list(rng.choice(sources))
+        i, j = rng.randrange(len(words)), rng.randrange(len(words))
+        mutation = rng.randrange(3)
+        if mutation == 0:
+            del words[i]
+        elif mutation == 1:
+            words.insert(i, words[j])
+        else:
+            words[i], words[j] = words[j], words[i]
+        source = " ".join(words)
+        assert parse_result(pratt_parser, source) == parse_result(yacc_parser, source), source
+
+
+def test_pratt_shares_subexpressions():
+    ast = pratt_parser.parse("x = a * b + 1\ny = a * b + 1", lexer=lexer)
+    first, second = ast.statements
+    assert first.expr is second.expr
+
+
+def test_pratt_long_chain_does_not_recurse():
+    source = "x = " + " + ".join(["1"] * 20000)
+    ast = pratt_parser.parse(source, lexer=lexer)
+    depth, node = 0, ast.statements[0].expr
+    while hasattr(node, "left"):
+        depth, node = depth + 1, node.left
+    assert depth == 19999
+
+
+@pytest.mark.parametrize("parser", [pratt_parser, yacc_parser], ids=["pratt", "yacc"])
+def test_syntax_error_location_after_multiline_string(parser):
+    source = 'x = "a\nb\nc"\nif x {\n  y = 1 2\n}'
+    assert parse_result(parser, source)[0] == \
+        "SyntaxError: Syntax error at token 'NUMBER', value '2', line 5, col 9"
+
+
+@pytest.mark.parametrize("source, col", [
+    ("x = " + "(" * 5000 + "1" + ")" * 5000, 5 + MAX_NESTING),
+    ("x = " + "- " * 5000 + "1", 5 + 2 * MAX_NESTING),
+    ("x = 1 - " + "-(" * 5000 + "1" + ")" * 5000, 9 + MAX_NESTING),
+    ("print(" + "(" * 5000 + "1", 7 + MAX_NESTING),
+], ids=["parentheses", "minus", "alternating", "unclosed"])
+def test_expression_nesting_limit(source, col):
+    # au-delà de MAX_NESTING parenthèses / moins unaires : même erreur, même
+    # token, pour les deux parsers (pas de RecursionError)
+    expected = f"SyntaxError: Expressions nested too deeply (more than {MAX_NESTING} levels), line 1, col {col}"
+    assert parse_result(pratt_parser, source)[0] == parse_result(yacc_parser, source)[0] == expected
+
+
+def test_deepest_blocks_and_expressions():
+    inner = "x = " + "- " * (MAX_NESTING // 2) + "(" * (MAX_NESTING // 2) + "1" + ")" * (MAX_NESTING // 2)
+    source = "while x {\n" * MAX_NESTING + inner + "\n" + "}\n" * MAX_NESTING
+    assert parse_result(pratt_parser, source) == parse_result(yacc_parser, source)
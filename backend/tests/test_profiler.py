@@ -0,0 +1,86 @@
+import os, sys
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from parser import parse_source
+from interpreter import Interpreter
+from profiler import ProfilingInterpreter
+from sinks import CaptureSink
+from worker_pool import execute
+from budget import Limits
+
+CODE = """total = 0
+for i in range(10) {
+    total = total + i * 2
+    if i == 3 { print(i) }
+}
+x = 1 + 2 + 3 + 4
+print(total)
+"""
+
+
+def profile_of(code, **limits):
+    profiler = ProfilingInterpreter(code, **limits, sink=CaptureSink())
+    output = profiler.run(parse_source(code)[0])
+    return output, profiler.table()
+
+
+def test_profile_by_line_and_node_type():
+    output, profile = profile_of(CODE)
+    assert output == Interpreter(sink=CaptureSink()).run(parse_source(CODE)[0]) == [3, 90]
+
+    lines = {row["line"]: row for row in profile["lines"]}
+    assert {line: row["count"] for line, row in lines.items()} == \
+        {1: 1, 2: 1, 3: 10, 4: 10 + 1, 6: 1, 7: 1}  # ligne 4 : le if et le print(i)
+    for row in profile["lines"]:
+        assert 0 <= row["self_time"] <= row["time"] + 1e-6
+    # la boucle contient ses instructions filles
+    assert lines[2]["time"] >= lines[3]["time"] + lines[4]["time"]
+    assert profile["total_time"] >= lines[2]["time"]
+    assert profile["lines_total"] == 6
+
+    # chaîne 1 + 2 + 3 + 4 : 3 BinOp, 4 Number ; boucle : 10 * (2 + 1) BinOp
+    # (la borne de range() est une constante du nœud For, pas une expression)
+    nodes = profile["nodes"]
+    assert nodes["BinOp"] == 3 + 10 * 3 and nodes["Number"] == 1 + 4 + 10 * 2
+    assert list(nodes) == sorted(nodes, key=nodes.get, reverse=True)
+
+
+def test_same_line_statements_are_not_counted_twice():
+    _, profile = profile_of("for i in range(3) { x = i }")
+    (row,) = profile["lines"]
+    assert row["count"] == 1 + 3
+    assert row["self_time"] <= row["time"] <= profile["total_time"]
+
+
+def test_execute_returns_profile_even_after_an_error():
+    result = execute("i = 0\nwhile true {\n  i = i + 1\n}", "tree", limits=Limits(max_steps=100),
+                     profile=True)
+    assert str(result["exception"]) == "Step limit exceeded (100 steps)"
+    hottest = result["profile"]["lines"][0]
+    assert hottest["line"] in (2, 3)
+    assert sum(row["count"] for row in result["profile"]["lines"]) == 1 + 1 + 49
+
+    result = execute("print(1)", "vm", profile=True)
+    assert "tree" in str(result["exception"]) and "profile" not in result
+    assert "profile" not in execute("print(1)", "tree")
+
+
+# -------------------------
+# API : profile=true
+# -------------------------
+def test_parse_json_profile(client):
+    plain = client.post("/parse-json", json={"code": CODE}).json()
+    assert "profile" not in plain
+
+    body = client.post("/parse-json", json={"code": CODE, "profile": True}).json()  # pas depuis le cache
+    assert body["output"] == plain["output"] == [3, 90]
+    assert body["profile"]["lines"][0].keys() == {"line", "count", "time", "self_time"}
+    assert body["profile"]["nodes"]["BinOp"] == 30  # 1 + 2 + 3 + 4 replié par l'optimiseur
+
+    body = client.post("/parse-json", json={"code": "print(1)", "engine": "vm", "profile": True}).json()
+    assert body == {"errors": ["Profiling runs on the 'tree' engine, not 'vm'"]}
+    body = client.post("/parse-json", json={"code": "print(1 / 0)", "profile": True}).json()
+    assert body["errors"] == ["Runtime error: Division by zero (line 1, col 1)"]
+    assert body["profile"]["lines"][0]["count"] == 1
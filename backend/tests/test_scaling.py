@@ -0,0 +1,157 @@
+import os, sys
+import gc
+import time
+import pytest
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from lexer import lexer, lexer_errors, new_lexer
+from parser import parser, parse_source, ast_to_dict, MAX_NESTING, yacc_parser
+from pratt_parser import PrattParser
+from interpreter import Interpreter
+from sinks import CaptureSink
+from engines import ENGINES
+from worker_pool import execute
+from program_generator import SHAPES
+
+# 10k / 100k par défaut ; PISC_SCALING_FULL=1 ajoute 1M (long : ~30 s par forme)
+SIZES = [10_000, 100_000] + ([1_000_000] if os.environ.get("PISC_SCALING_FULL") else [])
+
+# Tolérance : le temps par élément peut varier (cache, GC), pas être multiplié
+MAX_SLOWDOWN_PER_ITEM = 2.5
+
+
+def parse_time(code, repeat=1):
+    best = float("inf")
+    for _ in range(repeat):
+        lexer_errors.clear()
+        lexer.lineno = 1
+        start = time.perf_counter()
+        parser.parse(code, lexer=lexer)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.parametrize("shape", ["flat", "elif_chain"])
+def test_parse_time_grows_linearly(shape):
+    timings = []
+    for n in SIZES:
+        # plus petit programme : meilleur de 3 pour limiter le bruit
+        timings.append((n, parse_time(SHAPES[shape](n), repeat=3 if n == SIZES[0] else 1)))
+
+    (n0, t0) = timings[0]
+    for n, t in timings[1:]:
+        per_item_ratio = (t / n) / (t0 / n0)
+        assert per_item_ratio < MAX_SLOWDOWN_PER_ITEM, \
+            f"{shape}: {n} items took {t:.2f}s vs {t0:.3f}s for {n0} (x{per_item_ratio:.1f} per item)"
+
+
+# -------------------------
+# Programmes générés (program_generator.py) : toutes les étapes
+# -------------------------
+# Tailles par forme ; la profondeur des blocs est bornée par MAX_NESTING
+PIPELINE_SIZES = [500, 4_000] + ([32_000] if os.environ.get("PISC_SCALING_FULL") else [])
+NESTING_SIZES = [MAX_NESTING // 8, MAX_NESTING]
+
+
+def lex_all(code):
+    lexer = new_lexer()
+    lexer.input(code)
+    for _ in lexer:
+        pass
+
+
+def graph(ast):
+    ast_visualizer = pytest.importorskip("ast_visualizer")
+    ast_visualizer.build_ast_graph(ast)
+
+
+def run(ast):
+    Interpreter(sink=CaptureSink()).run(ast)
+
+
+def stage_times(code, repeat):
+    """Meilleur temps de chaque étape ; aucune ne doit lever RecursionError.
+    GC coupé pendant la mesure (comme timeit) : seul le coût de l'étape compte."""
+    gc.collect()
+    gc.disable()
+    try:
+        return _stage_times(code, repeat)
+    finally:
+        gc.enable()
+
+
+def _stage_times(code, repeat):
+    times = {}
+    ast = None
+    for name in ["lex", "parse", "ast_to_dict", "ast_visualizer", "interpreter"]:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            if name == "lex":
+                lex_all(code)
+            elif name == "parse":
+                ast, errors = parse_source(code)
+                assert errors == []
+            elif name == "ast_to_dict":
+                ast_to_dict(ast)
+            elif name == "ast_visualizer":
+                graph(ast)
+            else:
+                run(ast)
+            best = min(best, time.perf_counter() - start)
+        times[name] = best
+    return times
+
+
+@pytest.mark.parametrize("shape", sorted(SHAPES))
+def test_pipeline_grows_linearly(shape):
+    sizes = NESTING_SIZES if shape == "nested_blocks" else PIPELINE_SIZES
+    # meilleur de plusieurs essais : les étapes rapides (quelques ms) sont bruitées
+    repeat = 5 if shape == "nested_blocks" else 3
+    timings = [(n, stage_times(SHAPES[shape](n), repeat)) for n in sizes]
+
+    (n0, t0) = timings[0]
+    for n, t in timings[1:]:
+        for stage in t:
+            per_item_ratio = (t[stage] / n) / (t0[stage] / n0)
+            assert per_item_ratio < MAX_SLOWDOWN_PER_ITEM, \
+                f"{shape}/{stage}: {n} items took {t[stage]:.3f}s vs {t0[stage]:.4f}s " \
+                f"for {n0} (x{per_item_ratio:.1f} per item)"
+
+
+@pytest.mark.parametrize("shape", sorted(SHAPES))
+def test_generated_programs_run(shape):
+    code = SHAPES[shape](MAX_NESTING if shape == "nested_blocks" else 5_000)
+    output = Interpreter(sink=CaptureSink()).run(parse_source(code)[0])
+    expected = {"elif_chain": [4_999], "nested_blocks": [MAX_NESTING],
+                "string_concat": ["".join(f"p{i}" for i in range(5_000))]}
+    if shape in expected:
+        assert output == expected[shape]
+    else:
+        assert output and all(isinstance(value, int) for value in output)
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize("shape", sorted(SHAPES))
+def test_generated_programs_execute(shape, engine):
+    # chemin complet d'une requête : cache d'AST, optimize, cse, repr, moteur
+    n = MAX_NESTING if shape == "nested_blocks" else PIPELINE_SIZES[-1]
+    code = SHAPES[shape](n)
+    result = execute(code, engine, optimize=True, cse=True)
+    assert "exception" not in result, result.get("exception")
+    assert result["ast"].startswith("Program([")
+    assert result["output"] == Interpreter(sink=CaptureSink()).run(parse_source(code)[0])
+
+
+@pytest.mark.parametrize("backend", ["ply", "pratt"])
+def test_nesting_limit_is_a_syntax_error(backend):
+    parser_ = yacc_parser if backend == "ply" else PrattParser()
+    code = SHAPES["nested_blocks"](MAX_NESTING * 5)
+    # signalé au premier bloc trop profond (ordre du source), par les deux parsers
+    line = [i for i, text in enumerate(code.splitlines(), 1) if text.endswith("{")][MAX_NESTING]
+    with pytest.raises(SyntaxError, match=rf"Blocks nested too deeply \(more than {MAX_NESTING} levels\), "
+                                          rf"line {line}, col 17"):
+        parser_.parse(code, lexer=new_lexer())
+    parser_.parse(SHAPES["nested_blocks"](MAX_NESTING), lexer=new_lexer())
@@ -0,0 +1,81 @@
+import os, sys
+import pytest
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from parser import parse_source
+from interpreter import Interpreter
+from sinks import CaptureSink
+from worker_pool import execute
+from sessions import SessionStore, SessionMemoryExceeded
+
+
+def test_interpreter_keeps_variables_across_runs():
+    interpreter = Interpreter(sink=CaptureSink())
+    for code in ["a = 1", "b = a + 1", "c = 10"]:
+        interpreter.run(parse_source(code)[0])
+    assert interpreter.run(parse_source("print(a + b)")[0]) == [3]
+    assert interpreter.env.as_dict() == {"a": 1, "b": 2, "c": 10}
+
+
+def test_execute_with_variables():
+    result = execute("b = a * 2\nprint(b)", "tree", variables={"a": 21, "s": "x"})
+    assert result["output"] == [42]
+    assert result["variables"] == {"a": 21, "b": 42, "s": "x"}
+
+    # erreur d'exécution : les affectations faites avant restent
+    result = execute("c = 1\nprint(1 / 0)\nd = 2", "tree", variables={"a": 1})
+    assert str(result["exception"]) == "Division by zero"
+    assert result["variables"] == {"a": 1, "c": 1}
+
+    result = execute("print(a)", "vm", variables={"a": 1})
+    assert "tree" in str(result["exception"]) and result["variables"] == {"a": 1}
+
+
+def test_store_memory_cap_and_idle_eviction():
+    store = SessionStore(idle_timeout=3600, session_max_bytes=2000)
+    session, created = store.open()
+    assert created and store.open(session.id) == (session, False)
+
+    with pytest.raises(SessionMemoryExceeded):
+        session.update({"big": "x" * 5000})
+    assert session.variables == {}
+    session.update({"a": 1})
+    store.save(session)
+
+    store.idle_timeout = 0
+    assert not store.alive(session)
+    assert store.stats()["expired"] == 1
+    again, created = store.open(session.id)
+    assert created and again.variables == {}
+
+
+# -------------------------
+# WebSocket /repl
+# -------------------------
+def test_repl_session_keeps_state(client):
+    with client.websocket_connect("/repl") as ws:
+        hello = ws.receive_json()
+        assert hello["type"] == "session" and hello["created"]
+        ws.send_json({"code": "x = 0\nfor i in range(1000) { x = x + i }"})
+        assert ws.receive_json() == {"type": "result", "output": [],
+                                     "message": "Analyse réussie", "variables": ["i", "x"]}
+        ws.send_json({"code": "print(x)"})
+        assert ws.receive_json()["output"] == [499500]
+
+        ws.send_json({"code": "y = 1\nprint(z)"})
+        reply = ws.receive_json()
+        assert reply["errors"] == ["Runtime error: Variable 'z' not defined (line 2, col 1)"]
+        assert reply["variables"] == ["i", "x", "y"]
+
+        ws.send_json({"code": "while true { }"})  # limite de temps : état inchangé
+        assert ws.receive_json()["errors"] == ["Execution timed out after 1s"]
+        ws.send_json({"nope": 1})
+        assert ws.receive_json()["type"] == "error"
+
+    # reprise de la session par son identifiant
+    with client.websocket_connect(f"/repl?session={hello['session']}") as ws:
+        assert ws.receive_json()["created"] is False
+        ws.send_json({"code": "print(x + y)"})
+        assert ws.receive_json()["output"] == [499501]
@@ -0,0 +1,50 @@
+import os, sys
+import contextlib
+from io import StringIO
+import pytest
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from parser import parse_source
+from engines import ENGINES, get_engine
+from sinks import BufferedWriterSink, CaptureSink
+
+
+class CountingStream(StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_buffered_writer_groups_writes():
+    stream = CountingStream()
+    sink = BufferedWriterSink(stream, buffer_size=100)
+    for i in range(1000):
+        sink.write(i)
+    sink.flush()
+    assert stream.getvalue() == "".join(f"{i}\n" for i in range(1000))
+    assert stream.writes < 1000 * 4 // 100 + 2  # ~ un write par bloc de 100 caractères
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_buffered_writer_flushed_on_error(engine):
+    ast, _ = parse_source("print(1)\nprint(2)\nprint(1 / 0)")
+    stream = StringIO()
+    with pytest.raises(RuntimeError, match="Division by zero"):
+        get_engine(engine, sink=BufferedWriterSink(stream)).run(ast)
+    assert stream.getvalue() == "1\n2\n"
+
+
+def test_capture_sink_shared_between_runs():
+    sink = CaptureSink()
+    ast, _ = parse_source("print(1)")
+    with contextlib.redirect_stdout(StringIO()) as stdout:
+        get_engine("tree", sink=sink).run(ast)
+        get_engine("vm", sink=sink).run(ast)
+    assert sink.values == [1, 1]
+    assert stdout.getvalue() == ""
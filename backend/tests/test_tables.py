@@ -0,0 +1,24 @@
+import os, sys
+import subprocess
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import lextab
+from lexer import rules_signature
+from parser import grammar_signature
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(__file__))
+
+
+def test_shipped_tables_are_up_to_date():
+    result = subprocess.run([sys.executable, "build_tables.py", "--check"], cwd=BACKEND_DIR,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert lextab._signature == rules_signature()
+
+
+def test_grammar_signature_ignores_docstring_indentation():
+    # Python 3.13 dédente les docstrings des règles : même signature
+    indented = "statement_list_opt : statement_list\n                          | empty"
+    assert grammar_signature(indented) == "statement_list_opt : statement_list\n| empty"
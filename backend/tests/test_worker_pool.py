@@ -0,0 +1,154 @@
+import os, sys
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+# Ajouter le dossier backend/ au PYTHONPATH
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from worker_pool import WorkerPool, JobTimeout, execute, stream_in_thread, STREAM_BATCH
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = WorkerPool(processes=2, timeout=1.0)
+    yield pool
+    pool.close()
+
+
+def test_execute_results(capsys):
+    assert execute("x = 2 * 3\nprint(x)", "tree")["output"] == [6]
+    result = execute("x = $ 1", "vm")
+    assert set(result.pop("timings")) <= {"lex", "parse"}  # vides si l'AST est en cache
+    assert result == {"errors": ["Illegal character '$' at line 1, col 5"]}
+    result = execute("x = 1 2", "tree")
+    assert set(result.pop("timings")) <= {"lex", "parse"}
+    assert result == {"syntax_error": "Syntax error at token 'NUMBER', value '2', line 1, col 7"}
+    result = execute("print(1 / 0)", "python")
+    assert str(result["exception"]) == "Division by zero"
+
+
+def test_pool_runs_programs(pool):
+    result = pool.run("x = 1\nwhile x < 1000 { x = x * 2 }\nprint(x)", "vm")
+    assert result["output"] == [1024]
+    assert result["ast"].startswith("Program(")
+    assert isinstance(pool.run("print(y)", "tree")["exception"], NameError)
+
+
+def test_pool_concurrent_jobs(pool):
+    jobs = [f"print({i} * {i})" for i in range(40)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda code: pool.run(code, "tree"), jobs))
+    assert [r["output"] for r in results] == [[i * i] for i in range(40)]
+
+
+def test_queued_jobs_do_not_time_out():
+    # plus de jobs que de workers : l'attente d'un worker libre ne compte pas
+    # dans le délai de chaque job (8 x ~0.1 s > 0.5 s au total)
+    pool = WorkerPool(processes=1, timeout=0.5)
+    try:
+        code = "i = 0\nwhile i < 50000 { i = i + 1 }\nprint(i)"
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: pool.run(code, "tree"), range(8)))
+        assert [r["output"] for r in results] == [[50000]] * 8
+        assert pool.stats()["restarts"] == 0
+
+        # job jamais envoyé (arguments non sérialisables) : le worker est gardé
+        with pytest.raises(Exception):
+            pool.run("print(f)", "tree", variables={"f": lambda: 0})
+        assert pool.stats() == {"processes": 1, "idle": 1, "restarts": 0}
+    finally:
+        pool.close()
+
+
+def test_worker_ast_cache_stats():
+    pool = WorkerPool(processes=1, timeout=0.5)
+    try:
+        results = [pool.run("print(1)  # stats", "tree") for _ in range(2)]
+        assert all("ast_cache" not in result for result in results)  # gardé par le pool
+        stats = pool.cache_stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["bytes"] > 0 and stats["evictions"] == 0
+
+        # worker remplacé : ses compteurs restent, ses entrées disparaissent
+        with pytest.raises(JobTimeout):
+            pool.run("while true { }", "tree")
+        assert pool.cache_stats() == {"hits": 1, "misses": 1, "evictions": 0, "entries": 0, "bytes": 0}
+    finally:
+        pool.close()
+
+
+def test_infinite_loop_is_killed_and_worker_respawned(pool):
+    restarts = pool.stats()["restarts"]
+    start = time.perf_counter()
+    with pytest.raises(JobTimeout, match="timed out after 1s"):
+        pool.run("while true { }", "tree")
+    assert time.perf_counter() - start < 3
+    assert pool.stats()["restarts"] == restarts + 1
+    assert pool.stats()["processes"] == 2
+
+    # les autres jobs continuent d'être servis
+    assert pool.run("print(42)", "tree")["output"] == [42]
+
+
+def test_slow_job_does_not_block_others(pool):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        slow = executor.submit(pool.run, "while true { }", "tree")
+        time.sleep(0.1)
+        start = time.perf_counter()
+        assert pool.run("print(1)", "tree")["output"] == [1]
+        assert time.perf_counter() - start < 0.5
+        with pytest.raises(JobTimeout):
+            slow.result()
+
+
+# -------------------------
+# Streaming
+# -------------------------
+SLOW_TAIL = 'for i in range(3) { print(i) }\nx = 0\nwhile x < 200000 { x = x + 1 }\nprint("fin")'
+
+
+def collect(messages):
+    """(lots de sortie, résultat final, délai du premier lot, durée totale)."""
+    start = time.perf_counter()
+    batches, first = [], None
+    for kind, value in messages:
+        if kind == "output":
+            batches.append(value)
+            first = first or time.perf_counter() - start
+        else:
+            result = value
+    return batches, result, first, time.perf_counter() - start
+
+
+@pytest.mark.parametrize("source", ["pool", "thread"])
+def test_stream_first_output_before_end(pool, source, capsys):
+    messages = pool.stream(SLOW_TAIL, "tree") if source == "pool" else stream_in_thread(SLOW_TAIL, "tree")
+    batches, result, first, total = collect(messages)
+    assert [v for batch in batches for v in batch] == [0, 1, 2, "fin"]
+    assert result["output"] == []  # rien n'est accumulé
+    assert first < total / 2
+
+
+@pytest.mark.parametrize("source", ["pool", "thread"])
+def test_stream_batches_small_writes(pool, source, capsys):
+    code = "for i in range(5000) { print(i) }"
+    messages = pool.stream(code, "vm") if source == "pool" else stream_in_thread(code, "vm")
+    batches, _, _, _ = collect(messages)
+    assert [v for batch in batches for v in batch] == list(range(5000))
+    assert len(batches) <= 5000 // STREAM_BATCH + 10
+
+
+def test_stream_runtime_error_after_output(pool):
+    batches, result, _, _ = collect(pool.stream("print(1)\nprint(1 / 0)", "python"))
+    assert batches == [[1]]
+    assert str(result["exception"]) == "Division by zero"
+
+
+def test_closing_stream_kills_worker(pool):
+    restarts = pool.stats()["restarts"]
+    messages = pool.stream("while true { print(1) }", "tree")
+    assert next(messages)[0] == "output"
+    messages.close()
+    assert pool.stats()["restarts"] == restarts + 1
+    assert pool.run("print(2)", "tree")["output"] == [2]
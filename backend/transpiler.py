@@ -0,0 +1,355 @@
+# transpiler.py
+
+import math
+
+from parser import (
+    Program, Assign, Print, If, While, For,
+    BinOp, UnaryOp, Var, Number, Boolean, String, Null, Let, locate
+)
+from interpreter import Interpreter
+from budget import step_limit_error, output_limit_error, output_size, checked_operators
+from sinks import EchoSink
+
+# -------------------------
+# Priorités des opérateurs Python générés
+# -------------------------
+# Les comparaisons Python s'enchaînent (a < b < c), contrairement à .pisc :
+# un opérande qui est lui-même une comparaison est donc toujours parenthésé.
+COMPARISONS = {'==', '!=', '<', '<=', '>', '>='}
+PRECEDENCE = {
+    '==': 1, '!=': 1, '<': 1, '<=': 1, '>': 1, '>=': 1,
+    '+': 2, '-': 2,
+    '*': 3, '/': 3,
+}
+UNARY_PRECEDENCE = 4
+ATOM_PRECEDENCE = 5
+
+# Les variables .pisc sont préfixées pour ne jamais entrer en collision
+# avec les mots-clés Python ni avec les helpers (_emit, _div, ...).
+# Les temporaires de cse.py ($0, $1, ...) deviennent t_0, t_1, ...
+VAR_PREFIX = "v_"
+TEMP_PREFIX = "t_"
+
+
+def python_name(name):
+    if name.startswith("$"):
+        return f"{TEMP_PREFIX}{name[1:]}"
+    return f"{VAR_PREFIX}{name}"
+
+
+def _undefined(name):
+    raise NameError(f"Variable '{name}' not defined")
+
+
+def _div(left, right):
+    if right == 0:
+        raise RuntimeError("Division by zero")
+    return left / right
+
+
+_UNSET = object()  # valeur initiale des variables pas toujours assignées
+
+
+# -------------------------
+# Transpiler (AST -> source Python)
+# -------------------------
+class Transpiler:
+    def __init__(self, count_steps=False, check_values=False):
+        self.lines = []
+        self.positions = []     # ligne générée -> position de l'instruction .pisc
+        self.pos = None         # position de l'instruction en cours de génération
+        self.consts = []        # constantes non représentables en littéral Python
+        self.maybe_unset = set()  # variables lues avant une affectation certaine
+        # Budgets (budget.py) : le code de comptage n'est généré que si demandé
+        self.count_steps = count_steps    # décompte de _steps à chaque pas
+        self.check_values = check_values  # + et * passent par _add / _mul
+
+    def transpile(self, program: Program) -> str:
+        body = []
+        self.lines = body
+        self.gen_block(program.statements, set(), 1)
+
+        header = ["def __pisc_main(_out, _consts, _div, _undefined, _UNSET,"
+                  " _steps, _steps_exceeded, _add, _mul):"]
+        for i in range(len(self.consts)):
+            header.append(f"    _k{i} = _consts[{i}]")
+        for name in sorted(self.maybe_unset):
+            header.append(f"    {python_name(name)} = _UNSET")
+        if not body:
+            self.emit("pass", 1)
+        self.positions = [None] * len(header) + self.positions
+        return "\n".join(header + body) + "\n"
+
+    # --- statements ---
+    # `assigned` : variables affectées sur tous les chemins menant à ce point.
+    # Une lecture d'une variable hors de cet ensemble est protégée par un test
+    # afin de lever la même NameError que l'interpréteur.
+    def gen_block(self, statements, assigned, depth):
+        start = len(self.lines)
+        for stmt in statements:
+            assigned = self.gen_stmt(stmt, assigned, depth)
+        if len(self.lines) == start:
+            self.emit("pass", depth)
+        return assigned
+
+    def gen_step(self, depth):
+        if self.count_steps:
+            self.emit("_steps -= 1", depth)
+            self.emit("if _steps < 0: _steps_exceeded()", depth)
+
+    def gen_stmt(self, stmt, assigned, depth):
+        outer, self.pos = self.pos, stmt._pos
+        try:
+            return self.gen_statement(stmt, assigned, depth)
+        finally:
+            self.pos = outer
+
+    def gen_statement(self, stmt, assigned, depth):
+        self.gen_step(depth)
+        if isinstance(stmt, Assign):
+            self.emit(f"{python_name(stmt.name)} = {self.gen_expr(stmt.expr, assigned)}", depth)
+            return assigned | {stmt.name}
+
+        elif isinstance(stmt, Print):
+            self.emit(f"_out({self.gen_expr(stmt.expr, assigned)})", depth)
+            return assigned
+
+        elif isinstance(stmt, If):
+            return self.gen_if(stmt, assigned, depth, "if")
+
+        elif isinstance(stmt, While):
+            self.emit(f"while {self.gen_expr(stmt.condition, assigned)}:", depth)
+            self.gen_step(depth + 1)  # un tour de boucle = un pas
+            self.gen_block(stmt.body, set(assigned), depth + 1)
+            return assigned  # le corps peut ne jamais s'exécuter
+
+        elif isinstance(stmt, For):
+            self.emit(f"for {python_name(stmt.var)} in range({stmt.count}):", depth)
+            self.gen_step(depth + 1)  # un tour de boucle = un pas
+            after_body = self.gen_block(stmt.body, assigned | {stmt.var}, depth + 1)
+            return after_body if stmt.count > 0 else assigned
+
+        else:
+            raise RuntimeError(f"Unknown statement: {stmt}")
+
+    def gen_if(self, stmt, assigned, depth, keyword):
+        condition = self.gen_expr(stmt.condition, assigned)
+        if keyword == "elif" and self.count_steps:
+            # le if imbriqué devenu elif compte aussi son pas, avant la condition
+            condition = f"((_steps := _steps - 1) < 0 and _steps_exceeded()) or ({condition})"
+        self.emit(f"{keyword} {condition}:", depth)
+        after_then = self.gen_block(stmt.then_branch, set(assigned), depth + 1)
+        else_branch = stmt.else_branch
+        if not else_branch:
+            return assigned
+        # else { if ... } (issu d'un elseif) -> elif, pour ne pas empiler l'indentation
+        if len(else_branch) == 1 and isinstance(else_branch[0], If):
+            outer, self.pos = self.pos, else_branch[0]._pos
+            after_else = self.gen_if(else_branch[0], assigned, depth, "elif")
+            self.pos = outer
+        else:
+            self.emit("else:", depth)
+            after_else = self.gen_block(else_branch, set(assigned), depth + 1)
+        return after_then & after_else
+
+    # --- expressions ---
+    def gen_expr(self, expr, assigned):
+        return self.gen_operand(expr, assigned)[0]
+
+    def gen_operand(self, expr, assigned):
+        """Retourne (source, priorité) de l'expression."""
+        if isinstance(expr, Number):
+            return self.gen_number(expr.value), ATOM_PRECEDENCE
+        elif isinstance(expr, Boolean):
+            return repr(bool(expr.value)), ATOM_PRECEDENCE
+        elif isinstance(expr, String):
+            return repr(expr.value), ATOM_PRECEDENCE
+        elif isinstance(expr, Null):
+            return "None", ATOM_PRECEDENCE
+        elif isinstance(expr, Var):
+            name = python_name(expr.name)
+            # un temporaire CSE est toujours défini (Let) avant d'être relu
+            if expr.name in assigned or expr.name.startswith("$"):
+                return name, ATOM_PRECEDENCE
+            self.maybe_unset.add(expr.name)
+            return f"({name} if {name} is not _UNSET else _undefined({expr.name!r}))", ATOM_PRECEDENCE
+
+        elif isinstance(expr, BinOp):
+            if expr.op not in PRECEDENCE:
+                raise RuntimeError(f"Unknown binary operator {expr.op}")
+            left = self.gen_operand(expr.left, assigned)
+            right = self.gen_operand(expr.right, assigned)
+            if expr.op == '/' and not self.is_nonzero_literal(expr.right):
+                return f"_div({left[0]}, {right[0]})", ATOM_PRECEDENCE
+            if self.check_values and expr.op in ('+', '*'):
+                helper = "_add" if expr.op == '+' else "_mul"
+                return f"{helper}({left[0]}, {right[0]})", ATOM_PRECEDENCE
+            level = PRECEDENCE[expr.op]
+            # associativité à gauche : seul l'opérande de gauche peut être de même niveau
+            left_src = self.wrap(left, level, expr.op in COMPARISONS)
+            right_src = self.wrap(right, level + 1, expr.op in COMPARISONS)
+            return f"{left_src} {expr.op} {right_src}", level
+
+        elif isinstance(expr, UnaryOp):
+            if expr.op != '-':
+                raise RuntimeError(f"Unknown unary operator {expr.op}")
+            operand = self.gen_operand(expr.operand, assigned)
+            return f"-{self.wrap(operand, UNARY_PRECEDENCE, False)}", UNARY_PRECEDENCE
+
+        elif isinstance(expr, Let):
+            value = self.gen_expr(expr.expr, assigned)
+            return f"({python_name(expr.name)} := {value})", ATOM_PRECEDENCE
+
+        else:
+            raise RuntimeError(f"Unknown expression: {expr}")
+
+    @staticmethod
+    def wrap(operand, min_level, is_comparison):
+        source, level = operand
+        if level < min_level or (is_comparison and level == PRECEDENCE['==']):
+            return f"({source})"
+        return source
+
+    def gen_number(self, value):
+        # inf/nan et les très grands entiers n'ont pas de littéral Python compilable
+        if isinstance(value, float) and not math.isfinite(value) \
+                or isinstance(value, int) and abs(value) >= 10 ** 100 \
+                or not isinstance(value, (int, float)):
+            self.consts.append(value)
+            return f"_k{len(self.consts) - 1}"
+        return repr(value)
+
+    @staticmethod
+    def is_nonzero_literal(expr):
+        if isinstance(expr, (Number, Boolean, String)):
+            return not expr.value == 0
+        return isinstance(expr, Null)
+
+    def emit(self, line, depth):
+        self.lines.append("    " * depth + line)
+        self.positions.append(self.pos)
+
+
+# -------------------------
+# Programme compilé
+# -------------------------
+class CompiledProgram:
+    def __init__(self, program, source, function, consts, positions=None):
+        self.program = program    # AST d'origine (repli sur l'interpréteur)
+        self.source = source      # source Python générée (debug)
+        self.function = function  # fonction Python compilée, ou None si repli
+        self.consts = consts
+        self.positions = positions or []  # ligne générée (0-based) -> position .pisc
+
+    def locate(self, error):
+        """Rattache à `error` la position .pisc de la ligne générée qui l'a levée
+        (frame "<pisc>" la plus interne de la trace)."""
+        line = None
+        tb = error.__traceback__
+        while tb is not None:
+            if tb.tb_frame.f_code.co_filename == "<pisc>":
+                line = tb.tb_lineno
+            tb = tb.tb_next
+        if line is not None and line <= len(self.positions):
+            locate(error, self.positions[line - 1])
+        return error
+
+
+def compile_program(program: Program, count_steps=False, check_values=False) -> CompiledProgram:
+    """Transpile puis compile le programme une seule fois.
+
+    Le compilateur CPython a ses propres limites (20 boucles imbriquées,
+    profondeur de parenthèses et d'indentation) : si elles sont dépassées,
+    `function` vaut None et le moteur se replie sur l'interpréteur. De même si
+    la transpilation (récursive) dépasse la pile : `source` vaut alors None.
+    """
+    transpiler = Transpiler(count_steps, check_values)
+    source = None
+    try:
+        source = transpiler.transpile(program)
+        namespace = {}
+        exec(compile(source, "<pisc>", "exec"), namespace)
+        function = namespace["__pisc_main"]
+    except (SyntaxError, RecursionError, MemoryError):
+        function = None
+    return CompiledProgram(program, source, function, transpiler.consts, transpiler.positions)
+
+
+class PythonEngine:
+    """Exécute un programme transpilé en Python : même interface que Interpreter."""
+
+    def __init__(self, max_steps=None, max_output=None, max_value_size=None, sink=None):
+        self.output = []
+        self.max_steps = max_steps
+        self.max_output = max_output
+        self.max_value_size = max_value_size
+        self.sink = sink  # voir Interpreter.sink
+
+    def run(self, program):
+        compiled = program if isinstance(program, CompiledProgram) else compile_program(
+            program, self.max_steps is not None, self.max_value_size is not None)
+        if compiled.function is None:
+            interpreter = Interpreter(self.max_steps, self.max_output, self.max_value_size,
+                                      self.sink)
+            try:
+                interpreter.run(compiled.program)
+            finally:
+                self.output = interpreter.output
+            return self.output
+
+        sink = EchoSink() if self.sink is None else self.sink
+        self.output = sink.values
+        try:
+            compiled.function(self.output_function(sink.write), compiled.consts, _div, _undefined,
+                              _UNSET, self.max_steps, self.steps_exceeded, *self.value_operators())
+        except Exception as e:
+            raise compiled.locate(e)
+        finally:
+            sink.flush()
+        return self.output
+
+    def steps_exceeded(self):
+        raise step_limit_error(self.max_steps)
+
+    def output_function(self, write):
+        if self.max_output is None:
+            return write
+        left = [self.max_output]
+
+        def out(value):
+            left[0] -= output_size(value)
+            if left[0] < 0:
+                raise output_limit_error(self.max_output)
+            write(value)
+        return out
+
+    def value_operators(self):
+        checked = checked_operators(self.max_value_size)
+        return (checked['+'], checked['*']) if checked else (None, None)
+
+
+# -------------------------
+# Manual test (only if run directly)
+# -------------------------
+if __name__ == "__main__":
+    from lexer import lexer
+    from parser import parser
+
+    code = """
+    a = 0
+    for i in range(5) {
+        a = a + i * 2
+    }
+    if a > 10 {
+        print(a / 2)
+    } elseif a < 0 {
+        print(b)
+    }
+    """
+
+    ast = parser.parse(code, lexer=lexer)
+    compiled = compile_program(ast)
+    print(compiled.source)
+
+    print("=== Résultats collectés ===")
+    print(PythonEngine().run(compiled))
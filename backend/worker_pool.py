@@ -0,0 +1,371 @@
+# worker_pool.py
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from cache import ast_cache
+from engines import get_engine
+from interpreter import Interpreter, Environment
+from profiler import ProfilingInterpreter
+from budget import Limits
+from sinks import CaptureSink
+from lexer import line_index
+from incremental import documents
+
+
+class JobTimeout(RuntimeError):
+    """Le programme a dépassé le temps d'exécution autorisé."""
+
+
+class WorkerCrashed(RuntimeError):
+    """Le processus worker s'est arrêté pendant l'exécution du programme."""
+
+
+class StreamClosed(Exception):
+    """Le client a cessé de lire la sortie d'un programme en streaming."""
+
+
+# -------------------------
+# Travail exécuté dans un worker
+# -------------------------
+def execute(code, engine, optimize=True, cse=False, limits=None, document=None, variables=None,
+            profile=False, sink=None):
+    """Lexe, parse et exécute `code` ; retourne un dict sérialisable (pickle).
+
+    `limits` (budget.Limits) borne les pas, la sortie et la taille des valeurs.
+    `document` : identifiant du document édité (incremental.py) ; seules les
+    instructions modifiées depuis sa version précédente sont reparsées.
+    `variables` : état d'une session REPL (nom -> valeur), visible par le
+    programme (interpréteur "tree") ; le résultat contient alors "variables",
+    l'état après exécution (y compris après une erreur d'exécution).
+    `profile` : exécution profilée (profiler.py, interpréteur "tree") ; le
+    résultat contient alors "profile", la table de chaleur par ligne.
+    Les print sont capturés (jamais affichés sur la console du serveur) ; avec
+    un autre `sink` (ex. OutputStream), ils lui sont transmis et "output" reste vide.
+    Clés : "syntax_error" ou "errors" si le source est invalide, sinon "ast"
+    (texte), "ast_hash" et "output" ou "exception" (+ "location" : (ligne,
+    colonne) de l'instruction fautive, si connue) ; "exception" seule si une
+    passe d'optimisation a échoué. "timings" : durées en secondes des phases
+    "lex", "parse", "optimize" (absentes si l'AST était en cache) et
+    "execute" (metrics.py).
+    """
+    timings = {}
+    limits = limits or Limits()
+    try:
+        if document is None:
+            entry = ast_cache.entry(code, optimize, cse, timings=timings,
+                                    max_value_size=limits.max_value_size)
+        else:
+            state = documents.open(document)
+            entry = ast_cache.entry(code, optimize, cse, state, timings, limits.max_value_size)
+            documents.save(document, state)
+        ast, program, errors = entry.unpack()
+        if errors:
+            return {"errors": errors, "timings": timings}
+        result = {"ast": str(ast), "ast_hash": entry.ast_hash, "timings": timings}
+    except SyntaxError as e:
+        return {"syntax_error": str(e), "timings": timings}
+    except Exception as e:
+        # passes d'optimisation (RecursionError, MemoryError, ...) : erreur du
+        # programme, sans "ast_hash" (rien n'est mis en cache par l'API)
+        return {"exception": e, "timings": timings}
+
+    interpreter = None
+    try:
+        sink = CaptureSink() if sink is None else sink
+        interpreter = get_engine(engine, **limits.as_kwargs(), sink=sink)
+        if profile:
+            if not isinstance(interpreter, Interpreter):
+                raise ValueError(f"Profiling runs on the 'tree' engine, not '{engine}'")
+            interpreter = ProfilingInterpreter(code, **limits.as_kwargs(), sink=sink)
+        if variables is not None:
+            if not isinstance(interpreter, Interpreter):
+                raise ValueError(f"Sessions run on the 'tree' engine, not '{engine}'")
+            interpreter.env = Environment(initial=variables)
+        start = time.perf_counter()
+        try:
+            result["output"] = interpreter.run(program)
+        finally:
+            timings["execute"] = time.perf_counter() - start
+    except Exception as e:
+        result["exception"] = e
+        pos = getattr(e, "pisc_pos", None)
+        if pos is not None:
+            result["location"] = line_index(code).location(pos)
+    if variables is not None:
+        # état après exécution, ou inchangé si le programme n'a pas pu démarrer
+        result["variables"] = (interpreter.env.as_dict() if isinstance(interpreter, Interpreter)
+                               else variables)
+    if isinstance(interpreter, ProfilingInterpreter):
+        result["profile"] = interpreter.table()  # aussi après une erreur (limite de pas, ...)
+    return result
+
+
+# -------------------------
+# Streaming de la sortie
+# -------------------------
+STREAM_BATCH = 256      # valeurs max par message
+STREAM_INTERVAL = 0.05  # délai max (s) avant l'envoi d'une valeur produite
+
+
+class OutputStream:
+    """Sink (sinks.py) qui regroupe les print en lots envoyés par `send(("output", [valeurs]))`.
+
+    Un lot part dès qu'il est plein, et au plus tard STREAM_INTERVAL secondes
+    après sa première valeur (thread de vidage) : peu de petits messages, et
+    une première sortie visible rapidement même si le programme calcule ensuite.
+    """
+
+    def __init__(self, send):
+        self.send = send
+        self.values = []  # rien n'est conservé
+        self.batch = []
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.flusher = threading.Thread(target=self.flush_periodically, daemon=True)
+
+    def __enter__(self):
+        self.flusher.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.done.set()
+        self.flusher.join()
+        self.flush()
+
+    def write(self, value):
+        with self.lock:
+            self.batch.append(value)
+            full = len(self.batch) >= STREAM_BATCH
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            batch, self.batch = self.batch, []
+            if batch:
+                self.send(("output", batch))
+
+    def flush_periodically(self):
+        while not self.done.wait(STREAM_INTERVAL):
+            self.flush()
+
+
+def _worker_main(conn):
+    # lexer, parser et moteurs sont déjà importés (préchargés par le forkserver)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        kind, args = job
+        try:
+            if kind == "stream":
+                with OutputStream(conn.send) as stream:
+                    result = execute(*args, sink=stream)
+            else:
+                result = execute(*args)
+            result["ast_cache"] = ast_cache.stats()  # relevé par le pool (WorkerPool.cache_stats)
+            conn.send(("ok", result))
+        except BaseException as e:
+            conn.send(("error", e))
+
+
+def stream_in_thread(code, engine, optimize=True, cse=False, limits=None, document=None):
+    """Équivalent de WorkerPool.stream dans un thread du processus courant.
+
+    Un thread ne peut pas être tué : si le consommateur s'arrête, le programme
+    est interrompu à son print suivant (les boucles muettes restent bornées
+    par max_steps).
+    """
+    messages = queue.Queue(maxsize=16)  # contre-pression : mémoire constante
+    closed = threading.Event()
+
+    def send(message):
+        while not closed.is_set():
+            try:
+                messages.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise StreamClosed()
+
+    def target():
+        try:
+            with OutputStream(send) as stream:
+                result = execute(code, engine, optimize, cse, limits, document, sink=stream)
+            send(("ok", result))
+        except StreamClosed:
+            pass
+        except BaseException as e:
+            try:
+                send(("error", e))
+            except StreamClosed:
+                pass
+
+    threading.Thread(target=target, daemon=True).start()
+    try:
+        while True:
+            status, value = messages.get()
+            if status == "output":
+                yield "output", value
+            elif status == "error":
+                raise value
+            else:
+                yield "result", value
+                return
+    finally:
+        closed.set()
+
+
+def _context():
+    # forkserver : chaque worker est forké depuis un processus propre (sans les
+    # threads d'uvicorn) où lexer/parser/moteurs sont importés une seule fois.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["worker_pool"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+# -------------------------
+# Pool
+# -------------------------
+class Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.cache_stats = None  # statistiques de son cache d'AST, au dernier job terminé
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+
+
+class WorkerPool:
+    """Processus workers démarrés à l'avance, un job à la fois chacun.
+
+    Un job qui dépasse `timeout` secondes (temps réel) est interrompu en tuant
+    son worker, immédiatement remplacé : une boucle infinie ne bloque ni le
+    serveur ni les autres clients.
+    """
+
+    def __init__(self, processes=None, timeout=5.0):
+        self.processes = processes or os.cpu_count() or 1
+        self.timeout = timeout
+        self.ctx = _context()
+        self.idle = queue.Queue()
+        self.lock = threading.Lock()
+        self.workers = []
+        self.restarts = 0
+        self.retired_cache = {"hits": 0, "misses": 0, "evictions": 0}  # workers remplacés
+        self.closed = False
+        for _ in range(self.processes):
+            self.add_worker()
+
+    def add_worker(self):
+        worker = Worker(self.ctx)
+        with self.lock:
+            self.workers.append(worker)
+        self.idle.put(worker)
+
+    def replace(self, worker):
+        worker.kill()
+        with self.lock:
+            self.workers.remove(worker)
+            self.restarts += 1
+            if worker.cache_stats is not None:
+                for name in self.retired_cache:
+                    self.retired_cache[name] += worker.cache_stats[name]
+        if not self.closed:
+            self.add_worker()
+
+    def run(self, code, engine, optimize=True, cse=False, limits=None, document=None,
+            variables=None, profile=False, timeout=None):
+        """Exécute `execute(...)` dans un worker libre (bloquant : à appeler hors event loop)."""
+        args = (code, engine, optimize, cse, limits, document, variables, profile)
+        for _, result in self.job("run", args, timeout):
+            return result
+
+    def stream(self, code, engine, optimize=True, cse=False, limits=None, document=None,
+               timeout=None):
+        """Générateur : ("output", [valeurs]) au fil de l'exécution, puis ("result", dict).
+
+        Fermer le générateur avant la fin (client parti) tue le worker.
+        """
+        return self.job("stream", (code, engine, optimize, cse, limits, document), timeout)
+
+    def job(self, kind, args, timeout):
+        timeout = self.timeout if timeout is None else timeout
+        worker = self.idle.get()
+        # le délai court à partir de l'envoi : l'attente d'un worker libre
+        # (plus de jobs que de workers) n'est pas du temps d'exécution
+        deadline = time.monotonic() + timeout
+        sent = finished = False
+        try:
+            worker.conn.send((kind, args))
+            sent = True
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not worker.conn.poll(remaining):
+                    raise JobTimeout(f"Execution timed out after {timeout:g}s")
+                status, value = worker.conn.recv()
+                if status == "output":
+                    yield "output", value
+                    continue
+                finished = True
+                if status == "error":
+                    raise value
+                worker.cache_stats = value.pop("ast_cache", worker.cache_stats)
+                yield "result", value
+                return
+        except (EOFError, OSError):
+            raise WorkerCrashed("Worker process stopped during execution")
+        finally:
+            if finished or not sent:
+                # job terminé, ou jamais parti (arguments non sérialisables) : worker intact
+                self.idle.put(worker)
+            else:
+                # délai dépassé, worker mort ou sortie abandonnée : worker remplacé
+                self.replace(worker)
+
+    def close(self):
+        self.closed = True
+        with self.lock:
+            workers = list(self.workers)
+        for worker in workers:
+            worker.stop()
+
+    def stats(self):
+        with self.lock:
+            return {"processes": len(self.workers), "idle": self.idle.qsize(), "restarts": self.restarts}
+
+    def cache_stats(self):
+        """Statistiques cumulées des caches d'AST des workers (forme de LRUCache.stats).
+
+        Relevées à la fin de chaque job ; les compteurs des workers remplacés
+        sont conservés, leurs entrées (perdues avec le processus) non.
+        """
+        with self.lock:
+            total = dict(self.retired_cache, entries=0, bytes=0)
+            for worker in self.workers:
+                for name, value in (worker.cache_stats or {}).items():
+                    total[name] += value
+        return total
@@ -26,6 +26,8 @@ function App() {
   // lecture du cache (localStorage) ou valeur par défaut
   const savedCode = localStorage.getItem("editorCode") || `print("Hello World")`;
   const [code, setCode] = useState(savedCode);
+  // identifiant de l'éditeur : le backend ne reparse que les instructions modifiées
+  const [documentId] = useState(() => `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`);
 
   const [output, setOutput] = useState([]);
   const [errors, setErrors] = useState([]);
@@ -88,7 +90,7 @@ function App() {
       const res = await fetch("/api/parse-json", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ code }),
+        body: JSON.stringify({ code, document: documentId }),
       });
 
       const data = await res.json();